@@ -0,0 +1,99 @@
+"""
+Pipeline de log de auditoria estruturado e não bloqueante.
+
+``BackgroundQueueHandler`` só enfileira o registro (fila limitada, sem bloquear
+a thread da requisição) e uma ``QueueListener`` em segundo plano formata e
+escreve no destino real. Com a fila cheia o registro é descartado e contado em
+``dropped``. ``JSONFormatter`` serializa uma linha JSON por registro, incluindo
+os campos estruturados passados em ``extra={"audit": {...}}``.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+
+class JSONFormatter(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "audit", None) or {})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # No encerramento espera haver espaço na fila em vez de falhar com Full.
+        self.queue.put(self._sentinel)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Handler que entrega os registros a uma ``QueueListener`` em segundo plano.
+
+    ``filename`` escreve em arquivo (``WatchedFileHandler``, compatível com
+    logrotate); sem ele, o destino é ``stream`` (stderr por padrão). O formatter
+    configurado no handler é aplicado no destino, fora da thread da requisição.
+    """
+
+    def __init__(self, queue_size=10000, filename=None, stream=None):
+        self.queue_size = queue_size
+        if filename:
+            self.sink = WatchedFileHandler(filename, encoding="utf-8")
+        else:
+            self.sink = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self):
+        # Threads não sobrevivem ao fork (ex.: gunicorn com preload): cada
+        # processo sobe sua própria fila e listener.
+        if self.listener is not None:
+            self.queue = queue.Queue(maxsize=self.queue_size)
+        self._pid = os.getpid()
+        self.listener = _DrainingQueueListener(self.queue, self.sink, respect_handler_level=True)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.sink.setFormatter(fmt)
+
+    def prepare(self, record):
+        # A formatação acontece na thread do listener.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start()
+        super().emit(record)
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            # stop() drena a fila antes de encerrar a thread.
+            self.listener.stop()
+            self.listener = None
+        self.sink.close()
+        super().close()
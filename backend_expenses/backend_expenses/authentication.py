@@ -0,0 +1,63 @@
+"""
+Autenticação JWT da API.
+
+``CachedJWTAuthentication`` evita o SELECT em ``auth_user`` a cada requisição:
+o usuário resolvido fica no cache ``default`` por ``AUTH_USER_CACHE_SECONDS``,
+na chave do id, junto com a versão do token que o resolveu (o claim
+``REVOKE_TOKEN_CLAIM``, hash da senha, com ``CHECK_REVOKE_TOKEN``); token de
+outra versão vai ao banco. Salvar ou excluir o usuário apaga a entrada
+(``invalidate_cached_user``, chamado pelos signals de ``expenses.models``); a
+troca de senha muda a versão e os tokens antigos deixam de valer. Alterações por
+``update()`` em massa só aparecem depois do TTL. Com vários workers o cache
+precisa ser compartilhado (``CACHE_REDIS_URL``).
+
+O cache guarda só os campos de ``CACHED_USER_FIELDS`` (nunca a senha); o usuário
+volta como instância carregada com os demais campos adiados, lidos do banco se
+alguém os acessar.
+"""
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .sharding import activate_user
+
+USER_CACHE_KEY = "auth:user:{}"
+# O que a autenticação, as permissões e o roteamento por shard usam.
+CACHED_USER_FIELDS = ("id", "username", "is_active", "is_staff", "is_superuser")
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+class ShardedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` que ativa o shard do usuário autenticado (``sharding``)."""
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            activate_user(result[0])
+        return result
+
+
+class CachedJWTAuthentication(ShardedJWTAuthentication):
+    """Resolve o usuário do token pelo cache antes de ir ao banco."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        version = validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM)
+        key = USER_CACHE_KEY.format(user_id)
+        cached = cache.get(key)
+        if cached is not None and cached[0] == version:
+            _, db, values = cached
+            return self.user_model.from_db(db, CACHED_USER_FIELDS, values)
+        # Valida ativo e versão (senha) como o JWTAuthentication.
+        user = super().get_user(validated_token)
+        values = [getattr(user, field) for field in CACHED_USER_FIELDS]
+        cache.set(key, (version, user._state.db, values), settings.AUTH_USER_CACHE_SECONDS)
+        return user
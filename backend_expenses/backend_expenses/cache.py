@@ -0,0 +1,53 @@
+"""
+Backends de cache do Django instrumentados: ``get``/``get_many`` contam hits e
+misses em ``cache_requests_total`` (label ``cache`` = ``KEY_PREFIX`` ou ``LOCATION``;
+das URLs ficam só esquema, host, porta e banco, sem credenciais).
+"""
+
+import re
+from urllib.parse import urlsplit
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import record_cache
+
+_MISSING = object()
+
+
+def location_label(server):
+    """``LOCATION`` sem credenciais nem query: ``redis://:s@host/1`` -> ``redis://host/1``."""
+    servers = server if isinstance(server, (list, tuple)) else re.split(r"[;,]", server)
+    labels = []
+    for location in servers:
+        parts = urlsplit(location)
+        if parts.scheme and parts.hostname:
+            port = f":{parts.port}" if parts.port else ""
+            location = f"{parts.scheme}://{parts.hostname}{port}{parts.path}"
+        labels.append(location)
+    return ",".join(labels)
+
+
+class InstrumentedCacheMixin:
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self.metrics_alias = params.get("KEY_PREFIX") or location_label(server) or "default"
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        record_cache(self.metrics_alias, value is not _MISSING)
+        return default if value is _MISSING else value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    # get_many do BaseCache já passa por get().
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_cache(self.metrics_alias, True, len(found))
+        record_cache(self.metrics_alias, False, len(keys) - len(found))
+        return found
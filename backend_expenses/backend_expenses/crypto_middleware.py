@@ -1,7 +1,8 @@
-import json
+from .middleware import HybridMiddleware
+from .request_body import get_json_body, replace_json_body
 
 
-class PasswordDecryptionMiddleware:
+class PasswordDecryptionMiddleware(HybridMiddleware):
     """Middleware legada.
 
     A antiga lógica de descriptografia foi removida: agora esperamos senha em texto
@@ -9,17 +10,20 @@ class PasswordDecryptionMiddleware:
     para compatibilidade temporária. Em breve este middleware pode ser removido.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        if request.content_type == "application/json" and request.body:
-            try:
-                data = json.loads(request.body)
-                if data.get("encrypted"):
-                    # Remove flag obsoleta
-                    data.pop("encrypted", None)
-                    request._body = json.dumps(data).encode("utf-8")
-            except Exception:
-                pass
+    def call(self, request):
+        self._strip_encrypted_flag(request)
         return self.get_response(request)
+
+    async def acall(self, request):
+        self._strip_encrypted_flag(request)
+        return await self.get_response(request)
+
+    def _strip_encrypted_flag(self, request):
+        try:
+            data = get_json_body(request)
+        except ValueError:
+            data = None
+        if isinstance(data, dict) and data.get("encrypted"):
+            # Remove flag obsoleta
+            data.pop("encrypted", None)
+            replace_json_body(request, data)
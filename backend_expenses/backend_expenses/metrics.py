@@ -0,0 +1,371 @@
+"""
+Métricas da aplicação no formato texto do Prometheus.
+
+Cada processo (worker do gunicorn, worker do Celery) acumula contadores e
+histogramas em memória. Com ``METRICS_MULTIPROC_DIR`` configurado, o processo
+grava periodicamente (``METRICS_FLUSH_INTERVAL`` segundos) um snapshot em
+``<dir>/metrics_<pid>_<token>.json`` e o endpoint ``/metrics`` soma os arquivos de
+todos os processos. O token aleatório do processo impede que um processo novo
+com o PID de um encerrado sobrescreva o arquivo dele. Os arquivos de processos
+encerrados continuam sendo somados para os contadores não regredirem; o
+diretório deve ser esvaziado no deploy. Um processo morto sem ``atexit`` (ex.:
+SIGKILL do gunicorn por timeout) perde no máximo ``METRICS_FLUSH_INTERVAL``
+segundos de contagem.
+"""
+
+import atexit
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from celery import signals
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.views.decorators.cache import never_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0)
+
+
+class Registry:
+    """Valores de métricas do processo atual, indexados por (nome, labels)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def inc(self, name, labels, amount):
+        with self.lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def observe(self, name, labels, buckets, value):
+        with self.lock:
+            state = self.histograms.get((name, labels))
+            if state is None:
+                state = self.histograms[(name, labels)] = [[0] * (len(buckets) + 1), 0.0]
+            counts = state[0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            state[1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [
+                    [name, list(labels), value] for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(counts), total]
+                    for (name, labels), (counts, total) in self.histograms.items()
+                ],
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+registry = Registry()
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        registry.register(self)
+
+    def inc(self, amount=1, **labels):
+        registry.inc(self.name, tuple(sorted(labels.items())), amount)
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        registry.observe(self.name, tuple(sorted(labels.items())), self.buckets, value)
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota.",
+    LATENCY_BUCKETS,
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Consultas SQL executadas por requisição.",
+    QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = Counter(
+    "http_request_db_seconds_total",
+    "Tempo total gasto em consultas SQL pelas requisições.",
+)
+celery_task_duration = Histogram(
+    "celery_task_duration_seconds",
+    "Duração da execução das tasks do Celery.",
+    TASK_BUCKETS,
+)
+celery_task_queue_wait = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Tempo entre a publicação e o início da execução da task.",
+    TASK_BUCKETS,
+)
+cache_requests = Counter(
+    "cache_requests_total",
+    "Leituras de cache por alias e resultado (hit/miss).",
+)
+
+
+# Armazenamento multiprocesso ------------------------------------------------
+
+
+def _multiproc_dir():
+    return getattr(settings, "METRICS_MULTIPROC_DIR", None)
+
+
+_process_token = {}
+
+
+def _process_file(directory):
+    # Gerado por PID: o filho do fork (workers do gunicorn) não herda o token do pai.
+    pid = os.getpid()
+    if pid not in _process_token:
+        _process_token.clear()
+        _process_token[pid] = os.urandom(4).hex()
+    return os.path.join(directory, f"metrics_{pid}_{_process_token[pid]}.json")
+
+
+def flush(force=False):
+    """Grava o snapshot do processo no diretório compartilhado, se configurado."""
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - registry.last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    registry.last_flush = now
+    path = _process_file(directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fp:
+        json.dump(registry.snapshot(), fp)
+    os.replace(tmp_path, path)
+
+
+atexit.register(flush, force=True)
+
+
+def _snapshots():
+    directory = _multiproc_dir()
+    own = registry.snapshot()
+    if not directory:
+        return [own]
+    snapshots = [own]
+    own_file = _process_file(directory)
+    for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+        if path == own_file:
+            continue
+        try:
+            with open(path) as fp:
+                snapshots.append(json.load(fp))
+        except (OSError, ValueError):
+            # Arquivo removido ou sendo substituído entre o glob e a leitura.
+            continue
+    return snapshots
+
+
+def _merge(snapshots):
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts, total in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            if key not in histograms:
+                histograms[key] = [[0] * len(counts), 0.0]
+            merged = histograms[key]
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+    return counters, histograms
+
+
+# Instrumentação ----------------------------------------------------------------
+
+
+class QueryStats:
+    """
+    ``execute_wrapper`` que conta as consultas SQL e o tempo gasto nelas.
+
+    Consultas acima de ``SLOW_QUERY_THRESHOLD_MS`` ficam em ``slow`` para serem
+    registradas depois da resposta (``expenses.slow_queries``).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = []
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        self.slow_threshold = threshold / 1000 if threshold > 0 else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+                self.slow.append((context["connection"].alias, sql, params, many, elapsed))
+
+    def track(self):
+        """Instala o wrapper em todas as conexões; fechar o ``ExitStack`` retornado o remove."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+def route_name(request):
+    """Label de rota de baixa cardinalidade (nome da view resolvida)."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unmatched>"
+    return match.view_name or match.route or "<unnamed>"
+
+
+def observe_request(request, response, duration, queries):
+    labels = {"route": route_name(request), "method": request.method}
+    http_request_duration.observe(duration, status=str(response.status_code), **labels)
+    http_request_db_queries.observe(queries.count, **labels)
+    http_request_db_seconds.inc(queries.seconds, **labels)
+    flush()
+
+
+def record_cache(alias, hit, count=1):
+    if count:
+        cache_requests.inc(count, cache=alias, result="hit" if hit else "miss")
+
+
+@signals.before_task_publish.connect
+def _task_published(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("published_at", time.time())
+
+
+@signals.task_prerun.connect
+def _task_started(task=None, **kwargs):
+    queries = QueryStats()
+    task.request._metrics_queries = (queries, queries.track())
+    task.request._metrics_started = time.perf_counter()
+    published_at = getattr(task.request, "published_at", None)
+    if published_at is None:
+        published_at = (getattr(task.request, "headers", None) or {}).get("published_at")
+    if published_at is not None:
+        celery_task_queue_wait.observe(max(time.time() - published_at, 0.0), task=task.name)
+
+
+@signals.task_postrun.connect
+def _task_finished(task=None, state=None, **kwargs):
+    started = getattr(task.request, "_metrics_started", None)
+    if started is not None:
+        celery_task_duration.observe(
+            time.perf_counter() - started, task=task.name, state=state or "UNKNOWN"
+        )
+    tracked = getattr(task.request, "_metrics_queries", None)
+    if tracked is not None:
+        queries, stack = tracked
+        stack.close()
+        if queries.slow and getattr(task, "track_slow_queries", True):
+            from expenses.slow_queries import record_slow_queries
+
+            record_slow_queries(queries.slow, f"task:{task.name}")
+    flush()
+
+
+# Exposição --------------------------------------------------------------------
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+def render():
+    """Métricas agregadas de todos os processos no formato texto do Prometheus."""
+    counters, histograms = _merge(_snapshots())
+    lines = []
+    for metric in registry.metrics.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if metric.type == "counter":
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric.name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (name, labels), (counts, total) in sorted(histograms.items()):
+            if name != metric.name:
+                continue
+            cumulative = 0
+            bounds = [*map(_number, metric.buckets), "+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels((*labels, ('le', bound)))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _authorized(request):
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer "):
+        return hmac.compare_digest(header.removeprefix("Bearer ").encode(), token.encode())
+    user = getattr(request, "user", None)
+    return bool(user and user.is_staff)
+
+
+@never_cache
+def metrics_view(request):
+    """Endpoint de scrape: ``Authorization: Bearer <METRICS_TOKEN>`` ou usuário staff."""
+    if not _authorized(request):
+        return HttpResponse(status=403)
+    flush(force=True)
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,13 +1,79 @@
 import json
 import logging
+import random
 import time
 
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
-logger = logging.getLogger("django.request")
+from expenses.profiling import profile_request
+from expenses.tasks import store_slow_queries
+
+from .metrics import QueryStats, observe_request, route_name
+from .replica import pin_to_primary
+from .request_body import get_json_body
+from .sharding import user_shard
+
+logger = logging.getLogger("audit")
+slow_query_logger = logging.getLogger("expenses.slow_queries")
+
+# Corpos maiores (ex.: bulk_update/bulk_delete) não entram no log de auditoria.
+AUDIT_BODY_MAX_BYTES = 2000
+
+SAMPLED_METHODS = ("GET", "HEAD", "OPTIONS")
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+
+class HybridMiddleware:
+    """
+    Base de middleware síncrono e assíncrono (``sync_capable`` e ``async_capable``).
+
+    Sob ASGI a cadeia fica inteiramente assíncrona e as views ``async`` não
+    ocupam uma thread por requisição. As subclasses implementam ``call`` e ``acall``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        return self.call(request)
+
+
+class _BodyText:
+    """Texto do corpo na mensagem, montado só quando o registro é formatado."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        if self.data is None:
+            return ""
+        return f" body={json.dumps(self.data, ensure_ascii=False)[:500]}"
 
 
 class RequestLoggingMiddleware(MiddlewareMixin):
+    """
+    Log de auditoria de cada requisição no logger ``audit``.
+
+    Erros (status >= 400) e requisições lentas (``AUDIT_LOG_SLOW_REQUEST_MS``)
+    são sempre registrados; leituras bem-sucedidas são amostradas com
+    ``AUDIT_LOG_GET_SAMPLE_RATE``. Os campos também vão estruturados em
+    ``extra["audit"]`` para o ``JSONFormatter``.
+    """
+
     def process_request(self, request):
         request._start_time = time.monotonic()
 
@@ -15,23 +81,202 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         duration = None
         if hasattr(request, "_start_time"):
             duration = time.monotonic() - request._start_time
+
+        status = response.status_code
+        slow = duration is not None and duration * 1000 >= settings.AUDIT_LOG_SLOW_REQUEST_MS
+        if status < 400 and not slow and not self._sampled(request):
+            return response
+
         user = getattr(request, "user", None)
-        extra = ""
+        fields = {
+            "event": "request",
+            "user": getattr(user, "username", None),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": status,
+            "duration_ms": round(duration * 1000, 1) if duration is not None else None,
+            "slow": slow,
+        }
+        body = self._body(request)
+        if body is not None:
+            fields["body"] = body
+
+        if status >= 500:
+            level = logging.ERROR
+        elif status >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        logger.log(
+            level,
+            "[AUDIT] user=%s method=%s path=%s status=%s duration=%.3fs%s",
+            fields["user"],
+            request.method,
+            fields["path"],
+            status,
+            duration or 0,
+            _BodyText(body),
+            extra={"audit": fields},
+        )
+        return response
+
+    def _sampled(self, request):
+        if request.method not in SAMPLED_METHODS:
+            return True
+        rate = settings.AUDIT_LOG_GET_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    def _body(self, request):
+        """Corpo JSON (com senha mascarada) de escritas pequenas, ou ``None``."""
+        if request.method not in BODY_METHODS or request.content_type != "application/json":
+            return None
+        try:
+            if len(request.body) > AUDIT_BODY_MAX_BYTES:
+                return None
+            data = get_json_body(request)
+        except Exception:
+            return None
+        if isinstance(data, dict) and "password" in data:
+            data = {**data, "password": "***REDACTED***"}
+        return data
+
+
+class LedgerShardMiddleware(HybridMiddleware):
+    """
+    Isola por requisição o usuário ativo do sharding de lançamentos.
+
+    A autenticação da API ativa o usuário no contexto; sem este middleware ele
+    vazaria para a próxima requisição atendida pela mesma thread.
+    """
+
+    def call(self, request):
+        with user_shard(None):
+            return self.get_response(request)
+
+    async def acall(self, request):
+        with user_shard(None):
+            return await self.get_response(request)
+
+
+class ReadYourWritesMiddleware(HybridMiddleware):
+    """
+    Fixa no primário as leituras analíticas de quem acabou de escrever.
+
+    A autenticação JWT acontece na view do DRF, que repassa o usuário para o
+    ``HttpRequest``: por isso o pin é feito depois da resposta.
+    """
+
+    def call(self, request):
+        response = self.get_response(request)
+        if request.method not in SAMPLED_METHODS:
+            self._pin(request)
+        return response
+
+    async def acall(self, request):
+        response = await self.get_response(request)
+        if request.method not in SAMPLED_METHODS:
+            # O usuário da sessão é carregado sob demanda (consulta síncrona).
+            await sync_to_async(self._pin)(request)
+        return response
+
+    def _pin(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Registra latência, número de consultas SQL e tempo de banco por rota, e
+    envia as consultas lentas da requisição para a task ``store_slow_queries``.
+
+    Deve ser o primeiro middleware para medir a requisição inteira.
+    """
+
+    def call(self, request):
+        queries = QueryStats()
+        start = time.perf_counter()
+        with queries.track():
+            response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def acall(self, request):
+        queries = QueryStats()
+        start = time.perf_counter()
+        # O ORM assíncrono usa a thread (e as conexões) thread-sensitive da
+        # requisição: o wrapper precisa ser instalado e removido nela.
+        tracking = await sync_to_async(queries.track)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(tracking.close)()
+        await sync_to_async(self._observe)(request, response, time.perf_counter() - start, queries)
+        return response
+
+    def _observe(self, request, response, duration, queries):
+        observe_request(request, response, duration, queries)
+        if queries.slow:
+            self._store_slow_queries(request, queries.slow)
+
+    def _store_slow_queries(self, request, captured):
+        # EXPLAIN e gravação ficam no worker do Celery; sem broker, o registro se perde.
+        user = getattr(request, "user", None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        try:
+            store_slow_queries.apply_async(
+                (captured, f"view:{route_name(request)}", user_id), retry=False
+            )
+        except Exception:
+            slow_query_logger.warning("Falha ao enfileirar consultas lentas", exc_info=True)
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Perfila requisições (cProfile + tracemalloc) e grava em ``RequestProfile``.
+
+    Dispara por amostragem (``PROFILING_SAMPLE_RATE``) ou quando um usuário staff
+    envia o cabeçalho ``PROFILING_HEADER``. Desligado, o custo é um sorteio e a
+    leitura de um cabeçalho. Sob ASGI o cProfile só enxerga a parte síncrona
+    da requisição; o tracemalloc mede o processo todo.
+    """
+
+    def call(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return profile_request(self.get_response, request, trigger, route_name)
+
+    async def acall(self, request):
         if (
-            request.method in ["POST", "PUT", "PATCH"]
-            and request.content_type == "application/json"
+            not request.headers.get(settings.PROFILING_HEADER)
+            and settings.PROFILING_SAMPLE_RATE <= 0
         ):
-            try:
-                body = request.body.decode("utf-8")[:2000]
-                data = json.loads(body)
-                if "password" in data:
-                    data["password"] = "***REDACTED***"
-                extra = f" body={json.dumps(data, ensure_ascii=False)[:500]}"
-            except Exception:
-                pass
-        logger.info(
-            f"[AUDIT] user={getattr(user, 'username', None)} method={request.method}"
-            f" path={request.get_full_path()} status={response.status_code}"
-            f" duration={duration:.3f}s{extra}"
+            return await self.get_response(request)
+        trigger = await sync_to_async(self._trigger)(request)
+        if trigger is None:
+            return await self.get_response(request)
+        return await sync_to_async(profile_request)(
+            async_to_sync(self.get_response), request, trigger, route_name
         )
-        return response
+
+    def _trigger(self, request):
+        if request.headers.get(settings.PROFILING_HEADER) and self._is_staff(request):
+            return "header"
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate > 0 and random.random() < rate:
+            return "sample"
+        return None
+
+    def _is_staff(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            return True
+        # A API autentica por JWT na view do DRF; aqui o token é validado à parte.
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except (AuthenticationFailed, TokenError):
+            # Cabeçalho malformado, token inválido/revogado ou usuário inativo: a
+            # view do DRF responde 401; aqui só não há perfil.
+            return False
+        return authenticated is not None and authenticated[0].is_staff
@@ -0,0 +1,37 @@
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+from django.core.paginator import InvalidPage
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """Paginação padrão da API, permitindo ao cliente escolher ``?page_size=``."""
+
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Versão assíncrona de ``paginate_queryset`` (``acount`` + ``async for``).
+
+        O ``Paginator`` calcula a página sobre ``range(count)``; só a fatia da
+        página é buscada no banco, como na versão síncrona.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(range(await queryset.acount()), page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        start, stop = self.page.object_list.start, self.page.object_list.stop
+        self.page.object_list = [row async for row in queryset[start:stop]]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return self.page.object_list
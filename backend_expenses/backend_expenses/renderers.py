@@ -0,0 +1,81 @@
+"""
+Renderer e parser JSON baseados em orjson.
+
+São opcionais: sem o pacote ``orjson`` instalado, caem no comportamento padrão
+do DRF. Tipos que o orjson não serializa do mesmo jeito que o DRF (Decimal,
+datetime, lazy strings, QuerySets de ``values()``...) passam pelo
+``JSONEncoder.default`` do próprio DRF, mantendo a saída idêntica.
+"""
+
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+from .request_body import JSON_CONTENT_TYPE, cache_json_body, get_json_body, has_json_body
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+_drf_default = encoders.JSONEncoder().default
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer com a mesma saída compacta do DRF, serializada via orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson só suporta indentação de 2 espaços (usado pela API navegável).
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=options)
+        except orjson.JSONEncodeError:
+            # Ex.: inteiros acima de 64 bits; o encoder padrão lida com eles.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Mesmo escape do JSONRenderer do DRF para manter JSON um subconjunto de JS.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    JSONParser que decodifica o corpo com orjson (espera UTF-8).
+
+    Reaproveita o corpo já decodificado pelos middlewares (``request_body``) e,
+    quando é ele quem decodifica, deixa o resultado em cache para os próximos.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = getattr((parser_context or {}).get("request"), "_request", None)
+        if request is not None and has_json_body(request):
+            try:
+                return get_json_body(request)
+            except ValueError as exc:
+                raise ParseError("JSON parse error - %s" % str(exc))
+
+        if orjson is None:
+            data = super().parse(stream, media_type, parser_context)
+        else:
+            try:
+                data = orjson.loads(stream.read())
+            except orjson.JSONDecodeError as exc:
+                raise ParseError("JSON parse error - %s" % str(exc))
+        if request is not None and request.content_type == JSON_CONTENT_TYPE:
+            cache_json_body(request, data)
+        return data
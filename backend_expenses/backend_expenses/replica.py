@@ -0,0 +1,71 @@
+"""
+Réplica de leitura para análises e exportações.
+
+As agregações (``FinancialAnalysisService``, relatório mensal) e a iteração das
+exportações escolhem o banco com ``analytics_db(user)``: a réplica
+(``REPLICA_DATABASE_ALIAS``) quando ela está configurada, ou o primário quando o
+usuário escreveu há menos de ``REPLICA_PIN_SECONDS`` (read-your-writes: a réplica
+pode estar atrasada em relação ao que ele acabou de gravar). O pin é gravado no
+cache ``default`` por ``ReadYourWritesMiddleware``; com vários workers o cache
+precisa ser compartilhado.
+
+As demais leituras e todas as escritas continuam no primário (``PrimaryReplicaRouter``).
+A réplica é do ``default``: usuários de outros shards (``backend_expenses.sharding``)
+leem sempre do próprio shard.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .sharding import shard_for
+
+PIN_KEY = "replica:pin:{}"
+
+
+def replica_configured():
+    alias = settings.REPLICA_DATABASE_ALIAS
+    return bool(alias) and alias in settings.DATABASES
+
+
+def pin_to_primary(user):
+    """Lê do primário as análises de ``user`` (objeto ou id) pelos próximos segundos."""
+    if replica_configured():
+        cache.set(PIN_KEY.format(getattr(user, "pk", user)), 1, settings.REPLICA_PIN_SECONDS)
+
+
+def analytics_db(user):
+    """Alias para as leituras analíticas de ``user`` (objeto ou id)."""
+    primary = shard_for(user)
+    if primary != DEFAULT_DB_ALIAS or not replica_configured():
+        return primary
+    # Numa transação do primário, a réplica não enxergaria o que ainda não foi commitado.
+    if connections[primary].in_atomic_block:
+        return primary
+    if cache.get(PIN_KEY.format(getattr(user, "pk", user))):
+        return primary
+    return settings.REPLICA_DATABASE_ALIAS
+
+
+class PrimaryReplicaRouter:
+    """
+    Escritas e leituras implícitas no primário; a réplica só é usada com ``using()``.
+
+    Objetos lidos da réplica continuam sendo gravados no primário e podem se
+    relacionar com objetos do primário; a réplica não recebe migrações.
+    """
+
+    def db_for_read(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.REPLICA_DATABASE_ALIAS
@@ -0,0 +1,66 @@
+"""
+Cache do corpo JSON da requisição.
+
+O corpo ``application/json`` é decodificado uma única vez e guardado no
+``HttpRequest``; o ``PasswordDecryptionMiddleware``, o ``ORJSONParser`` do DRF e
+o ``RequestLoggingMiddleware`` leem daqui em vez de repetir o ``json.loads``.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json"
+
+_CACHE_ATTR = "_json_body_cache"
+
+
+def _loads(raw):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dumps(data):
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode("utf-8")
+
+
+def get_json_body(request):
+    """
+    Retorna o corpo JSON decodificado de ``request`` (um ``HttpRequest``).
+
+    Retorna ``None`` quando a requisição não é JSON ou não tem corpo. Um corpo
+    inválido levanta ``ValueError``; o erro também fica em cache.
+    """
+    cached = getattr(request, _CACHE_ATTR, None)
+    if cached is None:
+        if request.content_type != JSON_CONTENT_TYPE or not request.body:
+            cached = (None, None)
+        else:
+            try:
+                cached = (_loads(request.body), None)
+            except ValueError as exc:
+                cached = (None, exc)
+        setattr(request, _CACHE_ATTR, cached)
+
+    data, error = cached
+    if error is not None:
+        raise error
+    return data
+
+
+def has_json_body(request):
+    """Indica se o corpo de ``request`` já foi decodificado e está em cache."""
+    return getattr(request, _CACHE_ATTR, None) is not None
+
+
+def cache_json_body(request, data):
+    """Guarda ``data`` como corpo decodificado sem alterar ``request.body``."""
+    setattr(request, _CACHE_ATTR, (data, None))
+
+
+def replace_json_body(request, data):
+    """Substitui o corpo da requisição por ``data``, mantendo o cache coerente."""
+    request._body = _dumps(data)
+    cache_json_body(request, data)
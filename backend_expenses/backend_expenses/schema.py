@@ -0,0 +1,110 @@
+"""
+Schema OpenAPI pré-gerado.
+
+Gerar o schema percorre todas as views e serializers (centenas de ms de CPU por
+requisição). O comando ``build_openapi_schema`` grava o JSON em
+``OPENAPI_SCHEMA_FILE`` (e o YAML ao lado, ``.yaml``) na subida do container
+(docker-compose.aws.yml), e ``openapi_schema`` serve o arquivo com ETag e ``Cache-Control`` de
+``OPENAPI_SCHEMA_MAX_AGE`` segundos; o Swagger UI e o ReDoc buscam o schema nessa
+rota (``SPEC_URL``). Sem o arquivo, a primeira requisição do processo o gera. Com
+``DEBUG`` o schema é gerado a cada requisição, para acompanhar o código.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from rest_framework.views import APIView
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+API_INFO = openapi.Info(
+    title="Despesa Certa API",
+    default_version="v1",
+    description="Documentação automática da API de despesas",
+)
+CODECS = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+
+_lock = threading.Lock()
+# arquivo -> ((mtime, tamanho), conteúdo, ETag) do que este processo serve.
+_loaded = {}
+
+
+def render_schema():
+    """Gera o schema público da API; devolve ``{formato: bytes}`` (json e yaml)."""
+    # Sem host/scheme (url=""): a UI usa os da página. As views leem ``request.user``
+    # em get_queryset, daí a requisição anônima.
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO, url="")
+    request = APIView().initialize_request(RequestFactory().get("/api/schema/"))
+    request.user = AnonymousUser()
+    schema = generator.get_schema(request, public=True)
+    return {fmt: codec(validators=[]).encode(schema) for fmt, codec in CODECS.items()}
+
+
+def schema_path(fmt="json", path=None):
+    """Arquivo do formato ``fmt``: ``path`` (ou ``OPENAPI_SCHEMA_FILE``) e o ``.yaml`` ao lado."""
+    path = path or settings.OPENAPI_SCHEMA_FILE
+    return path if fmt == "json" else f"{os.path.splitext(path)[0]}.{fmt}"
+
+
+def _write(path, content):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_schema(path=None):
+    """Grava o schema em cada formato (ver ``schema_path``) por troca atômica."""
+    paths = []
+    for fmt, content in render_schema().items():
+        paths.append(schema_path(fmt, path))
+        _write(paths[-1], content)
+    return paths
+
+
+def _etag(content):
+    return quote_etag(hashlib.sha256(content).hexdigest()[:32])
+
+
+def load_schema(fmt="json"):
+    """Conteúdo e ETag do schema; relê o arquivo só quando ele muda."""
+    if settings.DEBUG:
+        content = render_schema()[fmt]
+        return content, _etag(content)
+    path = schema_path(fmt)
+    with _lock:
+        if not os.path.exists(path):
+            write_schema()
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if path not in _loaded or _loaded[path][0] != key:
+            with open(path, "rb") as fp:
+                content = fp.read()
+            _loaded[path] = (key, content, _etag(content))
+        return _loaded[path][1:]
+
+
+def openapi_schema(request, fmt="json", content_type="application/json"):
+    content, etag = load_schema(fmt)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
@@ -32,6 +32,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "backend_expenses.middleware.MetricsMiddleware",
+    "backend_expenses.middleware.LedgerShardMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "backend_expenses.crypto_middleware.PasswordDecryptionMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -42,6 +44,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "backend_expenses.middleware.RequestLoggingMiddleware",
+    "backend_expenses.middleware.ReadYourWritesMiddleware",
+    "backend_expenses.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "backend_expenses.urls"
@@ -100,7 +104,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "backend_expenses.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -110,16 +114,32 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
         "rest_framework.filters.SearchFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "backend_expenses.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "backend_expenses.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "backend_expenses.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # Janela deslizante atômica no Redis quando o cache default é Redis.
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "backend_expenses.throttling.AnonRateThrottle",
+        "backend_expenses.throttling.UserRateThrottle",
+        "backend_expenses.throttling.ScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
         "user": "1000/hour",
         "login": "5/min",
+        # throttle_scope das views; escopos fora desta lista não têm limite próprio.
+        "expenses": "120/min",
+        "summary": "60/min",
+        "alerts": "60/min",
+        "export": "10/min",
     },
 }
 
@@ -132,7 +152,11 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": True,
+    # Tokens levam o hash da senha (versão): trocar a senha revoga os anteriores.
+    "CHECK_REVOKE_TOKEN": True,
 }
+# Usuário do token em cache (backend_expenses.authentication), em segundos.
+AUTH_USER_CACHE_SECONDS = config("AUTH_USER_CACHE_SECONDS", default=60, cast=int)
 
 # Celery settings
 if os.environ.get("RUNNING_IN_DOCKER", False):
@@ -142,6 +166,122 @@ else:
 
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=f"redis://{redis_host}:6379/0")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default=f"redis://{redis_host}:6379/0")
+# Executado pelo ``celery beat``: partições futuras e retenção do histórico
+# (expenses.partitioning) e dos tombstones do delta sync.
+CELERY_BEAT_SCHEDULE = {
+    "maintain-partitions": {
+        "task": "expenses.tasks.maintain_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+    "prune-sync-tombstones": {
+        "task": "expenses.tasks.prune_sync_tombstones",
+        "schedule": 24 * 60 * 60,
+    },
+}
+
+# Dashboard: executa as consultas independentes em paralelo (uma conexão por
+# consulta). Só compensa com conexões baratas, ex.: atrás de um PgBouncer.
+DASHBOARD_CONCURRENT_QUERIES = config("DASHBOARD_CONCURRENT_QUERIES", default=False, cast=bool)
+
+# Réplica de leitura (backend_expenses.replica): análises e exportações leem do
+# alias abaixo quando ele existe em DATABASES (ver DB_REPLICA_HOST em local.py e
+# production.py); depois de uma escrita o usuário lê do primário por alguns segundos.
+DATABASE_ROUTERS = [
+    "backend_expenses.sharding.ShardRouter",
+    "backend_expenses.replica.PrimaryReplicaRouter",
+]
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+
+# Shards dos lançamentos por usuário (backend_expenses.sharding), em ordem. Cada
+# alias além do "default" vira um banco em DATABASES (ver shard_databases).
+LEDGER_SHARDS = config("LEDGER_SHARDS", default="default", cast=Csv())
+
+# Arquivo frio (expenses.archive): despesas anteriores a 1º de janeiro de
+# ARCHIVE_HORIZON_YEARS anos atrás vão para arquivos Parquet em ARCHIVE_ROOT
+# (compartilhado entre os servidores) com ``manage.py archive_expenses``.
+ARCHIVE_ROOT = config("ARCHIVE_ROOT", default=os.path.join(BASE_DIR, "archive"))
+ARCHIVE_HORIZON_YEARS = config("ARCHIVE_HORIZON_YEARS", default=3, cast=int)
+
+# Schema OpenAPI pré-gerado (backend_expenses.schema): ``manage.py build_openapi_schema``
+# grava o arquivo na subida; Swagger UI e ReDoc leem de /api/schema/.
+OPENAPI_SCHEMA_FILE = config("OPENAPI_SCHEMA_FILE", default=os.path.join(BASE_DIR, "openapi.json"))
+OPENAPI_SCHEMA_MAX_AGE = config("OPENAPI_SCHEMA_MAX_AGE", default=86400, cast=int)
+SWAGGER_SETTINGS = {"SPEC_URL": "openapi-schema"}
+REDOC_SETTINGS = {"SPEC_URL": "openapi-schema"}
+
+
+def shard_databases(default):
+    """
+    Bancos dos shards além do ``default``: mesmas credenciais, banco
+    ``<nome>_<alias>`` e host/porta sobrescrevíveis por ``DB_<ALIAS>_HOST``/``_PORT``.
+    """
+    databases = {}
+    for alias in LEDGER_SHARDS:
+        if alias == "default":
+            continue
+        prefix = f"DB_{alias.upper()}"
+        databases[alias] = {
+            **default,
+            "NAME": config(f"{prefix}_NAME", default=f"{default['NAME']}_{alias}"),
+            "HOST": config(f"{prefix}_HOST", default=default["HOST"]),
+            "PORT": config(f"{prefix}_PORT", default=default["PORT"], cast=int),
+        }
+    return databases
+
+
+# Delta sync (expenses.services.DeltaSyncService): só serve alterações com mais de
+# SYNC_SAFETY_WINDOW segundos, o maior tempo esperado entre o save e o commit.
+SYNC_SAFETY_WINDOW = config("SYNC_SAFETY_WINDOW", default=30, cast=int)
+# Exclusões (SyncTombstone) guardadas para o delta sync; cursores mais antigos
+# recebem 410 e refazem a sincronização completa.
+SYNC_TOMBSTONE_RETENTION_DAYS = config("SYNC_TOMBSTONE_RETENTION_DAYS", default=90, cast=int)
+
+# Serve o resumo financeiro, o relatório mensal e a listagem de alertas pelas
+# views assíncronas (expenses.async_views). Só compensa sob ASGI (perfil "asgi").
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
+
+# Log de auditoria (RequestLoggingMiddleware): fração das leituras bem-sucedidas
+# registradas; erros e requisições acima do limite de lentidão sempre entram.
+AUDIT_LOG_GET_SAMPLE_RATE = config("AUDIT_LOG_GET_SAMPLE_RATE", default=1.0, cast=float)
+AUDIT_LOG_SLOW_REQUEST_MS = config("AUDIT_LOG_SLOW_REQUEST_MS", default=1000, cast=int)
+# Tamanho da fila em memória na frente do destino do log (registros excedentes
+# são descartados em vez de bloquear a requisição).
+AUDIT_LOG_QUEUE_SIZE = config("AUDIT_LOG_QUEUE_SIZE", default=10000, cast=int)
+
+# Métricas Prometheus em /metrics (backend_expenses.metrics). Com vários workers
+# (gunicorn/Celery), METRICS_MULTIPROC_DIR deve apontar para um diretório
+# compartilhado e vazio no início do deploy. METRICS_FLUSH_INTERVAL é também a
+# perda máxima de contagem de um worker morto por SIGKILL.
+METRICS_MULTIPROC_DIR = config("METRICS_MULTIPROC_DIR", default=None)
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5, cast=float)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Consultas lentas (expenses.slow_queries): limite em ms (0 desliga), tamanho do
+# buffer circular na tabela e intervalo mínimo entre EXPLAINs da mesma consulta.
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=500, cast=int)
+SLOW_QUERY_MAX_ROWS = config("SLOW_QUERY_MAX_ROWS", default=1000, cast=int)
+SLOW_QUERY_EXPLAIN_INTERVAL = config("SLOW_QUERY_EXPLAIN_INTERVAL", default=3600, cast=int)
+
+# Perfilamento de requisições (ProfilingMiddleware): fração amostrada, cabeçalho
+# que usuários staff enviam para perfilar uma requisição e perfis mantidos.
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_HEADER = config("PROFILING_HEADER", default="X-Profile-Request")
+PROFILING_MAX_ROWS = config("PROFILING_MAX_ROWS", default=200, cast=int)
+
+# Cache compartilhado entre os workers (throttling, pins da réplica) quando
+# CACHE_REDIS_URL está definido; sem ele, cache local de cada processo.
+CACHE_REDIS_URL = config("CACHE_REDIS_URL", default="")
+CACHES = {
+    "default": {
+        "BACKEND": "backend_expenses.cache.InstrumentedLocMemCache",
+    }
+}
+if CACHE_REDIS_URL:
+    CACHES["default"] = {
+        "BACKEND": "backend_expenses.cache.InstrumentedRedisCache",
+        "LOCATION": CACHE_REDIS_URL,
+    }
 
 # Configurações de criptografia
 ENCRYPTION_KEY = os.environ.get("ENCRYPTION_KEY", "despesa-certa-secret-key-2025")
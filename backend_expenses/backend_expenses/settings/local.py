@@ -38,6 +38,19 @@ else:
         }
     }
 
+# Réplica de leitura opcional (um segundo container/banco Postgres para testar localmente).
+if config("DB_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": config("DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+        "HOST": config("DB_REPLICA_HOST"),
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"], cast=int),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Shards dos lançamentos (LEDGER_SHARDS=default,shard1,...).
+DATABASES.update(shard_databases(DATABASES["default"]))
+
 # CORS settings para desenvolvimento
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -68,5 +81,10 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "audit": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -24,6 +24,26 @@ DATABASES = {
     }
 }
 
+# Réplica de leitura opcional (streaming replica do Postgres primário).
+if config("DB_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": config("DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+        "HOST": config("DB_REPLICA_HOST"),
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"], cast=int),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Shards dos lançamentos (LEDGER_SHARDS=default,shard1,...).
+DATABASES.update(shard_databases(DATABASES["default"]))
+
+# Cache no Redis (o mesmo servidor do Celery, banco 1): limites de throttling
+# valem para todos os workers.
+CACHES["default"] = {
+    "BACKEND": "backend_expenses.cache.InstrumentedRedisCache",
+    "LOCATION": CACHE_REDIS_URL or f"redis://{redis_host}:6379/1",
+}
+
 # CORS settings para produção (mais permissivo para simplificar)
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -76,12 +96,22 @@ LOGGING = {
             "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "backend_expenses.audit_logging.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+        # Auditoria em JSON, escrita por uma thread em segundo plano.
+        "audit": {
+            "()": "backend_expenses.audit_logging.BackgroundQueueHandler",
+            "queue_size": AUDIT_LOG_QUEUE_SIZE,
+            "filename": config("AUDIT_LOG_FILE", default=None),
+            "formatter": "json",
+        },
     },
     "root": {
         "handlers": ["console"],
@@ -98,6 +128,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "audit": {
+            "handlers": ["audit"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -0,0 +1,148 @@
+"""
+Sharding horizontal dos lançamentos por usuário.
+
+Os modelos de ``LEDGER_MODELS`` (despesas, histórico, rendas, alertas e
+tombstones) de cada usuário ficam inteiros num dos bancos de ``LEDGER_SHARDS``,
+escolhido por um anel de hashing consistente sobre o id do usuário: incluir ou
+remover um shard só move os usuários dos trechos do anel afetados
+(``manage.py reshard_ledgers``). Usuários e o resto das tabelas ficam no
+``default``; cada shard recebe uma cópia da linha do usuário para as FKs.
+
+Como toda consulta da aplicação é de um usuário, o ``ShardRouter`` usa o
+usuário ativo no contexto: a autenticação da API
+(``backend_expenses.authentication``) o ativa na requisição e tasks
+usam ``user_shard(user_id)``. Objetos já carregados ou com ``user_id`` são
+roteados pelo próprio objeto. Com um único shard (o padrão) tudo fica no ``default``.
+"""
+
+import bisect
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+LEDGER_MODELS = {
+    "expenses.Expense",
+    "expenses.ExpenseHistory",
+    "expenses.MonthlyIncome",
+    "expenses.FinancialAlert",
+    "expenses.SyncTombstone",
+}
+VIRTUAL_NODES = 128
+
+_active_user = ContextVar("ledger_user", default=None)
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(str(value).encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Anel de hashing consistente com ``VIRTUAL_NODES`` pontos por shard."""
+
+    def __init__(self, nodes, virtual_nodes=VIRTUAL_NODES):
+        points = sorted(
+            (_hash(f"{node}#{index}"), node) for node in nodes for index in range(virtual_nodes)
+        )
+        self.keys = [key for key, _ in points]
+        self.nodes = [node for _, node in points]
+
+    def node_for(self, key):
+        index = bisect.bisect(self.keys, _hash(key)) % len(self.keys)
+        return self.nodes[index]
+
+
+@lru_cache(maxsize=8)
+def ring(shards):
+    return HashRing(shards)
+
+
+def is_sharded():
+    return list(settings.LEDGER_SHARDS) != [DEFAULT_DB_ALIAS]
+
+
+def shard_for(user, shards=None):
+    """Alias do banco com os lançamentos de ``user`` (objeto ou id)."""
+    shards = tuple(shards or settings.LEDGER_SHARDS)
+    if len(shards) == 1:
+        return shards[0]
+    return ring(shards).node_for(getattr(user, "pk", user))
+
+
+def activate_user(user):
+    """Ativa ``user`` (objeto ou id) até o fim do contexto atual (requisição/task)."""
+    _active_user.set(getattr(user, "pk", user))
+
+
+def active_user_id():
+    return _active_user.get()
+
+
+@contextmanager
+def user_shard(user):
+    """
+    Roteia para o shard de ``user`` as consultas de lançamentos dentro do bloco.
+
+    ``user_shard(None)`` isola um bloco (ex.: a requisição) sem usuário ativo.
+    """
+    token = _active_user.set(getattr(user, "pk", user))
+    try:
+        yield shard_for(user) if user is not None else None
+    finally:
+        _active_user.reset(token)
+
+
+def is_ledger(model):
+    return model._meta.label in LEDGER_MODELS
+
+
+def copy_user_to_shard(user):
+    """Grava no shard do usuário a cópia da linha de ``auth_user`` exigida pelas FKs."""
+    alias = shard_for(user)
+    if alias == (user._state.db or DEFAULT_DB_ALIAS):
+        return
+    fields = {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields}
+    type(user)(**fields).save(using=alias)
+
+
+def delete_user_from_shard(user):
+    alias = shard_for(user)
+    if alias != (user._state.db or DEFAULT_DB_ALIAS):
+        type(user).objects.using(alias).filter(pk=user.pk).delete()
+
+
+class ShardRouter:
+    """Roteia os modelos de ``LEDGER_MODELS`` para o shard do usuário."""
+
+    def _db(self, model, instance=None, **hints):
+        if not is_ledger(model):
+            return None
+        if instance is not None and is_ledger(type(instance)):
+            if instance._state.db is not None:
+                return instance._state.db
+            if getattr(instance, "user_id", None) is not None:
+                return shard_for(instance.user_id)
+        elif instance is not None and instance._meta.label == settings.AUTH_USER_MODEL:
+            # Relações reversas do usuário (``user.expenses``).
+            return shard_for(instance)
+        user_id = active_user_id()
+        return shard_for(user_id) if user_id is not None else None
+
+    db_for_read = _db
+    db_for_write = _db
+
+    def allow_relation(self, obj1, obj2, **hints):
+        ledger1, ledger2 = is_ledger(type(obj1)), is_ledger(type(obj2))
+        if ledger1 and ledger2:
+            return obj1._state.db == obj2._state.db
+        if ledger1 or ledger2:
+            # Lançamento e usuário: a FK aponta para a cópia do usuário no shard.
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Todos os shards têm o schema completo (auth_user inclusive, pelas FKs).
+        return None
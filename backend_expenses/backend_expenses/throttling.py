@@ -0,0 +1,108 @@
+"""
+Throttling do DRF com verificação atômica no Redis.
+
+Com o cache ``default`` no Redis (``CACHE_REDIS_URL``), cada verificação é um
+único ``EVALSHA`` de uma janela deslizante num sorted set: remove os acessos
+fora da janela, conta, registra o acesso e devolve o tempo de espera, tudo no
+servidor e com o relógio do Redis. O ``SimpleRateThrottle`` do DRF faz ``get`` +
+``set`` da lista de horários: duas idas ao cache e corrida entre workers.
+
+Com outros backends (LocMem em desenvolvimento e nos testes) as classes se
+comportam como as do DRF. Se o Redis falhar, a requisição passa (fail open).
+"""
+
+import hashlib
+import logging
+import os
+
+from redis.exceptions import NoScriptError, RedisError
+from rest_framework import throttling
+
+from django.core.cache.backends.redis import RedisCache
+from django.utils.connection import ConnectionProxy
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: sorted set dos acessos; ARGV: limite, janela (ms), id do acesso.
+# Retorna {permitido, espera em ms}.
+SLIDING_WINDOW = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now_ms}
+"""
+SLIDING_WINDOW_SHA = hashlib.sha1(SLIDING_WINDOW.encode("utf-8")).hexdigest()
+
+
+def redis_client(cache):
+    """Cliente redis-py do backend de cache do Django, ou ``None`` se não for Redis."""
+    if isinstance(cache, ConnectionProxy):
+        cache = cache._connections[cache._alias]
+    if isinstance(cache, RedisCache):
+        return cache._cache.get_client(write=True)
+    return None
+
+
+def sliding_window(client, key, limit, window_ms):
+    """Registra um acesso em ``key``; retorna ``(permitido, espera em segundos)``."""
+    args = (key, limit, window_ms, os.urandom(8).hex())
+    try:
+        allowed, wait_ms = client.evalsha(SLIDING_WINDOW_SHA, 1, *args)
+    except NoScriptError:
+        # Primeiro uso neste servidor (ou após SCRIPT FLUSH/restart).
+        allowed, wait_ms = client.eval(SLIDING_WINDOW, 1, *args)
+    return bool(allowed), wait_ms / 1000
+
+
+class RedisRateThrottle(throttling.SimpleRateThrottle):
+    """``SimpleRateThrottle`` com a janela deslizante atômica no Redis."""
+
+    retry_after = None
+
+    def allow_request(self, request, view):
+        client = redis_client(self.cache)
+        if client is None:
+            return super().allow_request(request, view)
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, wait = sliding_window(
+                client, self.cache.make_key(self.key), self.num_requests, int(self.duration * 1000)
+            )
+        except RedisError:
+            logger.warning("Throttling indisponível (Redis)", exc_info=True)
+            return True
+        self.retry_after = None if allowed else wait
+        return allowed
+
+    def wait(self):
+        if self.retry_after is not None:
+            return self.retry_after
+        return super().wait()
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, RedisRateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, RedisRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, RedisRateThrottle):
+    """``throttle_scope`` das views; escopos sem taxa em ``DEFAULT_THROTTLE_RATES`` não limitam."""
+
+    def allow_request(self, request, view):
+        if getattr(view, self.scope_attr, None) not in self.THROTTLE_RATES:
+            return True
+        return super().allow_request(request, view)
@@ -1,6 +1,5 @@
-from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
-from rest_framework import permissions, routers, throttling
+from rest_framework import permissions, routers
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from django.conf import settings
@@ -12,8 +11,12 @@ from django.views.decorators.cache import never_cache
 
 from expenses.views import ExpenseViewSet
 
+from .metrics import metrics_view
+from .schema import API_INFO, openapi_schema
+from .throttling import RedisRateThrottle
 
-class LoginRateThrottle(throttling.SimpleRateThrottle):
+
+class LoginRateThrottle(RedisRateThrottle):
     scope = "login"
 
     def get_cache_key(self, request, view):
@@ -40,27 +43,36 @@ router = routers.DefaultRouter()
 router.register(r"expenses", ExpenseViewSet, basename="expense")
 
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Despesa Certa API",
-        default_version="v1",
-        description="Documentação automática da API de despesas",
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
 )
 
+
+class PrecomputedSchemaView(schema_view):
+    def get(self, request, version="", format=None):
+        # ?format=openapi/json/yaml saem dos arquivos pré-gerados; só o HTML da UI é renderizado.
+        renderer = request.accepted_renderer
+        if renderer.format not in ("swagger", "redoc"):
+            fmt = "yaml" if renderer.format == "yaml" else "json"
+            return openapi_schema(request, fmt, renderer.media_type)
+        return super().get(request, version, format)
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("expenses.urls")),
     path("api/", include(router.urls)),
     path("api/token/", ThrottledTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("metrics", metrics_view, name="metrics"),
+    path("api/schema/", openapi_schema, name="openapi-schema"),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        PrecomputedSchemaView.with_ui("swagger", cache_timeout=0),
         name="schema-swagger-ui",
     ),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("redoc/", PrecomputedSchemaView.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,89 @@
+"""
+Vazão com usuários concorrentes: gunicorn síncrono (WSGI) x worker uvicorn (ASGI).
+
+Roda os mesmos estágios de ``loadtest.py`` contra as duas stacks, mas só com os
+endpoints que têm versão assíncrona (resumo financeiro, relatório mensal e
+alertas), e imprime a vazão e o p95 lado a lado. Para comparar de forma justa, as
+duas stacks devem ter o mesmo número de workers e o mesmo banco.
+
+Uso (na pasta backend_expenses):
+    docker compose --profile asgi up -d backend backend-asgi
+    python benchmarks/bench_asgi.py --sync-url http://localhost:8000 \\
+        --asgi-url http://localhost:8001 --stages 10:30,50:30,100:30 --output asgi.json
+"""
+
+import argparse
+import datetime
+import json
+
+from loadtest import VirtualUser, ensure_users, parse_stages, print_stage, run_stage
+
+
+def read_endpoints(user):
+    user.request("GET", "/financial-summary/")
+    user.request("GET", "/expenses/report/monthly/")
+    user.request("GET", "/financial-alerts/")
+
+
+SCENARIOS = [(read_endpoints, 1), (VirtualUser.login, 0.02)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sync-url", default="http://localhost:8000")
+    parser.add_argument("--asgi-url", default="http://localhost:8001")
+    parser.add_argument(
+        "--stages",
+        type=parse_stages,
+        default=parse_stages("10:30,50:30,100:30"),
+        help="estágios concorrência:segundos separados por vírgula",
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=0.1, help="pausa média entre ações, em segundos"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    targets = {"wsgi": args.sync_url, "asgi": args.asgi_url}
+    users = max(concurrency for concurrency, _ in args.stages)
+    results = {}
+    for name, base_url in targets.items():
+        ensure_users(base_url, users)
+        results[name] = []
+        for concurrency, seconds in args.stages:
+            stage = run_stage(base_url, concurrency, seconds, args.think_time, args.seed, SCENARIOS)
+            print(f"\n[{name}] {base_url}", end="")
+            print_stage(stage)
+            results[name].append(stage)
+
+    print(f"\n{'usuários':>9}{'wsgi req/s':>12}{'asgi req/s':>12}{'ganho':>8}", end="")
+    print(f"{'wsgi p95 ms':>13}{'asgi p95 ms':>13}")
+    for wsgi, asgi in zip(results["wsgi"], results["asgi"]):
+        print(
+            f"{wsgi['concurrency']:>9}{wsgi['throughput']:>12.1f}{asgi['throughput']:>12.1f}"
+            f"{asgi['throughput'] / wsgi['throughput'] - 1:>+8.0%}"
+            f"{_p95(wsgi) * 1000:>13.0f}{_p95(asgi) * 1000:>13.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {
+                    "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "think_time": args.think_time,
+                    "targets": targets,
+                    "results": results,
+                },
+                fp,
+                indent=2,
+            )
+
+
+def _p95(stage):
+    """Maior p95 entre os endpoints do estágio (o mais lento domina a tela)."""
+    return max(row["p95"] for row in stage["endpoints"].values())
+
+
+if __name__ == "__main__":
+    main()
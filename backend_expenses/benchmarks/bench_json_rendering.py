@@ -0,0 +1,129 @@
+"""
+Benchmark de serialização JSON: JSONRenderer/JSONParser do DRF vs orjson.
+
+Mede o custo de renderização das respostas de ``/api/expenses/?page_size=500``
+e ``/api/expenses/report/monthly/`` (dados montados em memória com o mesmo
+formato das views, sem banco) e o parse de um payload de bulk update.
+
+Uso (na pasta backend_expenses):
+    python benchmarks/bench_json_rendering.py --rows 500 --repeat 200
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_expenses.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from backend_expenses.renderers import ORJSONParser, ORJSONRenderer  # noqa: E402
+from expenses.models import Expense  # noqa: E402
+from expenses.serializers import ExpenseSerializer  # noqa: E402
+
+CATEGORIES = [choice for choice, _ in Expense.CATEGORY_CHOICES]
+
+
+def expenses_page(rows):
+    user = get_user_model()(id=1, username="bench")
+    now = timezone.now()
+    expenses = [
+        Expense(
+            id=i,
+            user=user,
+            value=Decimal(i % 997) + Decimal("0.99"),
+            category=CATEGORIES[i % len(CATEGORIES)],
+            date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 365),
+            description=f"Despesa de teste número {i}",
+            created=now,
+            modified=now,
+        )
+        for i in range(rows)
+    ]
+    return {
+        "count": rows,
+        "next": None,
+        "previous": None,
+        "results": ExpenseSerializer(expenses, many=True).data,
+    }
+
+
+def report_monthly(rows):
+    detalhes = [
+        {
+            "month": datetime.date(
+                2000 + i // len(CATEGORIES) // 12, i // len(CATEGORIES) % 12 + 1, 1
+            ),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "total": Decimal(i * 37 % 10000) + Decimal("0.45"),
+        }
+        for i in range(rows)
+    ]
+    return {"total_geral": sum(item["total"] for item in detalhes), "detalhes": detalhes}
+
+
+def bulk_payload(rows):
+    return json.dumps(
+        {"ids": list(range(rows)), "data": {"category": "lazer", "description": "Atualizado"}}
+    ).encode()
+
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    cases = {
+        "expenses_list": expenses_page(args.rows),
+        "report_monthly": report_monthly(args.rows),
+    }
+    results = []
+    for name, data in cases.items():
+        assert JSONRenderer().render(data) == ORJSONRenderer().render(data), name
+        drf = measure(lambda: JSONRenderer().render(data), args.repeat)
+        fast = measure(lambda: ORJSONRenderer().render(data), args.repeat)
+        results.append({"case": f"render:{name}", "rows": args.rows, "drf": drf, "orjson": fast})
+
+    payload = bulk_payload(args.rows)
+    drf = measure(lambda: JSONParser().parse(io.BytesIO(payload)), args.repeat)
+    fast = measure(lambda: ORJSONParser().parse(io.BytesIO(payload)), args.repeat)
+    results.append({"case": "parse:bulk_update", "rows": args.rows, "drf": drf, "orjson": fast})
+
+    print(
+        f"{'caso':<24}{'drf (ms)':>10}{'orjson (ms)':>13}{'linhas/s drf':>15}"
+        f"{'linhas/s orjson':>17}{'ganho':>8}"
+    )
+    for row in results:
+        print(
+            f"{row['case']:<24}{row['drf'] * 1000:>10.3f}{row['orjson'] * 1000:>13.3f}"
+            f"{row['rows'] / row['drf']:>15,.0f}{row['rows'] / row['orjson']:>17,.0f}"
+            f"{row['drf'] / row['orjson']:>7.1f}x"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
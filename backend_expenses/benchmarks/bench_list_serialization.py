@@ -0,0 +1,140 @@
+"""
+Benchmark da listagem: models + serializer vs ``values_list()`` + ValuesRowFormatter.
+
+Cria as linhas no banco configurado dentro de uma transação que é desfeita no
+final, e mede linhas/s de cada caminho (consulta + serialização) para
+despesas, rendas e alertas.
+
+Uso (na pasta backend_expenses):
+    python benchmarks/bench_list_serialization.py --rows 500 --repeat 20
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_expenses.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome  # noqa: E402
+from expenses.serializers import (  # noqa: E402
+    ExpenseSerializer,
+    FinancialAlertSerializer,
+    MonthlyIncomeSerializer,
+    ValuesRowFormatter,
+)
+
+CATEGORIES = [choice for choice, _ in Expense.CATEGORY_CHOICES]
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(user, rows, income_rows):
+    start = datetime.date(2025, 1, 1)
+    Expense.objects.bulk_create(
+        Expense(
+            user=user,
+            value=Decimal(i % 997) + Decimal("0.99"),
+            category=CATEGORIES[i % len(CATEGORIES)],
+            date=start + datetime.timedelta(days=i % 365),
+            description=f"Despesa {i}",
+        )
+        for i in range(rows)
+    )
+    MonthlyIncome.objects.bulk_create(
+        MonthlyIncome(user=user, date=start + datetime.timedelta(days=15 * i), amount=1000 + i)
+        for i in range(income_rows)
+    )
+    FinancialAlert.objects.bulk_create(
+        FinancialAlert(
+            user=user,
+            alert_type="info",
+            title=f"Alerta {i}",
+            message="Mensagem",
+            month=start + datetime.timedelta(days=i % 365),
+        )
+        for i in range(rows)
+    )
+
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument(
+        "--income-rows",
+        type=int,
+        default=48,
+        help="rendas do usuário (poucas por mês, como no uso real)",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    results = []
+    try:
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(username="bench-list-serialization")
+            seed(user, args.rows, args.income_rows)
+            incomes = MonthlyIncome.objects.filter(user=user)
+            cases = [
+                ("expenses", Expense.objects.filter(user=user), None, ExpenseSerializer),
+                ("monthly_income", incomes, incomes.with_month_total(), MonthlyIncomeSerializer),
+                (
+                    "financial_alerts",
+                    FinancialAlert.objects.filter(user=user),
+                    None,
+                    FinancialAlertSerializer,
+                ),
+            ]
+            for name, queryset, values_queryset, serializer_class in cases:
+                # Antes: o queryset original da view (rendas sem a anotação, ou seja, N+1).
+                values_queryset = queryset if values_queryset is None else values_queryset
+                formatter = ValuesRowFormatter.for_serializer(serializer_class)
+                rows = queryset.count()
+                before = measure(
+                    lambda: serializer_class(list(queryset.all()), many=True).data, args.repeat
+                )
+                after = measure(
+                    lambda: formatter.format_many(
+                        list(values_queryset.values_list(*formatter.columns))
+                    ),
+                    args.repeat,
+                )
+                results.append({"case": name, "rows": rows, "serializer": before, "values": after})
+            raise Rollback
+    except Rollback:
+        pass
+
+    print(
+        f"{'caso':<20}{'linhas':>8}{'linhas/s serializer':>21}{'linhas/s values':>17}{'ganho':>8}"
+    )
+    for row in results:
+        print(
+            f"{row['case']:<20}{row['rows']:>8}{row['rows'] / row['serializer']:>21,.0f}"
+            f"{row['rows'] / row['values']:>17,.0f}{row['serializer'] / row['values']:>7.1f}x"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
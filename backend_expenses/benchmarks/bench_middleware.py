@@ -0,0 +1,144 @@
+"""
+Benchmark do custo dos middlewares sobre o corpo de payloads grandes de bulk.
+
+Compara a cadeia PasswordDecryptionMiddleware -> parse do DRF ->
+RequestLoggingMiddleware no formato antigo (três ``json.loads`` do mesmo corpo)
+com a atual, que decodifica o corpo uma única vez (``request_body``). Não toca
+no banco: a "view" apenas lê ``request.data``.
+
+Uso (na pasta backend_expenses):
+    python benchmarks/bench_middleware.py --rows 10000 --repeat 50
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_expenses.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.request import Request  # noqa: E402
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from backend_expenses.crypto_middleware import PasswordDecryptionMiddleware  # noqa: E402
+from backend_expenses.middleware import RequestLoggingMiddleware  # noqa: E402
+from backend_expenses.renderers import ORJSONParser  # noqa: E402
+
+
+def legacy_password_middleware(request):
+    """Reprodução do PasswordDecryptionMiddleware antes do cache do corpo."""
+    if request.content_type == "application/json" and request.body:
+        try:
+            data = json.loads(request.body)
+            if data.get("encrypted"):
+                data.pop("encrypted", None)
+                request._body = json.dumps(data).encode("utf-8")
+        except Exception:
+            pass
+
+
+def legacy_logging_body(request):
+    """Reprodução do trecho de corpo do RequestLoggingMiddleware antigo."""
+    try:
+        body = request.body.decode("utf-8")[:2000]
+        data = json.loads(body)
+        if "password" in data:
+            data["password"] = "***REDACTED***"
+        return f" body={json.dumps(data, ensure_ascii=False)[:500]}"
+    except Exception:
+        return ""
+
+
+def payloads(rows):
+    return {
+        "bulk_update": {
+            "ids": list(range(1, rows + 1)),
+            "data": {"category": "lazer", "description": "Atualizado em massa"},
+        },
+        "bulk_create": [
+            {
+                "value": f"{i % 997}.99",
+                "category": "alimentacao",
+                "date": "2025-08-01",
+                "description": f"Despesa importada {i}",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def run_legacy(factory, body):
+    request = factory.patch("/api/expenses/bulk_update/", body, content_type="application/json")
+    legacy_password_middleware(request)
+    Request(request, parsers=[ORJSONParser()]).data
+    legacy_logging_body(request)
+
+
+def run_current(factory, body, logging_middleware):
+    request = factory.patch("/api/expenses/bulk_update/", body, content_type="application/json")
+
+    def view(req):
+        Request(req, parsers=[ORJSONParser()]).data
+        return HttpResponse()
+
+    logging_middleware.process_request(request)
+    response = PasswordDecryptionMiddleware(view)(request)
+    logging_middleware.process_response(request, response)
+
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    # Mede o processamento, não a escrita do log no console.
+    audit_logger = logging.getLogger("django.request")
+    audit_logger.handlers = [logging.NullHandler()]
+    audit_logger.propagate = False
+
+    factory = RequestFactory()
+    logging_middleware = RequestLoggingMiddleware(lambda request: HttpResponse())
+    results = []
+    for name, payload in payloads(args.rows).items():
+        body = json.dumps(payload)
+        legacy = measure(lambda: run_legacy(factory, body), args.repeat)
+        current = measure(lambda: run_current(factory, body, logging_middleware), args.repeat)
+        results.append(
+            {
+                "case": name,
+                "rows": args.rows,
+                "bytes": len(body),
+                "legacy": legacy,
+                "current": current,
+            }
+        )
+
+    print(f"{'caso':<14}{'bytes':>12}{'antes (ms)':>12}{'atual (ms)':>12}{'ganho':>8}")
+    for row in results:
+        print(
+            f"{row['case']:<14}{row['bytes']:>12,}{row['legacy'] * 1000:>12.3f}"
+            f"{row['current'] * 1000:>12.3f}{row['legacy'] / row['current']:>7.1f}x"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
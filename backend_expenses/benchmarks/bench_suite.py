@@ -0,0 +1,218 @@
+"""
+Suíte de benchmarks dos caminhos críticos: resumo, alertas, exportações, listagem e bulk.
+
+Para cada tamanho de ``--sizes`` cria um usuário com N despesas e N rendas no
+mês corrente (o recorte usado pelo resumo e pelas exportações), mede cada caso
+``--repeat`` vezes e desfaz tudo no final. Cada medição roda num savepoint
+desfeito em seguida, então ``bulk_update``/``bulk_delete`` sempre partem do mesmo
+estado. Os resultados (mínimo, mediana e média em segundos) vão para JSON no
+formato de ``compare``, que aponta regressões entre duas execuções.
+
+Uso (na pasta backend_expenses, com o Postgres do docker-compose.yml no ar):
+    docker compose up -d db
+    export DJANGO_SETTINGS_MODULE=backend_expenses.settings.local
+    python benchmarks/bench_suite.py run --sizes 1000,100000,1000000 --output atual.json
+    python benchmarks/bench_suite.py compare baseline.json atual.json --threshold 0.10
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_expenses.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from expenses.models import Expense, MonthlyIncome  # noqa: E402
+from expenses.serializers import ExpenseSerializer, ValuesRowFormatter  # noqa: E402
+from expenses.services import FinancialAnalysisService  # noqa: E402
+from expenses.tasks import export_expenses_csv, export_monthly_income_csv  # noqa: E402
+from expenses.views import ExpenseViewSet  # noqa: E402
+
+CATEGORIES = [choice for choice, _ in Expense.CATEGORY_CHOICES]
+DEFAULT_SIZES = "1000,100000,1000000"
+BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(user, rows):
+    month_start = timezone.localdate().replace(day=1)
+    for offset in range(0, rows, BATCH_SIZE):
+        batch = range(offset, min(offset + BATCH_SIZE, rows))
+        Expense.objects.bulk_create(
+            Expense(
+                user=user,
+                value=Decimal(i % 997) + Decimal("0.99"),
+                category=CATEGORIES[i % len(CATEGORIES)],
+                date=month_start + datetime.timedelta(days=i % 28),
+                description=f"Despesa {i}",
+            )
+            for i in batch
+        )
+        MonthlyIncome.objects.bulk_create(
+            MonthlyIncome(
+                user=user,
+                date=month_start + datetime.timedelta(days=i % 28),
+                amount=Decimal(1000 + i % 5000),
+                description=f"Renda {i}",
+                income_type="salario",
+            )
+            for i in batch
+        )
+
+
+def bulk_call(user, action, method, payload):
+    view = ExpenseViewSet.as_view({method: action})
+    request = getattr(APIRequestFactory(), method)(
+        f"/api/expenses/{action}/", payload, format="json"
+    )
+    force_authenticate(request, user=user)
+    response = view(request)
+    assert response.status_code == 200, (action, response.status_code)
+
+
+def cases(user):
+    service = FinancialAnalysisService(user)
+    formatter = ValuesRowFormatter.for_serializer(ExpenseSerializer)
+    expenses = Expense.objects.filter(user=user)
+    ids = list(expenses.values_list("id", flat=True))
+    return {
+        "financial_summary": service.get_financial_summary,
+        "generate_financial_alerts": service.generate_financial_alerts,
+        "export_expenses": lambda: export_expenses_csv(user.id),
+        "export_monthly_income": lambda: export_monthly_income_csv(user.id),
+        "list_serialization": lambda: formatter.format_many(
+            list(expenses.values_list(*formatter.columns))
+        ),
+        "bulk_update": lambda: bulk_call(
+            user, "bulk_update", "patch", {"ids": ids, "data": {"category": "lazer"}}
+        ),
+        "bulk_delete": lambda: bulk_call(user, "bulk_delete", "delete", {"ids": ids}),
+    }
+
+
+def measure(func, repeat):
+    """Tempos de ``repeat`` execuções, cada uma num savepoint desfeito em seguida."""
+    timings = []
+    for _ in range(repeat):
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+                raise Rollback
+        except Rollback:
+            pass
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+    }
+
+
+def run(args):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    selected = set(args.cases.split(",")) if args.cases else None
+    results = []
+    for rows in sizes:
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(username=f"bench-suite-{rows}")
+                start = time.perf_counter()
+                seed(user, rows)
+                print(f"{rows:,} linhas criadas em {time.perf_counter() - start:.1f}s")
+                for name, func in cases(user).items():
+                    if selected and name not in selected:
+                        continue
+                    timing = measure(func, args.repeat)
+                    results.append({"case": name, "rows": rows, **timing})
+                    print(
+                        f"  {name:<26}{timing['min'] * 1000:>12.1f} ms"
+                        f"{rows / timing['min']:>14,.0f} linhas/s"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    report = {
+        "created": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+
+
+def compare(args):
+    """Compara o mínimo de cada (caso, linhas); sai com código 1 se houver regressão."""
+    with open(args.baseline) as fp:
+        baseline = {(row["case"], row["rows"]): row for row in json.load(fp)["results"]}
+    with open(args.current) as fp:
+        current = json.load(fp)["results"]
+
+    regressions = 0
+    print(f"{'caso':<26}{'linhas':>10}{'antes (ms)':>12}{'atual (ms)':>12}{'variação':>10}")
+    for row in current:
+        before = baseline.get((row["case"], row["rows"]))
+        if before is None:
+            continue
+        change = row["min"] / before["min"] - 1
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = "  REGRESSÃO"
+        print(
+            f"{row['case']:<26}{row['rows']:>10,}{before['min'] * 1000:>12.1f}"
+            f"{row['min'] * 1000:>12.1f}{change:>+10.1%}{flag}"
+        )
+    if regressions:
+        print(f"{regressions} caso(s) acima do limite de {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="executa a suíte")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help="linhas por usuário")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--cases", help="subconjunto de casos, separados por vírgula")
+    run_parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="compara duas execuções")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="piora relativa tolerada (0.10 = 10%%)"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Custo do throttling por requisição: SimpleRateThrottle do DRF x janela deslizante em Lua.
+
+Mede ``allow_request`` de um AnonRateThrottle em três configurações: o throttle do
+DRF sobre o LocMem (por processo), o do DRF sobre o Redis (``get`` + ``set`` da
+lista de horários, que cresce com o limite) e o de ``backend_expenses.throttling``
+(um ``EVALSHA``). A lista começa com ``--history`` acessos registrados, como um
+usuário ativo perto do limite. Em seguida dispara ``--burst`` verificações em
+``--threads`` threads contra um limite de ``--burst-limit`` e conta quantas
+passaram: o get + set do DRF deixa passar mais do que o limite.
+
+Uso (na pasta backend_expenses, com o Redis do docker-compose no ar):
+    python benchmarks/bench_throttle.py --redis-url redis://localhost:6379/15 \\
+        --history 1000 --repeat 2000 --output throttle.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_expenses.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework import throttling  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+from django.core.cache.backends.redis import RedisCache  # noqa: E402
+
+from backend_expenses.throttling import AnonRateThrottle  # noqa: E402
+
+
+def throttle_class(base, cache, rate):
+    scope = f"bench-{uuid.uuid4().hex}"
+    return type("BenchThrottle", (base,), {"rate": rate, "scope": scope, "cache": cache})
+
+
+def make_request():
+    request = APIRequestFactory().get("/api/expenses/", REMOTE_ADDR="10.0.0.1")
+    request.user = AnonymousUser()
+    return request
+
+
+def check(klass, request):
+    return klass().allow_request(request, None)
+
+
+def measure(klass, history, repeat):
+    request = make_request()
+    for _ in range(history):
+        check(klass, request)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        check(klass, request)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+    }
+
+
+def burst(klass, checks, threads):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = executor.map(lambda _: check(klass, make_request()), range(checks))
+        return sum(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--history", type=int, default=1000, help="acessos já registrados")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=500)
+    parser.add_argument("--burst-limit", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    # Limite alto o bastante para nenhuma verificação da medição ser negada.
+    rate = f"{args.history + args.repeat + 1}/hour"
+    redis = RedisCache(args.redis_url, {})
+    variants = {
+        "drf-locmem": (throttling.AnonRateThrottle, LocMemCache("bench", {})),
+        "drf-redis": (throttling.AnonRateThrottle, redis),
+        "lua-redis": (AnonRateThrottle, redis),
+    }
+
+    results = {}
+    print(f"{'variante':<12}{'média µs':>10}{'p50 µs':>10}{'p99 µs':>10}{'passaram':>10}")
+    for name, (base, cache) in variants.items():
+        row = measure(throttle_class(base, cache, rate), args.history, args.repeat)
+        limited = throttle_class(base, cache, f"{args.burst_limit}/hour")
+        row["burst_allowed"] = burst(limited, args.burst, args.threads)
+        results[name] = row
+        print(
+            f"{name:<12}{row['mean_us']:>10.1f}{row['p50_us']:>10.1f}{row['p99_us']:>10.1f}"
+            f"{row['burst_allowed']:>6}/{args.burst_limit}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump({"args": vars(args), "results": results}, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Teste de carga com cenários baseados nas chamadas do frontend (frontend/src/services/api.js).
+
+Cada usuário virtual é uma thread com sua própria conexão keep-alive (como o
+navegador): faz login em ``/api/token/`` e repete cenários sorteados por peso
+(dashboard, paginação de despesas, criação/edição, rendas, bulk e exportação).
+A concorrência sobe em estágios (``--stages 5:30,10:30`` = 5 usuários por 30s,
+depois 10 por 30s) e, para cada estágio, o relatório traz vazão, latência
+p50/p95/p99 e taxa de erro por endpoint. Sem dependências além da stdlib.
+
+Uso (na pasta backend_expenses, com a stack local no ar via docker-compose.yml):
+    python benchmarks/loadtest.py --base-url http://localhost:8000 \\
+        --stages 1:30,5:30,10:60,20:60 --output carga.json
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+PASSWORD = "Carga@12345"
+CATEGORIES = ["alimentacao", "transporte", "lazer", "moradia", "saude", "servicos"]
+
+
+class RequestFailed(Exception):
+    def __init__(self, method, path, status):
+        super().__init__(f"{method} {path} -> {status}")
+        self.status = status
+
+
+class Recorder:
+    """Latências e erros por endpoint (``MÉTODO /rota/{id}/``), seguro entre threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, label, seconds, ok):
+        with self.lock:
+            self.samples[label].append(seconds)
+            if not ok:
+                self.errors[label] += 1
+
+
+class VirtualUser:
+    def __init__(self, base_url, username, recorder, think_time, rng):
+        parts = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.connection = connection_class(parts.netloc, timeout=60)
+        self.prefix = parts.path.rstrip("/")
+        self.username = username
+        self.recorder = recorder
+        self.think_time = think_time
+        self.rng = rng
+        self.token = None
+
+    def request(self, method, path, label=None, body=None, params=None):
+        url = f"{self.prefix}/api{path}"
+        if params:
+            url += "?" + urlencode(params)
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, url, payload, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            status, data = None, b""
+        elapsed = time.perf_counter() - start
+
+        ok = status is not None and status < 400
+        self.recorder.record(f"{method} {label or path}", elapsed, ok)
+        if not ok:
+            raise RequestFailed(method, path, status)
+        if data and response.getheader("Content-Type", "").startswith("application/json"):
+            return json.loads(data)
+        return None
+
+    def think(self):
+        if self.think_time:
+            time.sleep(self.rng.expovariate(1 / self.think_time))
+
+    # Cenários ---------------------------------------------------------------
+
+    def login(self):
+        self.token = None
+        tokens = self.request(
+            "POST", "/token/", body={"username": self.username, "password": PASSWORD}
+        )
+        self.token = tokens["access"]
+
+    def dashboard(self):
+        self.request("GET", "/dashboard/")
+        self.request("GET", "/financial-alerts/")
+
+    def browse_expenses(self):
+        # Como a tela de despesas: só avança de página se houver próxima.
+        for page in (1, 2):
+            params = {"page": page, "page_size": 10, "ordering": "-created"}
+            listing = self.request("GET", "/expenses/", params=params)
+            self.think()
+            if not listing.get("next"):
+                break
+        params = {"page": 1, "page_size": 10, "category": self.rng.choice(CATEGORIES)}
+        self.request("GET", "/expenses/", params=params)
+
+    def financial_summary(self):
+        self.request("GET", "/financial-summary/")
+        self.request("GET", "/expenses/report/monthly/")
+
+    def edit_expense(self):
+        expense = self.request("POST", "/expenses/", body=self._expense())
+        detail = f"/expenses/{expense['id']}/"
+        self.request("GET", detail, label="/expenses/{id}/")
+        self.think()
+        self.request("PUT", detail, label="/expenses/{id}/", body=self._expense())
+        self.request("DELETE", detail, label="/expenses/{id}/")
+
+    def incomes(self):
+        self.request("GET", "/monthly-income/", params={"page": 1, "page_size": 10})
+        income = self.request(
+            "POST",
+            "/monthly-income/",
+            body={"date": self._date(), "amount": "3500.00", "income_type": "salario"},
+        )
+        detail = f"/monthly-income/{income['id']}/"
+        self.request("PATCH", detail, label="/monthly-income/{id}/", body={"amount": "3600.00"})
+        self.request("DELETE", detail, label="/monthly-income/{id}/")
+
+    def bulk(self):
+        ids = [self.request("POST", "/expenses/", body=self._expense())["id"] for _ in range(5)]
+        self.request(
+            "PATCH",
+            "/expenses/bulk_update/",
+            body={"ids": ids, "data": {"category": self.rng.choice(CATEGORIES)}},
+        )
+        self.request("DELETE", "/expenses/bulk_delete/", body={"ids": ids})
+
+    def export(self):
+        self.request("GET", "/export-expense-csv/")
+
+    def _date(self):
+        return (datetime.date.today() - datetime.timedelta(days=self.rng.randrange(60))).isoformat()
+
+    def _expense(self):
+        return {
+            "value": f"{self.rng.uniform(5, 500):.2f}",
+            "category": self.rng.choice(CATEGORIES),
+            "date": self._date(),
+            "description": "Carga",
+        }
+
+
+# (cenário, peso): proporção aproximada do uso real do frontend.
+SCENARIOS = [
+    (VirtualUser.dashboard, 30),
+    (VirtualUser.browse_expenses, 25),
+    (VirtualUser.financial_summary, 10),
+    (VirtualUser.edit_expense, 15),
+    (VirtualUser.incomes, 10),
+    (VirtualUser.bulk, 6),
+    (VirtualUser.export, 2),
+    (VirtualUser.login, 2),
+]
+
+
+def ensure_users(base_url, count):
+    """Registra os usuários de carga que ainda não existem (400 = já existe)."""
+    recorder = Recorder()
+    client = VirtualUser(base_url, None, recorder, 0, random.Random())
+    for index in range(count):
+        try:
+            client.request(
+                "POST",
+                "/register/",
+                body={"username": f"carga-{index:04d}", "password": PASSWORD},
+            )
+        except RequestFailed:
+            pass
+
+
+def run_user(base_url, index, recorder, stop, think_time, seed, scenarios=SCENARIOS):
+    rng = random.Random(f"{seed}:{index}")
+    user = VirtualUser(base_url, f"carga-{index:04d}", recorder, think_time, rng)
+    scenarios, weights = zip(*scenarios)
+    while not stop.is_set():
+        try:
+            if user.token is None:
+                user.login()
+            rng.choices(scenarios, weights)[0](user)
+        except RequestFailed as exc:
+            if exc.status == 401:
+                # Access token expirado: refaz o login na próxima volta.
+                user.token = None
+            elif user.token is None:
+                time.sleep(1)
+        user.think()
+
+
+def percentile(ordered, fraction):
+    """Percentil pelo método nearest-rank sobre uma lista ordenada."""
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(recorder, concurrency, elapsed):
+    endpoints = {}
+    for label, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        errors = recorder.errors[label]
+        endpoints[label] = {
+            "requests": len(ordered),
+            "errors": errors,
+            "error_rate": errors / len(ordered),
+            "throughput": len(ordered) / elapsed,
+            "mean": sum(ordered) / len(ordered),
+            "p50": percentile(ordered, 0.50),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+        }
+    requests = sum(row["requests"] for row in endpoints.values())
+    errors = sum(row["errors"] for row in endpoints.values())
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests": requests,
+        "throughput": requests / elapsed,
+        "error_rate": errors / requests if requests else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def run_stage(base_url, concurrency, seconds, think_time, seed, scenarios=SCENARIOS):
+    recorder, stop = Recorder(), threading.Event()
+    threads = [
+        threading.Thread(
+            target=run_user,
+            args=(base_url, index, recorder, stop, think_time, seed, scenarios),
+            daemon=True,
+        )
+        for index in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return summarize(recorder, concurrency, time.perf_counter() - start)
+
+
+def print_stage(stage):
+    print(
+        f"\n{stage['concurrency']} usuários: {stage['throughput']:.1f} req/s, "
+        f"{stage['error_rate']:.1%} de erros"
+    )
+    print(
+        f"{'endpoint':<36}{'req':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'erros':>8}"
+    )
+    for label, row in stage["endpoints"].items():
+        print(
+            f"{label:<36}{row['requests']:>7}{row['throughput']:>8.1f}{row['p50'] * 1000:>9.0f}"
+            f"{row['p95'] * 1000:>9.0f}{row['p99'] * 1000:>9.0f}{row['error_rate']:>8.1%}"
+        )
+
+
+def parse_stages(value):
+    stages = []
+    for item in value.split(","):
+        concurrency, seconds = item.split(":")
+        stages.append((int(concurrency), float(seconds)))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--stages",
+        type=parse_stages,
+        default=parse_stages("1:30,5:30,10:30,20:30"),
+        help="estágios concorrência:segundos separados por vírgula",
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=0.5, help="pausa média entre ações, em segundos"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+
+    ensure_users(args.base_url, max(concurrency for concurrency, _ in args.stages))
+    stages = []
+    for concurrency, seconds in args.stages:
+        stage = run_stage(args.base_url, concurrency, seconds, args.think_time, args.seed)
+        print_stage(stage)
+        stages.append(stage)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {
+                    "base_url": args.base_url,
+                    "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    "think_time": args.think_time,
+                    "stages": stages,
+                },
+                fp,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
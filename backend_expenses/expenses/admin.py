@@ -1,6 +1,21 @@
+import json
+
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-from .models import Expense, ExpenseHistory, FinancialAlert, MonthlyIncome
+from .models import (
+    Expense,
+    ExpenseHistory,
+    FinancialAlert,
+    MonthlyIncome,
+    RequestProfile,
+    SlowQuery,
+    SyncTombstone,
+)
+from .profiling import load_stats, to_speedscope
 
 
 @admin.register(Expense)
@@ -37,3 +52,87 @@ class FinancialAlertAdmin(admin.ModelAdmin):
     date_hierarchy = "created"
     ordering = ("-created",)
     readonly_fields = ("created",)
+
+
+@admin.register(SyncTombstone)
+class SyncTombstoneAdmin(admin.ModelAdmin):
+    list_display = ("user", "kind", "object_id", "deleted")
+    list_filter = ("kind", "user")
+    readonly_fields = ("user", "kind", "object_id", "deleted")
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("created", "duration_ms", "context", "user", "database", "short_sql")
+    list_filter = ("context", "database")
+    search_fields = ("sql", "fingerprint", "context")
+    date_hierarchy = "created"
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.sql[:120]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created",
+        "method",
+        "route",
+        "user",
+        "status",
+        "duration_ms",
+        "peak_memory_kb",
+        "trigger",
+        "downloads",
+    )
+    list_filter = ("route", "trigger", "method")
+    search_fields = ("path", "route", "user__username")
+    date_hierarchy = "created"
+    exclude = ("stats",)
+    readonly_fields = [field.name for field in RequestProfile._meta.fields if field.name != "stats"]
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/<str:file_format>/",
+                self.admin_site.admin_view(self.download_view),
+                name="expenses_requestprofile_download",
+            ),
+            *super().get_urls(),
+        ]
+
+    @admin.display(description="Download")
+    def downloads(self, obj):
+        links = [
+            (reverse("admin:expenses_requestprofile_download", args=[obj.pk, fmt]), fmt)
+            for fmt in ("pstats", "speedscope")
+        ]
+        return format_html(
+            '<a href="{}">{}</a> | <a href="{}">{}</a>', *[item for link in links for item in link]
+        )
+
+    def download_view(self, request, pk, file_format):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            return HttpResponse(status=403)
+        if file_format == "pstats":
+            # Abra com pstats.Stats("<arquivo>") ou snakeviz.
+            content, content_type = bytes(profile.stats), "application/octet-stream"
+        elif file_format == "speedscope":
+            name = f"{profile.method} {profile.route}"
+            content = json.dumps(to_speedscope(load_stats(profile), name))
+            content_type = "application/json"
+        else:
+            return HttpResponse(status=404)
+        response = HttpResponse(content, content_type=content_type)
+        extension = "pstats" if file_format == "pstats" else "speedscope.json"
+        response["Content-Disposition"] = f'attachment; filename="profile-{pk}.{extension}"'
+        return response
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,235 @@
+"""
+Arquivo frio das despesas antigas em Parquet.
+
+Despesas anteriores ao horizonte (1º de janeiro de ``ARCHIVE_HORIZON_YEARS`` anos
+atrás) saem das tabelas (``manage.py archive_expenses``) e vão para um arquivo
+Parquet comprimido (zstd) por usuário e ano, em
+``ARCHIVE_ROOT/<user_id>/expenses-<ano>.parquet``. Os próprios arquivos são o
+índice do que está arquivado: não há tabela de controle.
+
+O relatório mensal (``monthly_report``) e os totais do resumo financeiro e do
+dashboard (``category_totals``) somam os arquivos ao que está nas tabelas, lendo
+só as colunas agregadas. Arquivadas, as despesas ficam só para leitura: não
+aparecem na listagem nem no delta sync, e voltam às tabelas, com os mesmos ids e
+datas, com ``manage.py restore_expenses``. Com mais de um servidor,
+``ARCHIVE_ROOT`` precisa ser um volume compartilhado.
+"""
+
+import datetime
+import os
+import re
+from collections import defaultdict
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend_expenses.sharding import shard_for
+
+from .models import Expense, ExpenseHistory
+
+SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("month", pa.date32()),
+        ("date", pa.date32()),
+        ("category", pa.string()),
+        ("value", pa.decimal128(10, 2)),
+        ("description", pa.string()),
+        ("created", pa.timestamp("us", tz="UTC")),
+        ("modified", pa.timestamp("us", tz="UTC")),
+    ]
+)
+FILE_PATTERN = re.compile(r"^expenses-(\d{4})\.parquet$")
+COMPRESSION = "zstd"
+
+
+def horizon(today=None):
+    """Primeiro dia mantido nas tabelas."""
+    today = today or timezone.localdate()
+    return datetime.date(today.year - settings.ARCHIVE_HORIZON_YEARS, 1, 1)
+
+
+def user_dir(user_id):
+    return os.path.join(settings.ARCHIVE_ROOT, str(user_id))
+
+
+def archive_path(user_id, year):
+    return os.path.join(user_dir(user_id), f"expenses-{year}.parquet")
+
+
+def archived_years(user_id):
+    try:
+        names = os.listdir(user_dir(user_id))
+    except FileNotFoundError:
+        return []
+    return sorted(int(match.group(1)) for match in map(FILE_PATTERN.match, names) if match)
+
+
+def archived_users():
+    try:
+        names = os.listdir(settings.ARCHIVE_ROOT)
+    except FileNotFoundError:
+        return []
+    return sorted(int(name) for name in names if name.isdigit() and archived_years(name))
+
+
+def is_archived(user_id, year):
+    return os.path.exists(archive_path(user_id, year))
+
+
+def _to_decimal(value):
+    return value if value is not None else Decimal("0.00")
+
+
+def category_totals(user_id, month):
+    """Gastos arquivados por categoria no mês (``{}`` se o ano não está arquivado)."""
+    if not is_archived(user_id, month.year):
+        return {}
+    table = pq.read_table(
+        archive_path(user_id, month.year),
+        columns=["category", "value"],
+        filters=[("month", "=", month.replace(day=1))],
+    )
+    grouped = table.group_by("category").aggregate([("value", "sum")])
+    return {row["category"]: _to_decimal(row["value_sum"]) for row in grouped.to_pylist()}
+
+
+def monthly_totals(user_id):
+    """Gastos arquivados por (mês, categoria), de todos os anos arquivados."""
+    totals = defaultdict(Decimal)
+    for year in archived_years(user_id):
+        table = pq.read_table(archive_path(user_id, year), columns=["month", "category", "value"])
+        grouped = table.group_by(["month", "category"]).aggregate([("value", "sum")])
+        for row in grouped.to_pylist():
+            totals[(row["month"], row["category"])] += _to_decimal(row["value_sum"])
+    return totals
+
+
+def monthly_report(user_id, total_geral, detalhes):
+    """
+    Soma os arquivos de ``user_id`` ao relatório mensal das tabelas.
+
+    ``detalhes`` são linhas ``{"month", "category", "total"}``; sem arquivos os
+    dois valores voltam como vieram.
+    """
+    if not archived_years(user_id):
+        return total_geral, detalhes
+    totals = monthly_totals(user_id)
+    total_geral = (total_geral or 0) + sum(totals.values(), Decimal("0.00"))
+    for row in detalhes:
+        totals[(row["month"], row["category"])] += row["total"] or Decimal("0.00")
+    rows = [
+        {"month": month, "category": category, "total": total}
+        for (month, category), total in totals.items()
+    ]
+    rows.sort(key=lambda row: row["category"])
+    rows.sort(key=lambda row: row["month"], reverse=True)
+    return total_geral, rows
+
+
+def _write(path, table):
+    # Grava ao lado e renomeia: um leitor nunca vê um arquivo pela metade.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.partial"
+    pq.write_table(table, partial, compression=COMPRESSION)
+    os.replace(partial, path)
+
+
+def _expense_table(expenses):
+    return pa.Table.from_pylist(
+        [
+            {
+                "id": expense.pk,
+                "month": expense.date.replace(day=1),
+                "date": expense.date,
+                "category": expense.category,
+                "value": expense.value,
+                "description": expense.description,
+                "created": expense.created,
+                "modified": expense.modified,
+            }
+            for expense in expenses
+        ],
+        schema=SCHEMA,
+    )
+
+
+def archive_user(user, before=None):
+    """Arquiva as despesas de ``user`` anteriores a ``before``; retorna ``{ano: linhas}``."""
+    before = before or horizon()
+    using = shard_for(user)
+    expenses = Expense.objects.using(using).filter(user_id=user.pk, date__lt=before)
+    archived = {}
+    for year in sorted(day.year for day in expenses.dates("date", "year")):
+        # Lê, grava e apaga na mesma transação, com as linhas travadas: uma edição
+        # concorrente espera o arquivamento em vez de ser apagada sem ir ao arquivo.
+        with transaction.atomic(using=using):
+            rows = list(expenses.filter(date__year=year).select_for_update().order_by("date", "id"))
+            if not rows:
+                continue
+            table = _expense_table(rows)
+            path = archive_path(user.pk, year)
+            if os.path.exists(path):
+                # Despesas lançadas depois com data antiga, ou uma execução interrompida
+                # antes do commit: o arquivo fica com a versão das tabelas.
+                existing = pq.read_table(path)
+                existing = existing.filter(pc.invert(pc.is_in(existing["id"], table["id"])))
+                table = pa.concat_tables([existing, table]).sort_by([("date", "ascending")])
+            _write(path, table)
+            ids = [expense.pk for expense in rows]
+            # Sem signals: arquivar não é excluir (nem histórico nem tombstone de sync).
+            history = ExpenseHistory.objects.using(using).filter(expense_id__in=ids)
+            history._raw_delete(using)
+            Expense.objects.using(using).filter(pk__in=ids)._raw_delete(using)
+        archived[year] = len(rows)
+    return archived
+
+
+def restore_user(user, years=None):
+    """Devolve às tabelas as despesas arquivadas de ``user`` (todos os anos por padrão)."""
+    using = shard_for(user)
+    restored = {}
+    for year in years or archived_years(user.pk):
+        path = archive_path(user.pk, year)
+        if not os.path.exists(path):
+            continue
+        rows = pq.read_table(path).to_pylist()
+        expenses = [
+            Expense(
+                pk=row["id"],
+                user_id=user.pk,
+                date=row["date"],
+                category=row["category"],
+                value=row["value"],
+                description=row["description"],
+                created=row["created"],
+                modified=row["modified"],
+            )
+            for row in rows
+        ]
+        for expense in expenses:
+            # ModificationDateTimeField (django-extensions) preserva ``modified``.
+            expense.update_modified = False
+        with transaction.atomic(using=using):
+            # Linhas já restauradas numa execução interrompida não são duplicadas.
+            present = set(
+                Expense.objects.using(using)
+                .filter(pk__in=[expense.pk for expense in expenses])
+                .values_list("pk", flat=True)
+            )
+            missing = [expense for expense in expenses if expense.pk not in present]
+            Expense.objects.using(using).bulk_create(missing, batch_size=1000)
+            # ``created`` é auto_now_add: o INSERT grava a hora atual.
+            created = {row["id"]: row["created"] for row in rows}
+            for expense in missing:
+                expense.created = created[expense.pk]
+            Expense.objects.using(using).bulk_update(missing, ["created"], batch_size=1000)
+            transaction.on_commit(lambda path=path: os.remove(path), using=using)
+        restored[year] = len(rows)
+    return restored
@@ -0,0 +1,141 @@
+"""
+Views assíncronas dos endpoints de leitura mais pesados, para rodar sob ASGI.
+
+São equivalentes às views síncronas (mesma rota, nome, permissões, throttling e
+validadores condicionais), mas as consultas usam o ORM assíncrono
+(``aaggregate``, ``async for``) e as independentes rodam em paralelo via
+``gather_concurrently``. ``expenses.urls`` as usa no lugar das síncronas quando
+``ASYNC_VIEWS`` está ligado.
+"""
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+from backend_expenses.replica import analytics_db
+
+from . import archive
+from .conditional import aconditional_get, alerts_state, expenses_state, incomes_state
+from .models import Expense, FinancialAlert
+from .serializers import FinancialAlertSerializer, FinancialSummarySerializer, ValuesRowFormatter
+from .services import FinancialAnalysisService, gather_concurrently
+from .views import MONTH_FORMAT_ERROR_MSG, SparseFieldsViewMixin, parse_target_month
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` com ``dispatch`` assíncrono.
+
+    Autenticação, permissões e throttling (``initial``) continuam síncronos e
+    rodam na thread da requisição; o handler pode ser ``async``.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # O csrf_exempt do APIView.as_view devolve uma função síncrona.
+        return markcoroutinefunction(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), handler)
+            response = handler(request, *args, **kwargs)
+            if not isinstance(response, Response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncFinancialSummaryView(AsyncAPIView):
+    """Versão assíncrona de ``FinancialSummaryView``."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "summary"
+
+    @aconditional_get(expenses_state, incomes_state, daily=True, replica=True)
+    async def get(self, request):
+        try:
+            target_month = parse_target_month(request.GET.get("month"))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": MONTH_FORMAT_ERROR_MSG},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        using = await sync_to_async(analytics_db)(request.user)
+        analysis_service = FinancialAnalysisService(request.user, target_month, using)
+        summary = await analysis_service.aget_financial_summary()
+
+        await analysis_service.asave_alerts_to_database(summary["alerts"])
+
+        serializer = FinancialSummarySerializer(summary)
+        return Response(serializer.data)
+
+
+class AsyncExpenseMonthlyReportView(AsyncAPIView):
+    """Versão assíncrona de ``ExpenseViewSet.report_monthly``."""
+
+    throttle_scope = "expenses"
+    permission_classes = [permissions.IsAuthenticated]
+
+    @aconditional_get(expenses_state, replica=True)
+    async def get(self, request):
+        using = await sync_to_async(analytics_db)(request.user)
+        qs = Expense.objects.for_user(request.user).using(using)
+
+        async def total_geral():
+            result = await qs.aaggregate(total=Sum("value"))
+            return result["total"] or 0
+
+        async def detalhes():
+            rows = (
+                qs.annotate(month=TruncMonth("date"))
+                .values("month", "category")
+                .annotate(total=Sum("value"))
+                .order_by("-month", "category")
+            )
+            return [row async for row in rows]
+
+        total, data = await gather_concurrently(total_geral, detalhes)
+        total, data = await sync_to_async(archive.monthly_report)(request.user.pk, total, data)
+        return Response({"total_geral": total, "detalhes": data})
+
+
+class AsyncFinancialAlertListView(SparseFieldsViewMixin, AsyncAPIView, generics.GenericAPIView):
+    """Versão assíncrona da listagem de ``FinancialAlertViewSet``."""
+
+    serializer_class = FinancialAlertSerializer
+    throttle_scope = "alerts"
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return FinancialAlert.objects.filter(user=self.request.user)
+
+    @aconditional_get(alerts_state)
+    async def get(self, request):
+        formatter = ValuesRowFormatter.for_serializer(
+            self.get_serializer_class(), self.get_requested_fields()
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        if formatter is None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        queryset = queryset.values_list(*formatter.columns)
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return self.get_paginated_response(formatter.format_many(page))
@@ -0,0 +1,137 @@
+"""
+GET condicional (ETag / Last-Modified) para os endpoints de leitura.
+
+Os validadores são derivados de uma "versão" barata dos dados do usuário
+(max(modified) + contagem de linhas), calculada com um único aggregate por
+tabela. Quando o cliente reenvia o ETag/Last-Modified e nada mudou, a view
+devolve 304 sem executar a consulta pesada nem o serializer.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from backend_expenses.replica import analytics_db
+
+from .models import Expense, FinancialAlert, MonthlyIncome
+
+
+def expenses_state(user, using=None):
+    """Versão das despesas visíveis para o usuário (inclui exclusões via contagem)."""
+    state = (
+        Expense.objects.for_user(user)
+        .using(using)
+        .aggregate(last=Max("modified"), count=Count("id"))
+    )
+    return state["last"], f"e{state['count']}"
+
+
+def incomes_state(user, using=None):
+    """Versão das rendas mensais do usuário."""
+    state = (
+        MonthlyIncome.objects.using(using)
+        .filter(user=user)
+        .aggregate(last=Max("modified"), count=Count("id"))
+    )
+    return state["last"], f"i{state['count']}"
+
+
+def alerts_state(user, using=None):
+    """Versão dos alertas do usuário.
+
+    FinancialAlert não tem ``modified``; a leitura (``is_read``) é detectada pela
+    contagem de alertas lidos, já que ``mark_all_as_read`` usa ``update()``.
+    """
+    state = (
+        FinancialAlert.objects.using(using)
+        .filter(user=user)
+        .aggregate(last=Max("created"), count=Count("id"), read=Count("id", filter=Q(is_read=True)))
+    )
+    return state["last"], f"a{state['count']}.{state['read']}"
+
+
+def _validators(request, sources, daily, replica):
+    # Validadores e corpo vêm do mesmo banco: um ETag do primário com dados de
+    # uma réplica atrasada deixaria o cliente com a versão velha em cache.
+    using = analytics_db(request.user) if replica else None
+    last_modified = None
+    parts = [str(request.user.pk), request.get_full_path()]
+    if daily:
+        # Endpoints cujo resultado padrão depende do mês corrente.
+        parts.append(timezone.localdate().isoformat())
+    for source in sources:
+        last, token = source(request.user, using)
+        parts.append(token)
+        if last is not None:
+            parts.append(last.isoformat())
+            last_modified = last if last_modified is None else max(last_modified, last)
+    etag = quote_etag(hashlib.md5("|".join(parts).encode("utf-8")).hexdigest())
+    return etag, last_modified
+
+
+def _set_validators(response, etag, last_modified):
+    response.headers.setdefault("ETag", etag)
+    if last_modified is not None:
+        response.headers.setdefault("Last-Modified", http_date(int(last_modified.timestamp())))
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def conditional_get(*sources, daily=False, replica=False):
+    """
+    Decora um handler GET de view/viewset com validadores condicionais.
+
+    ``sources`` são funções ``(user) -> (last_modified, token)`` como
+    ``expenses_state``. Respostas 200 e 304 recebem ``ETag``, ``Last-Modified``
+    (informativo) e ``Cache-Control: private, no-cache`` (o cliente sempre revalida).
+    Com ``replica=True`` as versões são lidas de ``analytics_db``, como o corpo.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified = _validators(request, sources, daily, replica)
+
+            # Só o ETag decide o 304: max(modified) não muda quando uma linha é
+            # excluída, então If-Modified-Since sozinho poderia servir dado obsoleto.
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _set_validators(response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
+
+
+def aconditional_get(*sources, daily=False, replica=False):
+    """
+    ``conditional_get`` para métodos ``async`` de view (``expenses.async_views``).
+
+    Decora o método diretamente: o ``method_decorator`` do Django 4.2 esconderia
+    que o handler é uma corrotina.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(view, request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(_validators)(request, sources, daily, replica)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await handler(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _set_validators(response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
@@ -3,6 +3,10 @@ import django_filters
 from .models import Expense, MonthlyIncome
 
 
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Aceita uma lista separada por vírgulas (?categories=lazer,saude)."""
+
+
 class MonthlyIncomeFilter(django_filters.FilterSet):
     date_start = django_filters.DateFilter(field_name="date", lookup_expr="gte")
     date_end = django_filters.DateFilter(field_name="date", lookup_expr="lte")
@@ -18,7 +22,35 @@ class MonthlyIncomeFilter(django_filters.FilterSet):
 class ExpenseFilter(django_filters.FilterSet):
     created_date = django_filters.DateFilter(field_name="created", lookup_expr="date")
     modified_date = django_filters.DateFilter(field_name="modified", lookup_expr="date")
+    date_start = django_filters.DateFilter(method="filter_date_start")
+    date_end = django_filters.DateFilter(method="filter_date_end")
+    value_min = django_filters.NumberFilter(method="filter_value_min")
+    value_max = django_filters.NumberFilter(method="filter_value_max")
+    categories = CharInFilter(field_name="category", lookup_expr="in")
 
     class Meta:
         model = Expense
-        fields = ["date", "category", "value", "created_date", "modified_date"]
+        fields = [
+            "date",
+            "category",
+            "value",
+            "created_date",
+            "modified_date",
+            "date_start",
+            "date_end",
+            "value_min",
+            "value_max",
+            "categories",
+        ]
+
+    def filter_date_start(self, queryset, name, value):
+        return queryset.by_period(start_date=value)
+
+    def filter_date_end(self, queryset, name, value):
+        return queryset.by_period(end_date=value)
+
+    def filter_value_min(self, queryset, name, value):
+        return queryset.with_min_value(value)
+
+    def filter_value_max(self, queryset, name, value):
+        return queryset.with_max_value(value)
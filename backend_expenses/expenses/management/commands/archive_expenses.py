@@ -0,0 +1,57 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from backend_expenses.sharding import shard_for
+from expenses.archive import archive_user, horizon
+from expenses.models import Expense
+
+
+class Command(BaseCommand):
+    help = (
+        "Move as despesas anteriores ao horizonte (ARCHIVE_HORIZON_YEARS) para arquivos "
+        "Parquet por usuário e ano em ARCHIVE_ROOT. Desfaça com restore_expenses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="arquiva as despesas anteriores a esta data (AAAA-MM-DD, padrão: o horizonte)",
+        )
+        parser.add_argument(
+            "--user", type=int, action="append", dest="users", help="id do usuário (repetível)"
+        )
+        parser.add_argument("--dry-run", action="store_true", help="só conta as despesas")
+
+    def handle(self, *args, **options):
+        before = options["before"] or horizon()
+        user_ids = options["users"]
+        if not user_ids:
+            user_ids = sorted(
+                {
+                    user_id
+                    for alias in settings.LEDGER_SHARDS
+                    for user_id in Expense.objects.using(alias)
+                    .filter(date__lt=before)
+                    .values_list("user_id", flat=True)
+                    .distinct()
+                }
+            )
+
+        total = 0
+        for user in get_user_model().objects.filter(pk__in=user_ids).order_by("pk"):
+            if options["dry_run"]:
+                expenses = Expense.objects.using(shard_for(user))
+                count = expenses.filter(user=user, date__lt=before).count()
+            else:
+                count = sum(archive_user(user, before).values())
+            total += count
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{user.pk}: {count} despesas")
+
+        verb = "seriam arquivadas" if options["dry_run"] else "arquivadas"
+        self.stdout.write(self.style.SUCCESS(f"{total} despesas anteriores a {before} {verb}."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from backend_expenses.schema import write_schema
+
+
+class Command(BaseCommand):
+    help = "Gera o schema OpenAPI da API e grava em OPENAPI_SCHEMA_FILE (rodar a cada deploy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="arquivo JSON de saída (padrão: OPENAPI_SCHEMA_FILE); o YAML fica ao lado",
+        )
+
+    def handle(self, *args, **options):
+        paths = write_schema(options["output"])
+        self.stdout.write(self.style.SUCCESS(f"Schema OpenAPI gravado em {', '.join(paths)}."))
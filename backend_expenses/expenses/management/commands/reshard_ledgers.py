@@ -0,0 +1,139 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from backend_expenses.sharding import shard_for
+from expenses.models import Expense, ExpenseHistory, FinancialAlert, MonthlyIncome, SyncTombstone
+
+# Ordem de cópia (pais antes dos filhos) e o filtro que seleciona as linhas do usuário.
+LEDGER_TABLES = [
+    (Expense, "user_id"),
+    (ExpenseHistory, "expense__user_id"),
+    (MonthlyIncome, "user_id"),
+    (FinancialAlert, "user_id"),
+    (SyncTombstone, "user_id"),
+]
+# Faixa de ids de cada shard (posição em --to): ids continuam únicos entre shards,
+# então os lançamentos podem ser movidos mantendo as chaves (usadas pelo delta sync).
+SHARD_ID_SPACE = 2**48
+
+
+def _aliases(value):
+    return [alias.strip() for alias in value.split(",") if alias.strip()]
+
+
+def _copy_rows(model, rows, target, batch_size):
+    """Insere ``rows`` em ``target`` mantendo ids e datas automáticas."""
+    auto_now_add = [
+        field for field in model._meta.concrete_fields if getattr(field, "auto_now_add", False)
+    ]
+    originals = [[getattr(row, field.attname) for field in auto_now_add] for row in rows]
+    for row in rows:
+        # ModificationDateTimeField (django-extensions) preserva ``modified``.
+        row.update_modified = False
+    model.objects.using(target).bulk_create(rows, batch_size=batch_size)
+    if auto_now_add:
+        for row, values in zip(rows, originals):
+            for field, value in zip(auto_now_add, values):
+                setattr(row, field.attname, value)
+        model.objects.using(target).bulk_update(
+            rows, [field.name for field in auto_now_add], batch_size=batch_size
+        )
+
+
+def _raw_delete(queryset):
+    # Sem signals: o histórico e os tombstones de exclusão não se aplicam a uma mudança de shard.
+    return queryset._raw_delete(queryset.db)
+
+
+def move_user(user, source, target, batch_size):
+    """Move os lançamentos de ``user`` de ``source`` para ``target``; retorna as contagens."""
+    User = type(user)
+    counts = Counter()
+    # O destino confirma antes da origem: uma falha no meio deixa os dados nos dois
+    # shards (e a próxima execução limpa o destino antes de copiar de novo).
+    with transaction.atomic(using=source), transaction.atomic(using=target):
+        if target != DEFAULT_DB_ALIAS:
+            fields = {
+                field.attname: getattr(user, field.attname) for field in User._meta.concrete_fields
+            }
+            User(**fields).save(using=target)
+        for model, lookup in reversed(LEDGER_TABLES):
+            _raw_delete(model.objects.using(target).filter(**{lookup: user.pk}))
+        for model, lookup in LEDGER_TABLES:
+            rows = list(model.objects.using(source).filter(**{lookup: user.pk}).order_by("pk"))
+            _copy_rows(model, rows, target, batch_size)
+            counts[model._meta.model_name] += len(rows)
+        for model, lookup in reversed(LEDGER_TABLES):
+            _raw_delete(model.objects.using(source).filter(**{lookup: user.pk}))
+        if source != DEFAULT_DB_ALIAS:
+            _raw_delete(User.objects.using(source).filter(pk=user.pk))
+    return counts
+
+
+def offset_sequences(shards):
+    """Garante (PostgreSQL) que cada shard gere ids na sua faixa de ``SHARD_ID_SPACE``."""
+    for index, alias in enumerate(shards):
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            raise CommandError(f"--offset-sequences requer PostgreSQL ({alias}).")
+        with connection.cursor() as cursor:
+            for model, _ in LEDGER_TABLES:
+                cursor.execute(
+                    "SELECT setval(seq, GREATEST((SELECT last_value FROM pg_sequences"
+                    " WHERE schemaname || '.' || sequencename = seq), %s))"
+                    " FROM pg_get_serial_sequence(%s, 'id') AS seq",
+                    [max(index * SHARD_ID_SPACE, 1), model._meta.db_table],
+                )
+
+
+class Command(BaseCommand):
+    help = (
+        "Move os lançamentos dos usuários cujo shard muda entre --from e --to "
+        "(padrão: LEDGER_SHARDS). Rode com a aplicação ainda na configuração antiga "
+        "e em manutenção, e só então publique o novo LEDGER_SHARDS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="source", required=True, help="shards atuais, em ordem")
+        parser.add_argument("--to", dest="target", help="novos shards (padrão: LEDGER_SHARDS)")
+        parser.add_argument(
+            "--offset-sequences",
+            action="store_true",
+            help="ajusta as sequences de cada shard de --to para faixas de ids disjuntas",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="só conta os usuários movidos")
+        parser.add_argument("--batch-size", type=int, default=1000, help="linhas por INSERT")
+
+    def handle(self, *args, **options):
+        source = _aliases(options["source"])
+        target = _aliases(options["target"]) if options["target"] else list(settings.LEDGER_SHARDS)
+        unknown = set(source + target) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f"Aliases fora de DATABASES: {', '.join(sorted(unknown))}")
+
+        if options["offset_sequences"] and not options["dry_run"]:
+            offset_sequences(target)
+
+        moves, rows = Counter(), Counter()
+        users = get_user_model().objects.using(DEFAULT_DB_ALIAS).order_by("pk")
+        for user in users.iterator():
+            old, new = shard_for(user, source), shard_for(user, target)
+            if old == new:
+                continue
+            moves[(old, new)] += 1
+            if not options["dry_run"]:
+                rows.update(move_user(user, old, new, options["batch_size"]))
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{user.pk}: {old} -> {new}")
+
+        for (old, new), count in sorted(moves.items()):
+            self.stdout.write(f"{old} -> {new}: {count} usuários")
+        verb = "seriam movidos" if options["dry_run"] else "movidos"
+        summary = ", ".join(f"{count} {name}" for name, count in sorted(rows.items()))
+        self.stdout.write(
+            self.style.SUCCESS(f"{sum(moves.values())} usuários {verb}. {summary}".strip())
+        )
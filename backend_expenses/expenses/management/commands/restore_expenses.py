@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from expenses.archive import archived_users, restore_user
+
+
+class Command(BaseCommand):
+    help = "Devolve às tabelas as despesas arquivadas por archive_expenses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="id do usuário (repetível; padrão: todos os arquivados)",
+        )
+        parser.add_argument(
+            "--year", type=int, action="append", dest="years", help="ano (repetível; padrão: todos)"
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["users"] or archived_users()
+        total = 0
+        for user in get_user_model().objects.filter(pk__in=user_ids).order_by("pk"):
+            count = sum(restore_user(user, options["years"]).values())
+            total += count
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{user.pk}: {count} despesas")
+        self.stdout.write(self.style.SUCCESS(f"{total} despesas restauradas."))
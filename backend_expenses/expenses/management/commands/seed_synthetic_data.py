@@ -0,0 +1,79 @@
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend_expenses.sharding import is_sharded
+from expenses.synthetic import DEFAULT_PREFIX, SyntheticLoader, generate_user, username
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera dados sintéticos determinísticos (usuários, despesas, rendas e histórico) "
+        "e os carrega via COPY do PostgreSQL. Rodar de novo com mais --users só "
+        "acrescenta os usuários que faltam."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="total de usuários desejado")
+        parser.add_argument(
+            "--expenses-per-user",
+            type=int,
+            default=1000,
+            help="média de despesas por usuário (cada um sorteia entre 50%% e 150%%)",
+        )
+        parser.add_argument("--months", type=int, default=24, help="meses de histórico")
+        parser.add_argument(
+            "--until",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="último dia gerado (AAAA-MM-DD, padrão: hoje); fixe para reproduzir a base",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default=DEFAULT_PREFIX, help="prefixo dos usernames")
+        parser.add_argument(
+            "--chunk-size", type=int, default=50000, help="despesas por COPY/transação"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("O carregamento via COPY requer PostgreSQL.")
+        if is_sharded():
+            raise CommandError(
+                "O carregamento via COPY grava só no banco default; desligue os shards."
+            )
+
+        prefix = options["prefix"]
+        until = options["until"] or datetime.date.today()
+        target = options["users"]
+        existing = get_user_model().objects.filter(username__startswith=prefix).count()
+        if existing >= target:
+            self.stdout.write(f"Já existem {existing} usuários com prefixo '{prefix}'.")
+            return
+        if get_user_model().objects.filter(username=username(prefix, existing)).exists():
+            raise CommandError(
+                f"Usuários com prefixo '{prefix}' não são contíguos; use outro --prefix."
+            )
+
+        start = time.monotonic()
+        loader = SyntheticLoader(prefix, options["chunk_size"])
+        for index in range(existing, target):
+            expenses, incomes = generate_user(
+                index, options["seed"], options["expenses_per_user"], options["months"], until
+            )
+            loader.add(index, expenses, incomes)
+            if options["verbosity"] > 1 and (index + 1) % 100 == 0:
+                self.stdout.write(f"{index + 1}/{target} usuários, {loader.counts}")
+        loader.flush()
+
+        elapsed = time.monotonic() - start
+        rows = sum(loader.counts.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{loader.counts['users']} usuários, {loader.counts['expenses']} despesas, "
+                f"{loader.counts['incomes']} rendas e {loader.counts['history']} históricos "
+                f"em {elapsed:.1f}s ({rows / elapsed * 60:,.0f} linhas/min)."
+            )
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("expenses", "0006_alter_monthlyincome_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["user", "-date", "-id"], name="expense_user_date_idx"),
+        ),
+    ]
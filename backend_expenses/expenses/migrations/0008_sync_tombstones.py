@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("expenses", "0007_expense_user_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("expense", "Expense"), ("monthly_income", "Monthly income")],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("deleted", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "ordering": ["deleted", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["user", "modified"], name="expense_user_modified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="monthlyincome",
+            index=models.Index(fields=["user", "modified"], name="income_user_modified_idx"),
+        ),
+        migrations.AddField(
+            model_name="synctombstone",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="sync_tombstones",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synctombstone",
+            index=models.Index(fields=["user", "deleted"], name="tombstone_user_deleted_idx"),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("expenses", "0008_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "context",
+                    models.CharField(
+                        help_text="View ou task que executou a consulta", max_length=255
+                    ),
+                ),
+                ("database", models.CharField(default="default", max_length=64)),
+                ("duration_ms", models.FloatField()),
+                ("fingerprint", models.CharField(db_index=True, max_length=32)),
+                ("sql", models.TextField(help_text="Consulta normalizada")),
+                ("params", models.TextField(blank=True)),
+                ("plan", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created", "-id"],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("expenses", "0009_slow_queries"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("route", models.CharField(max_length=255)),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.TextField()),
+                ("status", models.PositiveSmallIntegerField()),
+                (
+                    "trigger",
+                    models.CharField(
+                        choices=[("sample", "Amostragem"), ("header", "Cabeçalho de staff")],
+                        max_length=10,
+                    ),
+                ),
+                ("duration_ms", models.FloatField()),
+                ("peak_memory_kb", models.FloatField()),
+                ("top_allocations", models.TextField(blank=True)),
+                (
+                    "stats",
+                    models.BinaryField(
+                        help_text="Estatísticas do cProfile no formato de pstats.dump_stats"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created", "-id"],
+            },
+        ),
+    ]
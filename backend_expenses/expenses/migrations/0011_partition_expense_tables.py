@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from expenses.partitioning import PARTITIONED_TABLES, partition_table, unpartition_table
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for table in PARTITIONED_TABLES:
+            partition_table(schema_editor.connection, table)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for table in PARTITIONED_TABLES:
+            unpartition_table(schema_editor.connection, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("expenses", "0010_request_profiles"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="expensehistory",
+            name="expense",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="history",
+                to="expenses.expense",
+            ),
+        ),
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -4,12 +4,18 @@ from decimal import Decimal
 from django_extensions.db.models import TimeStampedModel
 
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models.signals import post_save, pre_delete
+from django.db import connections, models
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.forms.models import model_to_dict
 from django.utils import timezone
 
+from backend_expenses.authentication import invalidate_cached_user
+from backend_expenses.sharding import copy_user_to_shard, delete_user_from_shard
+
+from .partitioning import HISTORY_RETENTION_DAYS
+
 
 class ExpenseQuerySet(models.QuerySet):
     def for_user(self, user):
@@ -20,8 +26,13 @@ class ExpenseQuerySet(models.QuerySet):
     def by_category(self, category):
         return self.filter(category=category)
 
-    def by_period(self, start_date, end_date):
-        return self.filter(date__gte=start_date, date__lte=end_date)
+    def by_period(self, start_date=None, end_date=None):
+        qs = self
+        if start_date is not None:
+            qs = qs.filter(date__gte=start_date)
+        if end_date is not None:
+            qs = qs.filter(date__lte=end_date)
+        return qs
 
     def with_min_value(self, min_value):
         return self.filter(value__gte=min_value)
@@ -33,6 +44,27 @@ class ExpenseQuerySet(models.QuerySet):
         return self.filter(description__icontains=text)
 
 
+class MonthlyIncomeQuerySet(models.QuerySet):
+    def with_month_total(self):
+        """Anota ``month_total``: soma das rendas do mesmo usuário no mês de cada linha."""
+        month_total = (
+            MonthlyIncome.objects.filter(
+                user=models.OuterRef("user"),
+                date__year=ExtractYear(models.OuterRef("date")),
+                date__month=ExtractMonth(models.OuterRef("date")),
+            )
+            .order_by()
+            .values("user")
+            .annotate(total=models.Sum("amount"))
+            .values("total")
+        )
+        return self.annotate(
+            month_total=models.Subquery(
+                month_total, output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+
 class MonthlyIncome(TimeStampedModel, models.Model):
     """Modelo para armazenar a renda mensal do usuário."""
 
@@ -45,8 +77,13 @@ class MonthlyIncome(TimeStampedModel, models.Model):
     income_type = models.CharField(max_length=50, blank=True)
     is_recurring = models.BooleanField(default=False)
 
+    objects = MonthlyIncomeQuerySet.as_manager()
+
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["user", "modified"], name="income_user_modified_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.date.strftime('%d/%m/%Y')} - R$ {self.amount}"
@@ -109,6 +146,12 @@ class Expense(TimeStampedModel, models.Model):
         ordering = ["-date"]
         verbose_name = "Expense"
         verbose_name_plural = "Expenses"
+        indexes = [
+            # Casa com a ordenação padrão da listagem (-date, -id) para que consultas
+            # por janela de datas de um usuário virem range scans no índice.
+            models.Index(fields=["user", "-date", "-id"], name="expense_user_date_idx"),
+            models.Index(fields=["user", "modified"], name="expense_user_modified_idx"),
+        ]
 
 
 class ExpenseHistory(models.Model):
@@ -117,8 +160,10 @@ class ExpenseHistory(models.Model):
         ("updated", "Updated"),
         ("deleted", "Deleted"),
     ]
+    # Sem constraint no banco: ``expenses_expense`` é particionada (expenses.partitioning)
+    # e não tem um índice único só em ``id``; o CASCADE é feito pelo ORM.
     expense = models.ForeignKey(
-        "expenses.Expense", on_delete=models.CASCADE, related_name="history"
+        "expenses.Expense", on_delete=models.CASCADE, related_name="history", db_constraint=False
     )
     user = models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True, blank=True)
     action = models.CharField(max_length=10, choices=ACTION_CHOICES)
@@ -129,42 +174,148 @@ class ExpenseHistory(models.Model):
         return f"{self.expense} - {self.action} em {self.date:%Y-%m-%d %H:%M}"
 
 
+class SyncTombstone(models.Model):
+    """Registro de exclusão usado pela sincronização incremental (delta sync)."""
+
+    KIND_CHOICES = [
+        ("expense", "Expense"),
+        ("monthly_income", "Monthly income"),
+    ]
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="sync_tombstones"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["deleted", "id"]
+        indexes = [
+            models.Index(fields=["user", "deleted"], name="tombstone_user_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} excluído em {self.deleted:%Y-%m-%d %H:%M}"
+
+
+class SlowQuery(models.Model):
+    """Consulta SQL acima de ``SLOW_QUERY_THRESHOLD_MS`` (ver ``expenses.slow_queries``)."""
+
+    created = models.DateTimeField(default=timezone.now)
+    context = models.CharField(max_length=255, help_text="View ou task que executou a consulta")
+    user = models.ForeignKey(
+        get_user_model(), null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    database = models.CharField(max_length=64, default="default")
+    duration_ms = models.FloatField()
+    fingerprint = models.CharField(max_length=32, db_index=True)
+    sql = models.TextField(help_text="Consulta normalizada")
+    params = models.TextField(blank=True)
+    plan = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-created", "-id"]
+
+    def __str__(self):
+        return f"{self.context} {self.duration_ms:.0f}ms {self.sql[:60]}"
+
+
+class RequestProfile(models.Model):
+    """Perfil (cProfile + tracemalloc) de uma requisição (ver ``expenses.profiling``)."""
+
+    TRIGGER_CHOICES = [
+        ("sample", "Amostragem"),
+        ("header", "Cabeçalho de staff"),
+    ]
+
+    created = models.DateTimeField(default=timezone.now)
+    route = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    user = models.ForeignKey(
+        get_user_model(), null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    status = models.PositiveSmallIntegerField()
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    duration_ms = models.FloatField()
+    peak_memory_kb = models.FloatField()
+    top_allocations = models.TextField(blank=True)
+    stats = models.BinaryField(help_text="Estatísticas do cProfile no formato de pstats.dump_stats")
+
+    class Meta:
+        ordering = ["-created", "-id"]
+
+    def __str__(self):
+        return f"{self.method} {self.route} {self.duration_ms:.0f}ms"
+
+
 # Signals para histórico de alterações
 @receiver(post_save, sender=Expense)
 def expense_post_save(sender, instance, created, **kwargs):
     action = "created" if created else "updated"
-    user = getattr(instance, "user", None)
     data = model_to_dict(instance)
     for k, v in data.items():
         if isinstance(v, Decimal):
             data[k] = float(v)
         elif isinstance(v, (datetime.date, datetime.datetime)):
             data[k] = v.isoformat()
-    ExpenseHistory.objects.create(
+    # Histórico e tombstones ficam no mesmo shard do lançamento.
+    history = ExpenseHistory.objects.using(instance._state.db)
+    history.create(
         expense=instance,
-        user=user,
+        user_id=instance.user_id,
         action=action,
         data=data,
     )
-    six_months_ago = timezone.now() - timezone.timedelta(days=180)
-    qs = ExpenseHistory.objects.filter(expense=instance)
-    qs.filter(date__lt=six_months_ago).delete()
+    qs = history.filter(expense=instance)
+    # No PostgreSQL o histórico expirado sai por partição (maintain_partitions).
+    if connections[instance._state.db].vendor != "postgresql":
+        expired = timezone.now() - timezone.timedelta(days=HISTORY_RETENTION_DAYS)
+        qs.filter(date__lt=expired).delete()
     ids_to_keep = qs.order_by("-date").values_list("id", flat=True)[:100]
     qs.exclude(id__in=ids_to_keep).delete()
 
 
 @receiver(pre_delete, sender=Expense)
 def expense_pre_delete(sender, instance, **kwargs):
-    user = getattr(instance, "user", None)
     data = model_to_dict(instance)
     for k, v in data.items():
         if isinstance(v, Decimal):
             data[k] = float(v)
         elif isinstance(v, (datetime.date, datetime.datetime)):
             data[k] = v.isoformat()
-    ExpenseHistory.objects.create(
+    ExpenseHistory.objects.using(instance._state.db).create(
         expense=instance,
-        user=user,
+        user_id=instance.user_id,
         action="deleted",
         data=data,
     )
+
+
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=MonthlyIncome)
+def ledger_post_delete(sender, instance, origin=None, **kwargs):
+    # Exclusão em cascata do próprio usuário: não há para quem sincronizar.
+    if isinstance(origin, get_user_model()):
+        return
+    kind = "expense" if sender is Expense else "monthly_income"
+    SyncTombstone.objects.using(instance._state.db).create(
+        user_id=instance.user_id, kind=kind, object_id=instance.pk
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def user_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # O login só atualiza last_login, que a cópia no shard e o cache da
+    # autenticação não precisam acompanhar.
+    if raw or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    invalidate_cached_user(instance.pk)
+    copy_user_to_shard(instance)
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_post_delete(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+    delete_user_from_shard(instance)
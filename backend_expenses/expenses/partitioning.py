@@ -0,0 +1,218 @@
+"""
+Particionamento por intervalo (PostgreSQL) de ``Expense`` e ``ExpenseHistory``.
+
+``Expense`` é particionada por ano de ``date`` e ``ExpenseHistory`` por mês de
+``date``; cada tabela tem ainda uma partição ``<tabela>_default`` para as datas
+sem partição (ex.: despesas lançadas com datas muito antigas). As consultas de um
+mês (``date__year`` vira um BETWEEN na chave) leem uma partição só.
+
+A migração 0011 converte as tabelas existentes (``partition_table``) e a task
+``maintain_partitions`` cria as partições dos próximos períodos e descarta as
+partições de histórico mais antigas que ``HISTORY_RETENTION_DAYS``, no lugar do
+DELETE por despesa feito no signal. Fora do PostgreSQL nada disso se aplica.
+
+No banco, a chave primária passa a ser ``(id, date)`` (o Django continua usando
+``id``) e o histórico não tem mais FK para a despesa: a PK de uma tabela
+particionada precisa conter a chave de partição, e o CASCADE é feito pelo ORM.
+"""
+
+import datetime
+import re
+
+from django.utils import timezone
+
+# tabela: (coluna da chave, intervalo de cada partição)
+PARTITIONED_TABLES = {
+    "expenses_expense": ("date", "year"),
+    "expenses_expensehistory": ("date", "month"),
+}
+HISTORY_TABLE = "expenses_expensehistory"
+HISTORY_RETENTION_DAYS = 180
+# Partições criadas além da do período atual, e até quantos períodos para trás a
+# conversão cria partições (linhas mais antigas ficam na partição default).
+PERIODS_AHEAD = {"year": 1, "month": 3}
+PERIODS_BEHIND = {"year": 10, "month": 12}
+
+
+def period_start(day, interval):
+    if isinstance(day, datetime.datetime):
+        day = day.date()
+    return day.replace(month=1 if interval == "year" else day.month, day=1)
+
+
+def shift(start, interval, periods):
+    if interval == "year":
+        return start.replace(year=start.year + periods)
+    months = start.year * 12 + start.month - 1 + periods
+    return datetime.date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(table, start, interval):
+    return f"{table}_p{start:%Y}" if interval == "year" else f"{table}_p{start:%Y_%m}"
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def partitions(connection, table):
+    """Partições de período de ``table`` como ``{nome: início}`` (sem a default)."""
+    pattern = re.compile(rf"^{table}_p(\d{{4}})(?:_(\d{{2}}))?$")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass(%s)",
+            [table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    result = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            year, month = match.groups()
+            result[name] = datetime.date(int(year), int(month or 1), 1)
+    return result
+
+
+def create_partition(connection, table, start):
+    """Cria (se faltar) a partição de ``table`` que começa em ``start``; retorna o nome."""
+    column, interval = PARTITIONED_TABLES[table]
+    name = partition_name(table, start, interval)
+    if name in partitions(connection, table):
+        return None
+    end = shift(start, interval, 1)
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS)")
+        # Linhas do período que caíram na default antes de a partição existir:
+        # o ATTACH falharia com elas lá.
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(table + '_default')}"
+            f" WHERE {quote(column)} >= %s AND {quote(column)} < %s RETURNING *)"
+            f" INSERT INTO {quote(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        # Limites em UTC, o fuso da conexão do Django com USE_TZ.
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)}"
+            f" FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return name
+
+
+def ensure_partitions(connection, today=None):
+    """Cria as partições do período atual e dos ``PERIODS_AHEAD`` seguintes."""
+    today = today or timezone.now().date()
+    created = []
+    for table, (_, interval) in PARTITIONED_TABLES.items():
+        if not is_partitioned(connection, table):
+            continue
+        start = period_start(today, interval)
+        for periods in range(PERIODS_AHEAD[interval] + 1):
+            name = create_partition(connection, table, shift(start, interval, periods))
+            if name:
+                created.append(name)
+    return created
+
+
+def drop_expired_history(connection, today=None, detach_only=False):
+    """
+    Desanexa e apaga as partições de histórico inteiramente mais antigas que a retenção.
+
+    Com ``detach_only`` as partições ficam como tabelas avulsas (para arquivamento).
+    """
+    if not is_partitioned(connection, HISTORY_TABLE):
+        return []
+    today = today or timezone.now().date()
+    cutoff = today - datetime.timedelta(days=HISTORY_RETENTION_DAYS)
+    quote = connection.ops.quote_name
+    expired = [
+        name
+        for name, start in sorted(partitions(connection, HISTORY_TABLE).items())
+        if shift(start, "month", 1) <= cutoff
+    ]
+    with connection.cursor() as cursor:
+        for name in expired:
+            cursor.execute(f"ALTER TABLE {quote(HISTORY_TABLE)} DETACH PARTITION {quote(name)}")
+            if not detach_only:
+                cursor.execute(f"DROP TABLE {quote(name)}")
+    return expired
+
+
+def _index_definitions(cursor, table):
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema()"
+        " AND tablename = %s AND indexname NOT IN"
+        " (SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s))",
+        [table, table],
+    )
+    # Índices de tabela particionada aparecem como "ON ONLY tabela".
+    return [definition.replace(" ON ONLY ", " ON ") for (definition,) in cursor.fetchall()]
+
+
+def _foreign_keys(cursor, table):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+        " WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _rebuild(connection, table, partitioned):
+    """Recria ``table`` (particionada ou não) com as mesmas linhas, índices e FKs."""
+    column, interval = PARTITIONED_TABLES[table]
+    quote = connection.ops.quote_name
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_id_seq"
+    with connection.cursor() as cursor:
+        indexes = _index_definitions(cursor, table)
+        foreign_keys = _foreign_keys(cursor, table)
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        partition_by = f" PARTITION BY RANGE ({quote(column)})" if partitioned else ""
+        cursor.execute(f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)}){partition_by}")
+        if partitioned:
+            cursor.execute(
+                f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+            )
+            cursor.execute(f"SELECT MIN({quote(column)}) FROM {quote(legacy)}")
+            today = timezone.now().date()
+            current = period_start(today, interval)
+            oldest = cursor.fetchone()[0] or today
+            start = max(
+                period_start(oldest, interval), shift(current, interval, -PERIODS_BEHIND[interval])
+            )
+            while start <= shift(current, interval, PERIODS_AHEAD[interval]):
+                create_partition(connection, table, start)
+                start = shift(start, interval, 1)
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")
+        # Leva junto a sequence (ou identity) do id e, na volta, as partições.
+        cursor.execute(f"DROP TABLE {quote(legacy)} CASCADE")
+        cursor.execute(f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(table)}.id")
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE(MAX(id), 0) + 1, false) FROM {quote(table)}"
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"
+        )
+        primary_key = f"id, {quote(column)}" if partitioned else "id"
+        cursor.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY ({primary_key})")
+        for definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+
+
+def partition_table(connection, table):
+    """Converte ``table`` numa tabela particionada, criando as partições dos dados atuais."""
+    if not is_partitioned(connection, table):
+        _rebuild(connection, table, partitioned=True)
+
+
+def unpartition_table(connection, table):
+    """Volta ``table`` a uma tabela comum (reverso da migração)."""
+    if is_partitioned(connection, table):
+        _rebuild(connection, table, partitioned=False)
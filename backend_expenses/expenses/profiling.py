@@ -0,0 +1,137 @@
+"""
+Perfilamento de requisições sob demanda.
+
+``profile_request`` executa a view sob ``cProfile`` e ``tracemalloc`` e grava um
+``RequestProfile`` com rota, usuário, duração, pico de memória e as estatísticas
+do cProfile (formato de ``pstats.dump_stats``). ``to_speedscope`` converte essas
+estatísticas para o formato do https://www.speedscope.app.
+
+O cProfile perfila só a thread da requisição; o ``tracemalloc`` é global, então
+em servidores com threads o pico de memória inclui as requisições concorrentes.
+"""
+
+import cProfile
+import marshal
+import time
+import tracemalloc
+
+from django.conf import settings
+
+from .models import RequestProfile
+
+TOP_ALLOCATIONS = 10
+MAX_STACK_DEPTH = 64
+
+
+def profile_request(get_response, request, trigger, route_for):
+    """
+    Executa ``get_response(request)`` perfilado e grava o ``RequestProfile``.
+
+    ``route_for(request)`` dá o nome da rota, resolvido só depois da resposta.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        response = get_response(request)
+    finally:
+        profiler.disable()
+        duration = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        statistics = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        if started_tracing:
+            tracemalloc.stop()
+
+    profiler.create_stats()
+    user = getattr(request, "user", None)
+    RequestProfile.objects.create(
+        route=route_for(request)[:255],
+        method=request.method,
+        path=request.get_full_path(),
+        user=user if getattr(user, "is_authenticated", False) else None,
+        status=response.status_code,
+        trigger=trigger,
+        duration_ms=duration * 1000,
+        peak_memory_kb=peak / 1024,
+        top_allocations="\n".join(str(stat) for stat in statistics),
+        stats=marshal.dumps(profiler.stats),
+    )
+    _prune()
+    return response
+
+
+def _prune():
+    max_rows = settings.PROFILING_MAX_ROWS
+    offset = max_rows - 1
+    ids = RequestProfile.objects.order_by("-id").values_list("id", flat=True)
+    oldest_kept = next(iter(ids[offset:max_rows]), None)
+    if oldest_kept is not None:
+        RequestProfile.objects.filter(id__lt=oldest_kept).delete()
+
+
+def load_stats(profile):
+    """Dicionário de estatísticas do cProfile guardado em ``profile``."""
+    return marshal.loads(bytes(profile.stats))
+
+
+def to_speedscope(stats, name):
+    """
+    Converte estatísticas do cProfile em um perfil "sampled" do speedscope.
+
+    O cProfile guarda só o grafo de chamadas agregado, então cada aresta
+    (chamador -> função) vira uma amostra com o tempo próprio da função naquela
+    aresta, empilhada sobre o caminho de chamadores mais pesado.
+    """
+    frames, frame_index = [], {}
+
+    def frame(func):
+        if func not in frame_index:
+            filename, line, funcname = func
+            frame_index[func] = len(frames)
+            frames.append({"name": funcname, "file": filename, "line": line})
+        return frame_index[func]
+
+    paths = {}
+
+    def heaviest_path(func):
+        if func not in paths:
+            path, seen, current = [], set(), func
+            while current is not None and current not in seen and len(path) < MAX_STACK_DEPTH:
+                seen.add(current)
+                path.append(frame(current))
+                callers = stats.get(current, (0, 0, 0, 0, {}))[4]
+                current = max(callers, key=lambda caller: callers[caller][3], default=None)
+            paths[func] = path[::-1]
+        return paths[func]
+
+    samples, weights = [], []
+    for func, (_, _, tottime, _, callers) in stats.items():
+        edges = [(caller, edge[2]) for caller, edge in callers.items()] or [(None, tottime)]
+        for caller, self_time in edges:
+            if self_time <= 0:
+                continue
+            stack = heaviest_path(caller) if caller is not None else []
+            samples.append([*stack, frame(func)])
+            weights.append(self_time)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "despesa-certa",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
@@ -1,6 +1,12 @@
-from rest_framework import serializers
+from decimal import Decimal
+from functools import lru_cache
 
+from rest_framework import permissions, relations, serializers
+from rest_framework.settings import api_settings
+
+from django.conf import settings
 from django.db.models import Sum
+from django.utils import timezone
 
 from .models import Expense, FinancialAlert, MonthlyIncome
 from .schemas import (
@@ -9,11 +15,101 @@ from .schemas import (
     MonthlyIncomePartialSchema,
     MonthlyIncomeSchema,
 )
+from .validation import validate_many, validate_object
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _split_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_requested_fields(request, available):
+    """
+    Campos pedidos pelo cliente em ``?fields=a,b`` / ``?omit=c`` (só em leituras).
+
+    Retorna a tupla de nomes de ``available`` selecionados, na ordem original, ou
+    ``None`` quando não há seleção (todos os campos). Nomes desconhecidos são
+    ignorados; uma seleção sem nenhum campo válido equivale a não selecionar.
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    params = getattr(request, "query_params", request.GET)
+    fields = _split_names(params.get(FIELDS_PARAM, ""))
+    omit = _split_names(params.get(OMIT_PARAM, ""))
+    if not fields and not omit:
+        return None
+    selected = tuple(
+        name for name in available if (not fields or name in fields) and name not in omit
+    )
+    if not selected or len(selected) == len(available):
+        return None
+    return selected
+
+
+@lru_cache(maxsize=None)
+def serializer_field_names(serializer_class):
+    """Nomes dos campos de leitura do serializer, na ordem de saída."""
+    return tuple(field.field_name for field in serializer_class()._readable_fields)
+
+
+class SparseFieldsMixin:
+    """
+    Campos esparsos: em GET, ``?fields=`` / ``?omit=`` removem os campos não
+    pedidos do serializer raiz, então ``SerializerMethodField`` caros só rodam
+    quando solicitados. Serializers aninhados não são afetados.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+        selected = get_requested_fields(request, serializer_field_names(type(self)))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class SchemaListSerializer(serializers.ListSerializer):
+    """ListSerializer que roda a validação pydantic da lista inteira de uma vez."""
+
+    def to_internal_value(self, data):
+        validated = super().to_internal_value(data)
+        errors = validate_many(self.child.get_validation_schema(), validated)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class SchemaValidationMixin:
+    """
+    Validação de negócio delegada a ``expenses.validation``.
+
+    Depois da validação de campos do DRF, os dados já convertidos passam uma
+    única vez pelo schema pydantic (parcial em PATCH). Dentro de um
+    ``SchemaListSerializer`` a validação é feita em lote pela lista.
+    """
+
+    validation_schema = None
+    partial_validation_schema = None
+
+    def get_validation_schema(self):
+        return self.partial_validation_schema if self.partial else self.validation_schema
+
+    def validate(self, data):
+        if not isinstance(self.parent, SchemaListSerializer):
+            validate_object(self.get_validation_schema(), data)
+        return data
+
+
+class ExpenseSerializer(SparseFieldsMixin, SchemaValidationMixin, serializers.ModelSerializer):
     """Serializer para despesas."""
 
+    validation_schema = ExpenseSchema
+    partial_validation_schema = ExpensePartialSchema
+
     description = serializers.CharField(required=False, allow_blank=True)
 
     class Meta:
@@ -29,25 +125,22 @@ class ExpenseSerializer(serializers.ModelSerializer):
             "modified",
         ]
         read_only_fields = ["id", "user", "created", "modified"]
+        list_serializer_class = SchemaListSerializer
 
-    def validate(self, data):
-        input_data = {**getattr(self, "initial_data", {}), **data}
-        if self.partial:
-            schema = ExpensePartialSchema
-        else:
-            schema = ExpenseSchema
-        try:
-            schema(**input_data)
-        except Exception as e:
-            raise serializers.ValidationError({"validation": str(e)})
-        return data
 
-
-class MonthlyIncomeSerializer(serializers.ModelSerializer):
+class MonthlyIncomeSerializer(
+    SparseFieldsMixin, SchemaValidationMixin, serializers.ModelSerializer
+):
     """Serializer para renda mensal."""
 
+    validation_schema = MonthlyIncomeSchema
+    partial_validation_schema = MonthlyIncomePartialSchema
+
     total_month_income = serializers.SerializerMethodField()
 
+    # Colunas de values() equivalentes aos SerializerMethodField (ver ValuesRowFormatter).
+    values_sources = {"total_month_income": "month_total"}
+
     class Meta:
         model = MonthlyIncome
         fields = [
@@ -63,32 +156,24 @@ class MonthlyIncomeSerializer(serializers.ModelSerializer):
             "total_month_income",
         ]
         read_only_fields = ["id", "user", "created", "modified"]
-
-    def validate(self, data):
-        input_data = {**getattr(self, "initial_data", {}), **data}
-        if self.partial:
-            schema = MonthlyIncomePartialSchema
-        else:
-            schema = MonthlyIncomeSchema
-        try:
-            schema(**input_data)
-        except Exception as e:
-            raise serializers.ValidationError({"validation": str(e)})
-        return data
+        list_serializer_class = SchemaListSerializer
 
     def get_total_month_income(self, obj):
-        user = obj.user
+        # Anotado em lote por MonthlyIncomeQuerySet.with_month_total() quando disponível.
+        month_total = getattr(obj, "month_total", None)
+        if month_total is not None:
+            return month_total
         date = obj.date
         total = (
             MonthlyIncome.objects.filter(
-                user=user, date__year=date.year, date__month=date.month
+                user_id=obj.user_id, date__year=date.year, date__month=date.month
             ).aggregate(total=Sum("amount"))["total"]
             or 0
         )
         return total
 
 
-class FinancialAlertSerializer(serializers.ModelSerializer):
+class FinancialAlertSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer para alertas financeiros."""
 
     class Meta:
@@ -105,6 +190,123 @@ class FinancialAlertSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created"]
 
 
+class ValuesRowFormatter:
+    """
+    Formatador somente leitura de linhas de ``values_list()``.
+
+    Produz a mesma saída de ``serializer_class(instances, many=True).data`` sem
+    instanciar models nem passar campo a campo pelo serializer: o plano de
+    conversão (coluna, campo e conversor) é montado uma vez por serializer.
+    ``SerializerMethodField`` só é suportado quando o serializer mapeia o campo
+    para uma coluna anotada em ``values_sources``; do contrário ``for_serializer``
+    retorna ``None`` e a view usa o caminho normal. ``field_names`` restringe o
+    plano (e as colunas do SELECT) aos campos pedidos em ``?fields=``/``?omit=``.
+    """
+
+    IDENTITY_FIELDS = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.BooleanField,
+        serializers.ReadOnlyField,
+    )
+
+    def __init__(self, fields, columns):
+        self.fields = fields
+        self.columns = columns
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class, field_names=None):
+        serializer = serializer_class()
+        values_sources = getattr(serializer_class, "values_sources", {})
+        fields, columns = [], []
+        for field in serializer._readable_fields:
+            if field_names is not None and field.field_name not in field_names:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if field.field_name not in values_sources:
+                    return None
+                column = values_sources[field.field_name]
+            elif isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+                column = field.source.replace(".", "__")
+            elif isinstance(field, (serializers.Serializer, relations.RelatedField)):
+                return None
+            else:
+                column = field.source.replace(".", "__")
+            fields.append(field)
+            columns.append(column)
+        return cls(fields, columns)
+
+    def _converter(self, field, tz):
+        """Retorna o conversor de um campo (``None`` = valor já está no formato final)."""
+        if isinstance(field, (serializers.SerializerMethodField, relations.RelatedField)):
+            return None
+        if isinstance(field, serializers.ChoiceField):
+            if all(isinstance(key, str) for key in field.choices):
+                return None
+            return field.to_representation
+        if isinstance(field, self.IDENTITY_FIELDS):
+            return None
+        if isinstance(field, serializers.DateField):
+            if getattr(field, "format", api_settings.DATE_FORMAT).lower() == "iso-8601":
+                return _date_isoformat
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+            if (
+                tz is not None
+                and output_format
+                and output_format.lower() == "iso-8601"
+                and not hasattr(field, "timezone")
+            ):
+                return _datetime_isoformat(tz)
+        if isinstance(field, serializers.DecimalField):
+            coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            if coerce and not field.localize and field.decimal_places is not None:
+                return _decimal_string(field)
+        return field.to_representation
+
+    def format_many(self, rows):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        plan = [
+            (index, field.field_name, self._converter(field, tz))
+            for index, field in enumerate(self.fields)
+        ]
+        return [
+            {
+                name: (
+                    value if (value := row[index]) is None or convert is None else convert(value)
+                )
+                for index, name, convert in plan
+            }
+            for row in rows
+        ]
+
+
+def _date_isoformat(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _datetime_isoformat(tz):
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _decimal_string(field):
+    exponent = -field.decimal_places
+
+    def convert(value):
+        # Valores vindos do banco já têm a escala da coluna; os demais passam
+        # pela quantização do próprio campo.
+        if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+            return "{:f}".format(value)
+        return field.to_representation(value)
+
+    return convert
+
+
 class FinancialSummarySerializer(serializers.Serializer):
     """Serializer para o resumo financeiro."""
 
@@ -116,3 +318,21 @@ class FinancialSummarySerializer(serializers.Serializer):
     category_percentages = serializers.DictField()
     alerts = serializers.ListField()
     financial_health = serializers.CharField()
+
+
+class CategoryBreakdownSerializer(serializers.Serializer):
+    """Serializer para o total de gastos de uma categoria no mês."""
+
+    category = serializers.CharField()
+    label = serializers.CharField()
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
+    percentage = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class DashboardSerializer(serializers.Serializer):
+    """Serializer para os dados de carregamento do dashboard."""
+
+    summary = FinancialSummarySerializer()
+    recent_expenses = ExpenseSerializer(many=True)
+    unread_alerts = FinancialAlertSerializer(many=True)
+    category_breakdown = CategoryBreakdownSerializer(many=True)
@@ -1,54 +1,95 @@
+import asyncio
+import base64
+import contextvars
+import json
 from collections import defaultdict
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Sum
+from django.db import connection, connections
+from django.db.models import Q, Sum, Value
+from django.db.models.functions import Now
 from django.utils import timezone
 
-from .models import Expense, FinancialAlert, MonthlyIncome
+from backend_expenses.replica import analytics_db
+
+from . import archive
+from .models import Expense, FinancialAlert, MonthlyIncome, SyncTombstone
 
 User = get_user_model()
 
 
 class FinancialAnalysisService:
-    """Serviço para análise financeira e geração de alertas."""
+    """Serviço para análise financeira e geração de alertas.
 
-    def __init__(self, user: User, month: date = None):
+    As agregações leem de ``using`` (padrão: ``analytics_db``, a réplica de leitura
+    quando configurada); os alertas são gravados no primário.
+    """
+
+    def __init__(self, user: User, month: date = None, using: str = None):
         self.user = user
         self.month = month or timezone.now().date().replace(day=1)
+        self.using = using or analytics_db(user)
+
+    def _month_incomes(self):
+        return MonthlyIncome.objects.using(self.using).filter(
+            user=self.user, date__year=self.month.year, date__month=self.month.month
+        )
+
+    def _month_expenses(self):
+        return Expense.objects.using(self.using).filter(
+            user=self.user, date__year=self.month.year, date__month=self.month.month
+        )
+
+    def _category_totals(self):
+        return self._month_expenses().values("category").annotate(total=Sum("value"))
 
     def get_monthly_income(self) -> Decimal:
         """Obtém a soma das rendas mensais do usuário para o mês especificado."""
-        total = MonthlyIncome.objects.filter(
-            user=self.user, date__year=self.month.year, date__month=self.month.month
-        ).aggregate(total=Sum("amount"))["total"]
+        total = self._month_incomes().aggregate(total=Sum("amount"))["total"]
         return total or Decimal("0.00")
 
+    async def aget_monthly_income(self) -> Decimal:
+        """Versão assíncrona de ``get_monthly_income``."""
+        result = await self._month_incomes().aaggregate(total=Sum("amount"))
+        return result["total"] or Decimal("0.00")
+
+    def _with_archived(self, category_totals: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        """Soma os gastos do mês já arquivados em Parquet (``expenses.archive``)."""
+        for category, total in archive.category_totals(self.user.pk, self.month).items():
+            category_totals[category] = category_totals.get(category, Decimal("0.00")) + total
+        return category_totals
+
     def get_expenses_by_category(self) -> Dict[str, Decimal]:
         """Obtém gastos por categoria no mês especificado."""
-        expenses = (
-            Expense.objects.filter(
-                user=self.user, date__year=self.month.year, date__month=self.month.month
-            )
-            .values("category")
-            .annotate(total=Sum("value"))
-        )
-
         category_totals = defaultdict(Decimal)
-        for expense in expenses:
+        for expense in self._category_totals():
             category_totals[expense["category"]] = expense["total"] or Decimal("0.00")
 
-        return dict(category_totals)
+        return self._with_archived(dict(category_totals))
+
+    async def aget_expenses_by_category(self) -> Dict[str, Decimal]:
+        """Versão assíncrona de ``get_expenses_by_category``."""
+        category_totals = {
+            expense["category"]: expense["total"] or Decimal("0.00")
+            async for expense in self._category_totals()
+        }
+        if archive.is_archived(self.user.pk, self.month.year):
+            return await sync_to_async(self._with_archived)(category_totals)
+        return category_totals
 
     def get_total_expenses(self) -> Decimal:
         """Obtém o total de gastos no mês especificado."""
-        total = Expense.objects.filter(
-            user=self.user, date__year=self.month.year, date__month=self.month.month
-        ).aggregate(total=Sum("value"))["total"]
+        total = self._month_expenses().aggregate(total=Sum("value"))["total"]
+        archived = archive.category_totals(self.user.pk, self.month).values()
 
-        return total or Decimal("0.00")
+        return (total or Decimal("0.00")) + sum(archived, Decimal("0.00"))
 
     def calculate_balance(self) -> Decimal:
         """Calcula o saldo mensal (renda - gastos)."""
@@ -62,10 +103,19 @@ class FinancialAnalysisService:
             return Decimal("0.00")
         return (category_amount / income) * Decimal("100")
 
-    def generate_financial_alerts(self) -> List[Dict]:
-        """Gera alertas financeiros baseados nas regras de negócio."""
+    def generate_financial_alerts(
+        self,
+        income: Optional[Decimal] = None,
+        expenses_by_category: Optional[Dict[str, Decimal]] = None,
+    ) -> List[Dict]:
+        """Gera alertas financeiros baseados nas regras de negócio.
+
+        ``income`` e ``expenses_by_category`` podem ser passados quando já foram
+        consultados (ex.: pelo resumo), evitando repetir as mesmas consultas.
+        """
         alerts = []
-        income = self.get_monthly_income()
+        if income is None:
+            income = self.get_monthly_income()
 
         if income <= 0:
             alerts.append(
@@ -77,9 +127,10 @@ class FinancialAnalysisService:
             )
             return alerts
 
-        expenses_by_category = self.get_expenses_by_category()
-        total_expenses = self.get_total_expenses()
-        balance = self.calculate_balance()
+        if expenses_by_category is None:
+            expenses_by_category = self.get_expenses_by_category()
+        total_expenses = sum(expenses_by_category.values(), Decimal("0.00"))
+        balance = income - total_expenses
 
         # Moradia acima de 30%
         housing_amount = expenses_by_category.get("moradia", Decimal("0.00"))
@@ -241,26 +292,54 @@ class FinancialAnalysisService:
         """Salva os alertas no banco de dados. A ideia aqui é
         evitar duplicação de alertas para o mesmo mês.
         """
-        FinancialAlert.objects.filter(
+        self._month_alerts().delete()
+        FinancialAlert.objects.bulk_create(self._alert_objects(alerts))
+
+    async def asave_alerts_to_database(self, alerts: List[Dict]) -> None:
+        """Versão assíncrona de ``save_alerts_to_database``."""
+        await self._month_alerts().adelete()
+        await FinancialAlert.objects.abulk_create(self._alert_objects(alerts))
+
+    def _month_alerts(self):
+        return FinancialAlert.objects.filter(
             user=self.user, month__year=self.month.year, month__month=self.month.month
-        ).delete()
+        )
 
-        for alert_data in alerts:
-            FinancialAlert.objects.create(
+    def _alert_objects(self, alerts: List[Dict]) -> List[FinancialAlert]:
+        return [
+            FinancialAlert(
                 user=self.user,
                 alert_type=alert_data["type"],
                 title=alert_data["title"],
                 message=alert_data["message"],
                 month=self.month,
             )
+            for alert_data in alerts
+        ]
 
     def get_financial_summary(self) -> Dict:
         """Retorna um resumo financeiro completo."""
-        income = self.get_monthly_income()
-        expenses_by_category = self.get_expenses_by_category()
-        total_expenses = self.get_total_expenses()
-        balance = self.calculate_balance()
-        alerts = self.generate_financial_alerts()
+        return self.build_financial_summary(
+            self.get_monthly_income(), self.get_expenses_by_category()
+        )
+
+    async def aget_financial_summary(self) -> Dict:
+        """Versão assíncrona de ``get_financial_summary``; as duas consultas são independentes."""
+        income, expenses_by_category = await gather_concurrently(
+            self.aget_monthly_income, self.aget_expenses_by_category
+        )
+        return self.build_financial_summary(income, expenses_by_category)
+
+    def build_financial_summary(
+        self, income: Decimal, expenses_by_category: Dict[str, Decimal]
+    ) -> Dict:
+        """Monta o resumo a partir da renda e dos gastos por categoria já consultados.
+
+        Total, saldo e alertas são derivados desses dois resultados, sem novas consultas.
+        """
+        total_expenses = sum(expenses_by_category.values(), Decimal("0.00"))
+        balance = income - total_expenses
+        alerts = self.generate_financial_alerts(income, expenses_by_category)
 
         return {
             "month": self.month,
@@ -297,3 +376,219 @@ class FinancialAnalysisService:
             return "good"
         else:
             return "excellent"
+
+
+class DeltaSyncService:
+    """
+    Sincronização incremental para clientes offline.
+
+    Cada fluxo (despesas, rendas e exclusões) é percorrido em keyset por
+    ``(timestamp, id)``; o cursor opaco guarda a última posição consumida de
+    cada fluxo. Os fluxos são intercalados por timestamp e cortados em ``limit``
+    eventos, de modo que o próximo lote continua exatamente de onde parou.
+
+    Os timestamps vêm do relógio da aplicação antes do commit, fora da ordem de
+    commit: só são servidas linhas com timestamp anterior a ``now()`` do banco
+    menos ``SYNC_SAFETY_WINDOW`` segundos, para o cursor nunca passar de uma
+    escrita que ainda pode ser commitada. Transações mais longas que a janela
+    podem escapar do cursor.
+
+    Tombstones com mais de ``SYNC_TOMBSTONE_RETENTION_DAYS`` dias são apagados
+    (task ``prune_sync_tombstones``); cursores mais antigos que isso levantam
+    ``ResyncRequired``.
+    """
+
+    DEFAULT_LIMIT = 200
+    MAX_LIMIT = 1000
+
+    class InvalidCursor(ValueError):
+        pass
+
+    class ResyncRequired(Exception):
+        """O cursor é anterior à retenção dos tombstones: o cliente refaz a carga inicial."""
+
+    def __init__(self, user: User):
+        self.user = user
+
+    @classmethod
+    def encode_cursor(cls, positions: Dict[str, List]) -> str:
+        payload = json.dumps(positions, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    @classmethod
+    def decode_cursor(cls, cursor: str) -> Dict[str, Tuple[datetime, int]]:
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return {
+                key: (datetime.fromisoformat(ts), int(pk))
+                for key, (ts, pk) in raw.items()
+                if key in ("e", "i", "d")
+            }
+        except (ValueError, TypeError, AttributeError) as e:
+            raise cls.InvalidCursor("Cursor inválido") from e
+
+    def _streams(self):
+        return {
+            "e": (Expense.objects.filter(user=self.user), "modified"),
+            "i": (MonthlyIncome.objects.filter(user=self.user).with_month_total(), "modified"),
+            "d": (SyncTombstone.objects.filter(user=self.user), "deleted"),
+        }
+
+    @staticmethod
+    def _after(queryset, field, position):
+        if position is not None:
+            ts, pk = position
+            queryset = queryset.filter(Q(**{f"{field}__gt": ts}) | Q(**{field: ts, "id__gt": pk}))
+        window = settings.SYNC_SAFETY_WINDOW
+        if window > 0:
+            horizon = Now() - Value(timedelta(seconds=window))
+            queryset = queryset.filter(**{f"{field}__lt": horizon})
+        return queryset.order_by(field, "id")
+
+    def get_changes(self, cursor: str = None, limit: int = DEFAULT_LIMIT) -> Dict:
+        """Retorna até ``limit`` alterações posteriores ao cursor e o próximo cursor."""
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        if cursor:
+            positions = self.decode_cursor(cursor)
+            retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+            if "d" in positions and positions["d"][0] < timezone.now() - retention:
+                raise self.ResyncRequired("Cursor expirado: sincronize novamente sem cursor")
+        else:
+            # Sincronização inicial: as linhas atuais são enviadas, então exclusões
+            # anteriores à janela de segurança não interessam ao cliente.
+            since = timezone.now() - timedelta(seconds=settings.SYNC_SAFETY_WINDOW)
+            positions = {"d": (since, 0)}
+
+        events = []
+        for key, (queryset, field) in self._streams().items():
+            for row in self._after(queryset, field, positions.get(key))[: limit + 1]:
+                events.append((getattr(row, field), key, row.id, row))
+        events.sort(key=lambda event: event[:3])
+        batch, has_more = events[:limit], len(events) > limit
+
+        changes = {
+            "expenses": {"created": [], "updated": [], "deleted": []},
+            "monthly_income": {"created": [], "updated": [], "deleted": []},
+        }
+        new_positions = dict(positions)
+        for ts, key, pk, row in batch:
+            new_positions[key] = (ts, pk)
+            if key == "d":
+                group = "expenses" if row.kind == "expense" else "monthly_income"
+                changes[group]["deleted"].append(row.object_id)
+                continue
+            group = "expenses" if key == "e" else "monthly_income"
+            previous = positions.get(key)
+            created = previous is None or row.created > previous[0]
+            changes[group]["created" if created else "updated"].append(row)
+
+        return {
+            **changes,
+            "cursor": self.encode_cursor(
+                {key: [ts.isoformat(), pk] for key, (ts, pk) in new_positions.items()}
+            ),
+            "has_more": has_more,
+        }
+
+
+def run_concurrently(*funcs):
+    """
+    Executa consultas independentes em paralelo, cada uma em sua própria conexão.
+
+    Só vale a pena com conexões baratas (pooler/PgBouncer), por isso depende de
+    ``DASHBOARD_CONCURRENT_QUERIES``. Dentro de uma transação as outras conexões
+    não enxergariam dados ainda não commitados, então nesse caso roda em sequência.
+    """
+    if not settings.DASHBOARD_CONCURRENT_QUERIES or connection.in_atomic_block:
+        return [func() for func in funcs]
+
+    def call(func):
+        try:
+            return func()
+        finally:
+            # Conexões são por thread; fecha as abertas por esta thread do pool.
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(funcs)) as executor:
+        # Cada thread roda numa cópia do contexto (usuário ativo do sharding).
+        futures = [executor.submit(contextvars.copy_context().run, call, func) for func in funcs]
+        return [future.result() for future in futures]
+
+
+async def gather_concurrently(*funcs):
+    """
+    Versão assíncrona de ``run_concurrently`` para funções ``async`` do ORM.
+
+    O ORM assíncrono (``aaggregate``, ``async for``) executa as consultas de uma
+    requisição na mesma thread e conexão, então ``asyncio.gather`` sozinho apenas
+    as enfileira. Com ``DASHBOARD_CONCURRENT_QUERIES`` cada função roda numa
+    thread (e conexão) própria; dentro de uma transação, na conexão da requisição.
+    """
+    in_atomic_block = await sync_to_async(lambda: connection.in_atomic_block)()
+    if not settings.DASHBOARD_CONCURRENT_QUERIES or in_atomic_block:
+        return await asyncio.gather(*(func() for func in funcs))
+
+    def call(func):
+        try:
+            # As consultas thread-sensitive da corrotina rodam nesta thread.
+            return async_to_sync(func)()
+        finally:
+            connections.close_all()
+
+    return await asyncio.gather(
+        *(sync_to_async(call, thread_sensitive=False)(func) for func in funcs)
+    )
+
+
+class DashboardService:
+    """Monta os dados de carregamento do dashboard em uma única chamada."""
+
+    RECENT_EXPENSES_LIMIT = 5
+    UNREAD_ALERTS_LIMIT = 10
+
+    def __init__(self, user: User, month: date = None):
+        self.user = user
+        self.analysis = FinancialAnalysisService(user, month)
+
+    def get_recent_expenses(self) -> List[Expense]:
+        return list(
+            Expense.objects.filter(user=self.user).order_by("-created")[
+                : self.RECENT_EXPENSES_LIMIT
+            ]
+        )
+
+    def get_unread_alerts(self) -> List[FinancialAlert]:
+        return list(
+            FinancialAlert.objects.filter(user=self.user, is_read=False)[: self.UNREAD_ALERTS_LIMIT]
+        )
+
+    def get_dashboard(self) -> Dict:
+        """Resumo do mês, despesas recentes, alertas não lidos e gastos por categoria."""
+        income, expenses_by_category, recent_expenses = run_concurrently(
+            self.analysis.get_monthly_income,
+            self.analysis.get_expenses_by_category,
+            self.get_recent_expenses,
+        )
+        summary = self.analysis.build_financial_summary(income, expenses_by_category)
+        # Mesmo comportamento do endpoint de resumo: alertas do mês são regravados.
+        self.analysis.save_alerts_to_database(summary["alerts"])
+
+        labels = dict(Expense.CATEGORY_CHOICES)
+        category_breakdown = [
+            {
+                "category": category,
+                "label": labels.get(category, category),
+                "total": total,
+                "percentage": summary["category_percentages"].get(category, Decimal("0.00")),
+            }
+            for category, total in sorted(
+                expenses_by_category.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+
+        return {
+            "summary": summary,
+            "recent_expenses": recent_expenses,
+            "unread_alerts": self.get_unread_alerts(),
+            "category_breakdown": category_breakdown,
+        }
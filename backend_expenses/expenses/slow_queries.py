@@ -0,0 +1,114 @@
+"""
+Registro de consultas lentas com EXPLAIN amostrado.
+
+O ``QueryStats`` de ``backend_expenses.metrics`` separa as consultas acima de
+``SLOW_QUERY_THRESHOLD_MS`` durante a requisição/task (só SQL, parâmetros e
+duração). ``record_slow_queries`` grava cada uma em ``SlowQuery`` com o contexto
+(view ou task): as das requisições vão para a task ``store_slow_queries`` no
+Celery, fora do caminho da resposta, e as das tasks são gravadas no próprio
+worker. Um ``EXPLAIN`` (``ANALYZE, BUFFERS`` no PostgreSQL) é executado no máximo
+uma vez por ``SLOW_QUERY_EXPLAIN_INTERVAL`` segundos para cada consulta
+normalizada, e só para SELECTs. A tabela funciona como um buffer circular de
+``SLOW_QUERY_MAX_ROWS`` linhas.
+"""
+
+import hashlib
+import logging
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+WHITESPACE = re.compile(r"\s+")
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+PARAMS_MAX_LENGTH = 1000
+
+
+def normalize_sql(sql):
+    """Forma canônica da consulta: listas IN colapsadas, números e espaços normalizados."""
+    sql = PLACEHOLDER_LIST.sub("(%s, ...)", sql)
+    sql = NUMBER.sub("?", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize_sql(sql).encode("utf-8")).hexdigest()
+
+
+def _explainable(sql, many):
+    statement = sql.lstrip().upper()
+    return not many and statement.startswith("SELECT") and " FOR UPDATE" not in statement
+
+
+def explain(alias, sql, params):
+    """Plano de execução de um SELECT (texto vazio se o banco não for suportado)."""
+    connection = connections[alias]
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None:
+        return ""
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        rows = cursor.fetchall()
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def _needs_explain(digest):
+    since = timezone.now() - timedelta(seconds=settings.SLOW_QUERY_EXPLAIN_INTERVAL)
+    return not (
+        SlowQuery.objects.filter(fingerprint=digest, created__gte=since).exclude(plan="").exists()
+    )
+
+
+def _prune():
+    max_rows = settings.SLOW_QUERY_MAX_ROWS
+    offset = max_rows - 1
+    ids = SlowQuery.objects.order_by("-id").values_list("id", flat=True)
+    oldest_kept = next(iter(ids[offset:max_rows]), None)
+    if oldest_kept is not None:
+        SlowQuery.objects.filter(id__lt=oldest_kept).delete()
+
+
+def record_slow_queries(captured, context, user_id=None):
+    """
+    Grava as consultas lentas de uma requisição/task.
+
+    ``captured`` é a lista ``QueryStats.slow`` de ``(alias, sql, params, many,
+    duração em segundos)``. Falhas de banco são apenas logadas.
+    """
+    if not captured:
+        return
+
+    try:
+        for alias, sql, params, many, duration in captured:
+            digest = fingerprint(sql)
+            plan = ""
+            if _explainable(sql, many) and _needs_explain(digest):
+                try:
+                    plan = explain(alias, sql, params)
+                except DatabaseError as exc:
+                    plan = f"EXPLAIN falhou: {exc}"
+            SlowQuery.objects.create(
+                context=context[:255],
+                user_id=user_id,
+                database=alias,
+                duration_ms=duration * 1000,
+                fingerprint=digest,
+                sql=normalize_sql(sql),
+                params=repr(params)[:PARAMS_MAX_LENGTH],
+                plan=plan,
+            )
+        _prune()
+    except DatabaseError:
+        logger.warning("Falha ao registrar consultas lentas de %s", context, exc_info=True)
@@ -0,0 +1,250 @@
+"""
+Geração determinística de dados sintéticos em volume de produção.
+
+Cada usuário sintético ``i`` tem seu próprio ``random.Random(f"{seed}:{i}")``,
+então o mesmo usuário gera sempre as mesmas linhas, independentemente de quantos
+outros já existirem: aumentar ``--users`` numa base existente só acrescenta os
+usuários novos. As distribuições de categoria e valor seguem
+``Expense.CATEGORY_CHOICES``; cada usuário tem um salário recorrente por mês e
+rendas extras eventuais.
+
+As linhas são carregadas com ``COPY ... FROM STDIN`` do PostgreSQL em blocos de
+``chunk_size`` despesas (ou ``USER_BATCH_SIZE`` usuários). Cada bloco cria seus
+usuários e grava as linhas deles na mesma transação: uma carga interrompida não
+deixa usuários sem dados, e a próxima execução retoma a partir da contagem de
+usuários. Como o ``COPY``
+não dispara signals, o histórico (``ExpenseHistory``) é gerado aqui, com os ids
+das despesas reservados na sequence antes de cada bloco.
+"""
+
+import csv
+import datetime
+import io
+import json
+import math
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from .models import Expense, ExpenseHistory, MonthlyIncome
+
+DEFAULT_PREFIX = "synthetic-"
+USER_BATCH_SIZE = 1000
+HISTORY_UPDATE_RATE = 0.1
+UTC = datetime.timezone.utc
+
+# categoria: (peso na frequência, mediana do valor em R$, dispersão log-normal, descrições)
+CATEGORY_PROFILES = {
+    "moradia": (4, 1200, 0.35, ["Aluguel", "Condomínio", "IPTU", "Conta de luz"]),
+    "alimentacao": (30, 45, 0.8, ["Supermercado", "Padaria", "Restaurante", "Delivery"]),
+    "transporte": (18, 25, 0.7, ["Combustível", "Aplicativo", "Ônibus", "Estacionamento"]),
+    "saude": (6, 120, 0.9, ["Farmácia", "Consulta", "Plano de saúde", "Exames"]),
+    "educacao": (3, 450, 0.5, ["Mensalidade", "Curso online", "Livros"]),
+    "lazer": (12, 80, 0.9, ["Cinema", "Bar", "Viagem", "Streaming"]),
+    "vestuario": (6, 150, 0.7, ["Roupas", "Calçados", "Acessórios"]),
+    "servicos": (9, 90, 0.6, ["Internet", "Celular", "Academia", "Assinatura"]),
+    "dividas": (3, 600, 0.6, ["Cartão de crédito", "Empréstimo", "Financiamento"]),
+    "investimentos": (3, 500, 0.8, ["Tesouro Direto", "CDB", "Previdência"]),
+    "outros": (6, 60, 1.0, ["Presente", "Doação", "Diversos"]),
+}
+CATEGORIES = [category for category, _ in Expense.CATEGORY_CHOICES]
+CATEGORY_WEIGHTS = [CATEGORY_PROFILES[category][0] for category in CATEGORIES]
+
+SALARY_MEDIAN = 4500
+EXTRA_INCOME_RATE = 0.3
+EXTRA_INCOME_TYPES = [("freelance", "Freelance"), ("outros", "Venda de itens")]
+
+EXPENSE_COLUMNS = [
+    "id",
+    "created",
+    "modified",
+    "user_id",
+    "value",
+    "category",
+    "date",
+    "description",
+]
+INCOME_COLUMNS = [
+    "created",
+    "modified",
+    "user_id",
+    "date",
+    "amount",
+    "description",
+    "income_type",
+    "is_recurring",
+]
+HISTORY_COLUMNS = ["expense_id", "user_id", "action", "date", "data"]
+
+
+def username(prefix, index):
+    return f"{prefix}{index:07d}"
+
+
+def _months(until, count):
+    """Primeiro dia de cada um dos ``count`` meses terminando no mês de ``until``."""
+    for back in range(count - 1, -1, -1):
+        year, month = divmod(until.year * 12 + until.month - 1 - back, 12)
+        yield datetime.date(year, month + 1, 1)
+
+
+def _money(value):
+    return Decimal(f"{value:.2f}")
+
+
+def _timestamp(rng, day):
+    return datetime.datetime.combine(day, datetime.time(), UTC) + datetime.timedelta(
+        seconds=rng.randrange(8 * 3600, 23 * 3600)
+    )
+
+
+def generate_user(index, seed, expenses_per_user, months, until):
+    """
+    Linhas de um usuário sintético: ``(despesas, rendas)``.
+
+    Despesas são ``(created, value, category, date, description, edited)``, onde
+    ``edited`` é o momento da única edição (ou ``None``), e rendas são
+    ``(created, date, amount, description, income_type, is_recurring)``.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    month_starts = list(_months(until, months))
+    first_day = month_starts[0]
+    span = (until - first_day).days + 1
+
+    count = rng.randint(expenses_per_user // 2, expenses_per_user * 3 // 2)
+    categories = rng.choices(CATEGORIES, weights=CATEGORY_WEIGHTS, k=count)
+    expenses = []
+    for category in categories:
+        _, median, sigma, descriptions = CATEGORY_PROFILES[category]
+        day = first_day + datetime.timedelta(days=rng.randrange(span))
+        value = _money(max(1.0, rng.lognormvariate(math.log(median), sigma)))
+        created = _timestamp(rng, day)
+        edited = None
+        if rng.random() < HISTORY_UPDATE_RATE:
+            edited = created + datetime.timedelta(hours=rng.randrange(1, 72))
+        expenses.append((created, value, category, day, rng.choice(descriptions), edited))
+    expenses.sort(key=lambda row: row[0])
+
+    salary = rng.lognormvariate(math.log(SALARY_MEDIAN), 0.5)
+    incomes = []
+    for month_start in month_starts:
+        payday = month_start.replace(day=5)
+        if payday > until:
+            break
+        incomes.append(
+            (_timestamp(rng, payday), payday, _money(salary), "Salário", "salario", True)
+        )
+        if rng.random() < EXTRA_INCOME_RATE:
+            income_type, description = rng.choice(EXTRA_INCOME_TYPES)
+            day = month_start + datetime.timedelta(days=rng.randrange(28))
+            if day <= until:
+                amount = _money(rng.lognormvariate(math.log(SALARY_MEDIAN / 4), 0.7))
+                incomes.append((_timestamp(rng, day), day, amount, description, income_type, False))
+    return expenses, incomes
+
+
+def _copy(cursor, model, columns, rows):
+    """Carrega ``rows`` (tuplas na ordem de ``columns``) na tabela de ``model`` via COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    quoted = ", ".join(connection.ops.quote_name(column) for column in columns)
+    table = connection.ops.quote_name(model._meta.db_table)
+    cursor.copy_expert(f"COPY {table} ({quoted}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _reserve_ids(cursor, model, count):
+    """Reserva ``count`` ids consecutivos na sequence da tabela; retorna o primeiro."""
+    table = model._meta.db_table
+    # Impede inserts concorrentes entre o nextval e o setval.
+    cursor.execute(f"LOCK TABLE {connection.ops.quote_name(table)} IN SHARE ROW EXCLUSIVE MODE")
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence = cursor.fetchone()[0]
+    cursor.execute("SELECT nextval(%s)", [sequence])
+    first = cursor.fetchone()[0]
+    cursor.execute("SELECT setval(%s, %s)", [sequence, first + count - 1])
+    return first
+
+
+class SyntheticLoader:
+    """Acumula linhas de vários usuários e as grava, com os usuários, em blocos via COPY."""
+
+    def __init__(self, prefix, chunk_size):
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.users, self.expenses, self.incomes = [], [], []
+        self.counts = {"users": 0, "expenses": 0, "incomes": 0, "history": 0}
+
+    def add(self, index, expenses, incomes):
+        """Enfileira o usuário sintético ``index``; as linhas referenciam sua posição no bloco."""
+        position = len(self.users)
+        self.users.append(index)
+        self.expenses.extend((position, *row) for row in expenses)
+        self.incomes.extend((position, *row) for row in incomes)
+        if len(self.expenses) >= self.chunk_size or len(self.users) >= USER_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.users:
+            return
+        with transaction.atomic(), connection.cursor() as cursor:
+            user_ids = create_users(self.prefix, self.users)
+            self.counts["users"] += len(user_ids)
+            if self.expenses:
+                first_id = _reserve_ids(cursor, Expense, len(self.expenses))
+                expense_rows, history_rows = [], []
+                for pk, (position, created, *fields, edited) in enumerate(
+                    self.expenses, start=first_id
+                ):
+                    user_id = user_ids[position]
+                    expense_rows.append((pk, created, edited or created, user_id, *fields))
+                    history_rows.extend(self._history(pk, user_id, created, edited, *fields))
+                _copy(cursor, Expense, EXPENSE_COLUMNS, expense_rows)
+                _copy(cursor, ExpenseHistory, HISTORY_COLUMNS, history_rows)
+                self.counts["expenses"] += len(expense_rows)
+                self.counts["history"] += len(history_rows)
+            if self.incomes:
+                _copy(
+                    cursor,
+                    MonthlyIncome,
+                    INCOME_COLUMNS,
+                    (
+                        (created, created, user_ids[position], *rest)
+                        for position, created, *rest in self.incomes
+                    ),
+                )
+                self.counts["incomes"] += len(self.incomes)
+        self.users, self.expenses, self.incomes = [], [], []
+
+    @staticmethod
+    def _history(pk, user_id, created, edited, value, category, day, description):
+        # Mesmo formato gravado pelos signals de Expense (model_to_dict serializado).
+        data = {
+            "id": pk,
+            "user": user_id,
+            "value": float(value),
+            "category": category,
+            "date": day.isoformat(),
+            "description": description,
+        }
+        payload = json.dumps(data, ensure_ascii=False)
+        yield (pk, user_id, "created", created, payload)
+        if edited is not None:
+            yield (pk, user_id, "updated", edited, payload)
+
+
+def create_users(prefix, indexes):
+    """Cria os usuários sintéticos ``indexes`` e retorna seus ids na mesma ordem."""
+    password = make_password(None)
+    users = get_user_model().objects.bulk_create(
+        get_user_model()(
+            username=username(prefix, index),
+            email=f"{username(prefix, index)}@example.com",
+            password=password,
+        )
+        for index in indexes
+    )
+    return [user.pk for user in users]
@@ -1,16 +1,23 @@
 import base64
 import logging
 from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
 from io import BytesIO
 
 from celery import shared_task
 from xlsxwriter import Workbook
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connections, transaction
 from django.utils import timezone
 
-from .models import Expense, MonthlyIncome
+from backend_expenses.replica import analytics_db
+
+from .models import Expense, MonthlyIncome, SyncTombstone
+from .partitioning import drop_expired_history, ensure_partitions
+from .slow_queries import record_slow_queries
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -26,9 +33,11 @@ def export_expenses_csv(user_id):
 
         now = timezone.localtime(timezone.now())
 
-        expenses = Expense.objects.filter(
-            user=user, date__year=now.year, date__month=now.month
-        ).order_by("-date")
+        expenses = (
+            Expense.objects.using(analytics_db(user))
+            .filter(user=user, date__year=now.year, date__month=now.month)
+            .order_by("-date")
+        )
 
         categoria_totais = defaultdict(Decimal)
 
@@ -147,9 +156,11 @@ def export_monthly_income_csv(user_id):
     try:
         user = User.objects.get(pk=user_id)
         now = timezone.localtime(timezone.now())
-        monthly_incomes = MonthlyIncome.objects.filter(
-            user=user, date__year=now.year, date__month=now.month
-        ).order_by("-date")
+        monthly_incomes = (
+            MonthlyIncome.objects.using(analytics_db(user))
+            .filter(user=user, date__year=now.year, date__month=now.month)
+            .order_by("-date")
+        )
 
         with BytesIO() as fp:
             workbook = Workbook(
@@ -249,3 +260,35 @@ def export_monthly_income_csv(user_id):
     except Exception as e:
         logger.error(f"Erro ao exportar rendas mensais para usuário {user_id}: {e}")
         raise
+
+
+@shared_task
+def maintain_partitions(detach_only=False):
+    """Cria as partições futuras e descarta o histórico expirado em cada shard."""
+    for alias in settings.LEDGER_SHARDS:
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            continue
+        with transaction.atomic(using=alias):
+            created = ensure_partitions(connection)
+            expired = drop_expired_history(connection, detach_only=detach_only)
+        logger.info(
+            f"Partições em {alias}: criadas {created or 'nenhuma'}, "
+            f"{'desanexadas' if detach_only else 'removidas'} {expired or 'nenhuma'}"
+        )
+
+
+@shared_task
+def prune_sync_tombstones():
+    """Apaga, em cada shard, os tombstones além de ``SYNC_TOMBSTONE_RETENTION_DAYS``."""
+    horizon = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    for alias in settings.LEDGER_SHARDS:
+        deleted, _ = SyncTombstone.objects.using(alias).filter(deleted__lt=horizon).delete()
+        logger.info(f"Tombstones em {alias}: {deleted} removidos")
+
+
+# As consultas desta task (EXPLAIN e gravações em SlowQuery) não entram no registro.
+@shared_task(track_slow_queries=False)
+def store_slow_queries(captured, context, user_id=None):
+    """Grava as consultas lentas capturadas numa requisição (``MetricsMiddleware``)."""
+    record_slow_queries(captured, context, user_id)
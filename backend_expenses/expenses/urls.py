@@ -1,8 +1,15 @@
 from rest_framework.routers import DefaultRouter
 
+from django.conf import settings
 from django.urls import include, path
 
+from .async_views import (
+    AsyncExpenseMonthlyReportView,
+    AsyncFinancialAlertListView,
+    AsyncFinancialSummaryView,
+)
 from .views import (
+    DashboardView,
     ExpenseViewSet,
     ExportExpensesCSVView,
     ExportMonthlyIncomeCSVView,
@@ -11,6 +18,7 @@ from .views import (
     GenerateFinancialAlertsView,
     MonthlyIncomeViewSet,
     RegisterView,
+    SyncChangesView,
 )
 
 router = DefaultRouter()
@@ -22,7 +30,24 @@ urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("export-expense-csv/", ExportExpensesCSVView.as_view(), name="export-expenses-csv"),
     path("export-income-csv/", ExportMonthlyIncomeCSVView.as_view(), name="export-income-csv"),
+    path("dashboard/", DashboardView.as_view(), name="dashboard"),
     path("financial-summary/", FinancialSummaryView.as_view(), name="financial-summary"),
+    path("sync/", SyncChangesView.as_view(), name="sync-changes"),
     path("generate-alerts/", GenerateFinancialAlertsView.as_view(), name="generate-alerts"),
     path("", include(router.urls)),
 ]
+
+# Versões assíncronas (expenses.async_views), nos mesmos caminhos e nomes de rota.
+async_urlpatterns = [
+    path("financial-summary/", AsyncFinancialSummaryView.as_view(), name="financial-summary"),
+    path(
+        "expenses/report/monthly/",
+        AsyncExpenseMonthlyReportView.as_view(),
+        name="expense-report-monthly",
+    ),
+    path("financial-alerts/", AsyncFinancialAlertListView.as_view(), name="financialalert-list"),
+]
+
+if settings.ASYNC_VIEWS:
+    # Vêm antes e sobrepõem as rotas síncronas equivalentes.
+    urlpatterns = async_urlpatterns + urlpatterns
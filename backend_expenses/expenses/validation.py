@@ -0,0 +1,61 @@
+"""
+Camada de validação de negócio com pydantic ``TypeAdapter`` em cache.
+
+Os serializers delegam para cá: os adapters são construídos uma vez por schema
+e validam um objeto ou uma lista inteira em uma única chamada ao núcleo do
+pydantic. Os erros mantêm o formato usado pela API (``{"validation": msg}``),
+com a mesma mensagem de ``Schema(**data)``.
+"""
+
+from functools import lru_cache
+from typing import Dict, List
+
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+from rest_framework import serializers
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema, many=False) -> TypeAdapter:
+    return TypeAdapter(List[schema] if many else schema)
+
+
+def _error(exc: PydanticValidationError) -> Dict:
+    return {"validation": str(exc)}
+
+
+def validate_object(schema, data) -> None:
+    """Valida um objeto; levanta ``ValidationError`` do DRF em caso de erro."""
+    try:
+        get_adapter(schema).validate_python(data)
+    except PydanticValidationError as exc:
+        raise serializers.ValidationError(_error(exc))
+
+
+def validate_many(schema, items) -> List[Dict]:
+    """
+    Valida uma lista em uma única chamada.
+
+    Retorna uma lista de erros alinhada com ``items`` (``{}`` para itens
+    válidos), no mesmo formato que o ``ListSerializer`` produziria.
+    """
+    try:
+        get_adapter(schema, many=True).validate_python(items)
+    except PydanticValidationError as exc:
+        invalid = {error["loc"][0] for error in exc.errors()}
+    else:
+        return [{} for _ in items]
+
+    # Caminho de erro: revalida só os itens inválidos para manter a mensagem
+    # idêntica à validação de um objeto isolado.
+    errors = []
+    for index, item in enumerate(items):
+        if index not in invalid:
+            errors.append({})
+            continue
+        try:
+            validate_object(schema, item)
+            errors.append({})
+        except serializers.ValidationError as item_exc:
+            errors.append(serializers.as_serializer_error(item_exc))
+    return errors
@@ -13,19 +13,114 @@ from django.db.models import Sum
 from django.db.models.functions import TruncMonth
 from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 
+from backend_expenses.replica import analytics_db
+
+from . import archive
+from .conditional import alerts_state, conditional_get, expenses_state, incomes_state
 from .filters import ExpenseFilter, MonthlyIncomeFilter
 from .models import Expense, FinancialAlert, MonthlyIncome
 from .serializers import (
+    DashboardSerializer,
     ExpenseSerializer,
     FinancialAlertSerializer,
     FinancialSummarySerializer,
     MonthlyIncomeSerializer,
+    ValuesRowFormatter,
+    get_requested_fields,
+    serializer_field_names,
 )
-from .services import FinancialAnalysisService
+from .services import DashboardService, DeltaSyncService, FinancialAnalysisService
 from .tasks import export_expenses_csv, export_monthly_income_csv
 
 IDS_LIST_ERROR_MSG = "ids deve ser uma lista de IDs"
+MONTH_FORMAT_ERROR_MSG = "Formato de mês inválido. Use YYYY-MM"
+
+
+def parse_target_month(month_str):
+    """Converte "YYYY-MM" no primeiro dia do mês (mês atual se vazio)."""
+    if not month_str:
+        return timezone.now().date().replace(day=1)
+    year, month = map(int, month_str.split("-"))
+    return date(year, month, 1)
+
+
+class SparseFieldsViewMixin:
+    """
+    Campos esparsos (``?fields=`` / ``?omit=``) do lado da consulta.
+
+    O serializer já descarta os campos não pedidos; aqui o SQL também é
+    restringido: ``only()`` no retrieve e colunas do ``values_list()`` na listagem.
+    """
+
+    # Campos sempre carregados no retrieve (checagem de permissão por dono).
+    sparse_always_load = ("user",)
+
+    def get_requested_fields(self):
+        """Campos pedidos na query string (``None`` = todos)."""
+        return get_requested_fields(
+            self.request, serializer_field_names(self.get_serializer_class())
+        )
+
+    def is_field_requested(self, name):
+        fields = self.get_requested_fields()
+        return fields is None or name in fields
+
+    def narrow_queryset(self, queryset):
+        """Aplica ``only()`` com as colunas dos campos pedidos em um retrieve."""
+        fields = self.get_requested_fields() if self.action == "retrieve" else None
+        if fields is None:
+            return queryset
+        formatter = ValuesRowFormatter.for_serializer(self.get_serializer_class(), fields)
+        if formatter is None:
+            return queryset
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = [column for column in formatter.columns if column in concrete]
+        return queryset.only(*self.sparse_always_load, *columns)
+
+
+class ValuesListMixin(SparseFieldsViewMixin):
+    """
+    Listagem (GET) somente leitura via ``values_list()`` + ``ValuesRowFormatter``.
+
+    Filtros, busca, ordenação e paginação são aplicados normalmente; apenas a
+    materialização das linhas troca models + serializer por tuplas formatadas,
+    com saída idêntica. Serializers não suportados usam o ``list`` padrão.
+    """
+
+    def list(self, request, *args, **kwargs):
+        formatter = ValuesRowFormatter.for_serializer(
+            self.get_serializer_class(), self.get_requested_fields()
+        )
+        if formatter is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*formatter.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(formatter.format_many(page))
+        return Response(formatter.format_many(queryset))
+
+
+class BulkUpdateMixin:
+    """Atualização em massa validando o payload uma única vez."""
+
+    def perform_bulk_update(self, queryset, update_fields):
+        """
+        Aplica ``update_fields`` a todas as linhas de ``queryset``.
+
+        O payload é o mesmo para todas as linhas, então é validado uma vez só.
+        Retorna ``(dados_atualizados, erros_por_id)``.
+        """
+        objs = list(queryset)
+        serializer = self.get_serializer(data=update_fields, partial=True)
+        if not serializer.is_valid():
+            return [], {obj.id: serializer.errors for obj in objs}
+
+        for obj in objs:
+            serializer.update(obj, dict(serializer.validated_data))
+        return self.get_serializer(objs, many=True).data, {}
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -34,19 +129,22 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user and request.user.is_staff:
             return True
-        if request.method in permissions.SAFE_METHODS:
-            return obj.user == request.user
-        return obj.user == request.user
+        # Compara pelo id para não carregar o usuário dono do objeto.
+        return obj.user_id == request.user.pk
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+@method_decorator(conditional_get(expenses_state), name="list")
+@method_decorator(conditional_get(expenses_state), name="retrieve")
+class ExpenseViewSet(ValuesListMixin, BulkUpdateMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar despesas do usuário autenticado.
 
     - Permite criar, listar, editar e excluir despesas.
-    - Filtros disponíveis: data, categoria, valor, descrição.
+    - Filtros disponíveis: data, período (date_start/date_end), categoria(s),
+      faixa de valor (value_min/value_max), descrição.
     - Pesquisa: por descrição ou categoria.
     - Ordenação: por data, valor ou categoria.
+    - Campos esparsos: ?fields=id,value,date ou ?omit=description.
     """
 
     serializer_class = ExpenseSerializer
@@ -60,10 +158,10 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     filterset_class = ExpenseFilter
     search_fields = ["description", "category"]
     ordering_fields = ["date", "value", "category"]
-    ordering = ["-id"]
+    ordering = ["-date", "-id"]
 
     def get_object(self):
-        obj = Expense.objects.get(pk=self.kwargs["pk"])
+        obj = self.narrow_queryset(Expense.objects.all()).get(pk=self.kwargs["pk"])
         self.check_object_permissions(self.request, obj)
         return obj
 
@@ -74,8 +172,9 @@ class ExpenseViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=["get"], url_path="report/monthly")
+    @method_decorator(conditional_get(expenses_state, replica=True))
     def report_monthly(self, request):
-        qs = self.get_queryset()
+        qs = self.get_queryset().using(analytics_db(request.user))
         total_geral = qs.aggregate(total=Sum("value"))["total"] or 0
         data = (
             qs.annotate(month=TruncMonth("date"))
@@ -83,6 +182,8 @@ class ExpenseViewSet(viewsets.ModelViewSet):
             .annotate(total=Sum("value"))
             .order_by("-month", "category")
         )
+        # Anos antigos arquivados em Parquet entram no relatório (expenses.archive).
+        total_geral, data = archive.monthly_report(request.user.pk, total_geral, data)
         return Response({"total_geral": total_geral, "detalhes": data})
 
     @action(detail=False, methods=["patch"], url_path="bulk_update")
@@ -109,15 +210,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        updated_objs = []
-        errors = {}
-        for obj in queryset:
-            serializer = self.get_serializer(obj, data=update_fields, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                updated_objs.append(serializer.data)
-            else:
-                errors[obj.id] = serializer.errors
+        updated_objs, errors = self.perform_bulk_update(queryset, update_fields)
 
         result = {"updated_count": len(updated_objs), "updated": updated_objs, "ids": ids}
         if errors:
@@ -207,7 +300,9 @@ class ExportExpensesCSVView(APIView):
             )
 
 
-class MonthlyIncomeViewSet(viewsets.ModelViewSet):
+@method_decorator(conditional_get(incomes_state), name="list")
+@method_decorator(conditional_get(incomes_state), name="retrieve")
+class MonthlyIncomeViewSet(ValuesListMixin, BulkUpdateMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar rendas mensais do usuário.
 
@@ -225,7 +320,10 @@ class MonthlyIncomeViewSet(viewsets.ModelViewSet):
     ordering = ["-date"]
 
     def get_queryset(self):
-        return MonthlyIncome.objects.filter(user=self.request.user)
+        queryset = MonthlyIncome.objects.filter(user=self.request.user)
+        if self.action in ("list", "retrieve") and self.is_field_requested("total_month_income"):
+            queryset = queryset.with_month_total()
+        return self.narrow_queryset(queryset)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -271,8 +369,8 @@ class MonthlyIncomeViewSet(viewsets.ModelViewSet):
             writer.writerow(
                 [
                     income.description,
-                    income.value,
-                    income.get_income_type_display(),
+                    income.amount,
+                    income.income_type,
                     income.date.strftime("%d/%m/%Y"),
                     "Sim" if income.is_recurring else "Não",
                     income.created.strftime("%d/%m/%Y %H:%M"),
@@ -297,15 +395,7 @@ class MonthlyIncomeViewSet(viewsets.ModelViewSet):
             )
 
         queryset = self.get_queryset().filter(id__in=ids)
-        updated_objs = []
-        errors = {}
-        for obj in queryset:
-            serializer = self.get_serializer(obj, data=update_fields, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                updated_objs.append(serializer.data)
-            else:
-                errors[obj.id] = serializer.errors
+        updated_objs, errors = self.perform_bulk_update(queryset, update_fields)
 
         result = {"updated_count": len(updated_objs), "updated": updated_objs, "ids": ids}
         if errors:
@@ -386,7 +476,9 @@ class ExportMonthlyIncomeCSVView(APIView):
             )
 
 
-class FinancialAlertViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional_get(alerts_state), name="list")
+@method_decorator(conditional_get(alerts_state), name="retrieve")
+class FinancialAlertViewSet(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para visualizar alertas financeiros gerados pela análise do sistema.
 
@@ -399,7 +491,7 @@ class FinancialAlertViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return FinancialAlert.objects.filter(user=self.request.user)
+        return self.narrow_queryset(FinancialAlert.objects.filter(user=self.request.user))
 
     @action(detail=True, methods=["patch"])
     def mark_as_read(self, request, pk=None):
@@ -427,20 +519,16 @@ class FinancialSummaryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     throttle_scope = "summary"
 
+    @method_decorator(conditional_get(expenses_state, incomes_state, daily=True, replica=True))
     def get(self, request):
         """Retorna resumo financeiro do mês atual ou especificado."""
-        month_str = request.GET.get("month")
-        if month_str:
-            try:
-                year, month = map(int, month_str.split("-"))
-                target_month = date(year, month, 1)
-            except (ValueError, TypeError):
-                return Response(
-                    {"error": "Formato de mês inválido. Use YYYY-MM"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        else:
-            target_month = timezone.now().date().replace(day=1)
+        try:
+            target_month = parse_target_month(request.GET.get("month"))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": MONTH_FORMAT_ERROR_MSG},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         analysis_service = FinancialAnalysisService(request.user, target_month)
         summary = analysis_service.get_financial_summary()
@@ -451,6 +539,31 @@ class FinancialSummaryView(APIView):
         return Response(serializer.data)
 
 
+class DashboardView(APIView):
+    """
+    Endpoint único de carregamento do dashboard.
+
+    - Retorna o resumo financeiro do mês, despesas recentes, alertas não lidos e
+      gastos por categoria, evitando várias requisições na abertura da tela.
+    - O mês pode ser especificado via parâmetro (?month=YYYY-MM).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "summary"
+
+    def get(self, request):
+        try:
+            target_month = parse_target_month(request.GET.get("month"))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": MONTH_FORMAT_ERROR_MSG},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dashboard = DashboardService(request.user, target_month).get_dashboard()
+        return Response(DashboardSerializer(dashboard).data)
+
+
 class GenerateFinancialAlertsView(APIView):
     """
     Endpoint para gerar alertas financeiros manualmente para o mês desejado.
@@ -464,18 +577,13 @@ class GenerateFinancialAlertsView(APIView):
 
     def post(self, request):
         """Gera alertas financeiros para o mês especificado."""
-        month_str = request.data.get("month")
-        if month_str:
-            try:
-                year, month = map(int, month_str.split("-"))
-                target_month = date(year, month, 1)
-            except (ValueError, TypeError):
-                return Response(
-                    {"error": "Formato de mês inválido. Use YYYY-MM"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        else:
-            target_month = timezone.now().date().replace(day=1)
+        try:
+            target_month = parse_target_month(request.data.get("month"))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": MONTH_FORMAT_ERROR_MSG},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         analysis_service = FinancialAnalysisService(request.user, target_month)
         alerts = analysis_service.generate_financial_alerts()
@@ -489,6 +597,47 @@ class GenerateFinancialAlertsView(APIView):
         )
 
 
+class SyncChangesView(APIView):
+    """
+    Endpoint de sincronização incremental para clientes offline/mobile.
+
+    - Sem ``cursor`` devolve o estado atual (em lotes) e um cursor inicial.
+    - Com ``?cursor=...`` devolve despesas e rendas criadas/alteradas e os IDs
+      excluídos desde o cursor, em lotes de até ``limit`` eventos.
+    - Enquanto ``has_more`` for verdadeiro, repita a chamada com o novo cursor.
+    - Cursor mais antigo que a retenção das exclusões: 410 com ``full_resync``;
+      o cliente descarta os dados locais e sincroniza sem cursor.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "sync"
+
+    def get(self, request):
+        try:
+            limit = int(request.GET.get("limit", DeltaSyncService.DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {"error": "limit deve ser um número inteiro"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        service = DeltaSyncService(request.user)
+        try:
+            changes = service.get_changes(request.GET.get("cursor"), limit)
+        except DeltaSyncService.InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DeltaSyncService.ResyncRequired as e:
+            return Response({"error": str(e), "full_resync": True}, status=status.HTTP_410_GONE)
+
+        for group, serializer_class in (
+            ("expenses", ExpenseSerializer),
+            ("monthly_income", MonthlyIncomeSerializer),
+        ):
+            for kind in ("created", "updated"):
+                changes[group][kind] = serializer_class(changes[group][kind], many=True).data
+        return Response(changes)
+
+
 class RegisterView(APIView):
     """
     View para registro de novos usuários.
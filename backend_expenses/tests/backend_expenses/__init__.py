@@ -0,0 +1 @@
+# Backend expenses (project) tests module
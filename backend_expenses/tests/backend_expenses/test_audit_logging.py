@@ -0,0 +1,104 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from backend_expenses.audit_logging import BackgroundQueueHandler, JSONFormatter
+
+
+@pytest.fixture
+def audit_records(caplog):
+    logger = logging.getLogger("audit")
+    logger.addHandler(caplog.handler)
+    caplog.handler.setLevel(logging.INFO)
+    yield lambda: [r for r in caplog.records if r.name == "audit"]
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.fixture
+def client():
+    user = get_user_model().objects.create_user(username="auditor", password="123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_GET_SAMPLE_RATE=0.0)
+def test_successful_gets_are_sampled_but_writes_and_errors_logged(client, audit_records):
+    client.get("/api/expenses/")
+    assert audit_records() == []
+
+    client.post("/api/expenses/", {"value": "-1"}, format="json")
+    client.get("/api/monthly-income/999999/")
+    records = audit_records()
+
+    assert [(r.audit["method"], r.audit["status"]) for r in records] == [
+        ("POST", 400),
+        ("GET", 404),
+    ]
+    assert all(r.levelno == logging.WARNING for r in records)
+    assert records[0].audit["body"] == {"value": "-1"}
+
+
+@pytest.mark.django_db
+@override_settings(AUDIT_LOG_GET_SAMPLE_RATE=0.0, AUDIT_LOG_SLOW_REQUEST_MS=0)
+def test_slow_requests_always_logged(client, audit_records):
+    client.get("/api/expenses/")
+
+    (record,) = audit_records()
+    assert record.audit["slow"] is True
+    assert record.audit["user"] == "auditor"
+
+
+def test_json_formatter_includes_audit_fields():
+    record = logging.LogRecord("audit", logging.INFO, __file__, 1, "[AUDIT] %s", ("ok",), None)
+    record.audit = {"status": 200, "path": "/api/expenses/?q=açaí"}
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["message"] == "[AUDIT] ok"
+    assert entry["status"] == 200
+    assert entry["path"] == "/api/expenses/?q=açaí"
+    assert entry["level"] == "INFO"
+
+
+def test_background_handler_writes_from_listener_thread():
+    stream = io.StringIO()
+    handler = BackgroundQueueHandler(queue_size=10, stream=stream)
+    handler.setFormatter(JSONFormatter())
+    logger = logging.Logger("audit-test")
+    logger.addHandler(handler)
+
+    logger.info("primeiro", extra={"audit": {"status": 201}})
+    handler.close()
+
+    (line,) = stream.getvalue().splitlines()
+    assert json.loads(line)["status"] == 201
+
+
+def test_background_handler_drops_when_queue_is_full():
+    release = threading.Event()
+
+    class BlockedStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    handler = BackgroundQueueHandler(queue_size=2, stream=BlockedStream())
+    logger = logging.Logger("audit-test")
+    logger.addHandler(handler)
+
+    # O listener fica preso no primeiro registro; a fila comporta mais 2.
+    for i in range(10):
+        logger.info("registro %s", i)
+
+    assert handler.dropped >= 6
+    release.set()
+    handler.close()
@@ -0,0 +1,95 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from expenses.models import Expense
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def _client(user, password="123"):
+    client = APIClient()
+    token = client.post(
+        "/api/token/", {"username": user.username, "password": password}, format="json"
+    ).data["access"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def _user_queries(queries):
+    return [query["sql"] for query in queries if 'FROM "auth_user"' in query["sql"]]
+
+
+def test_user_is_resolved_from_cache():
+    user = get_user_model().objects.create_user(username="cache", password="123")
+    client = _client(user)
+    assert client.get("/api/expenses/").status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/expenses/").status_code == 200
+
+    assert _user_queries(queries.captured_queries) == []
+
+
+def test_cache_holds_no_password():
+    user = get_user_model().objects.create_user(username="segredo", password="123")
+    client = _client(user)
+    client.get("/api/expenses/")
+
+    cached = cache.get(f"auth:user:{user.pk}")
+    assert user.password not in repr(cached)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/expenses/")
+    assert response.status_code == 200
+    assert _user_queries(queries.captured_queries) == []
+
+
+def test_password_change_revokes_cached_token():
+    user = get_user_model().objects.create_user(username="senha", password="123")
+    client = _client(user)
+    assert client.get("/api/expenses/").status_code == 200
+
+    user.set_password("456")
+    user.save()
+
+    assert client.get("/api/expenses/").status_code == 401
+    assert _client(user, password="456").get("/api/expenses/").status_code == 200
+
+
+def test_deactivated_user_is_rejected():
+    user = get_user_model().objects.create_user(username="inativo", password="123")
+    client = _client(user)
+    assert client.get("/api/expenses/").status_code == 200
+
+    user.is_active = False
+    user.save()
+
+    assert client.get("/api/expenses/").status_code == 401
+
+
+def test_staff_flag_survives_cache():
+    owner = get_user_model().objects.create_user(username="dono", password="123")
+    Expense.objects.create(
+        user=owner, value=Decimal("10.00"), category="lazer", date=datetime.date(2025, 8, 1)
+    )
+    staff = get_user_model().objects.create_user(username="staff", password="123")
+    client = _client(staff)
+    assert client.get("/api/expenses/").json()["count"] == 0
+
+    staff.is_staff = True
+    staff.save()
+
+    assert client.get("/api/expenses/").json()["count"] == 1
@@ -0,0 +1,137 @@
+import json
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+
+from backend_expenses import metrics
+from backend_expenses.cache import InstrumentedLocMemCache, location_label
+from expenses.tasks import export_expenses_csv
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+@pytest.fixture
+def staff_client():
+    staff = get_user_model().objects.create_user(username="ops", password="123", is_staff=True)
+    client = Client()
+    client.force_login(staff)
+    return client
+
+
+def _lines(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+@pytest.mark.django_db
+def test_request_latency_and_queries_by_route(staff_client):
+    user = get_user_model().objects.create_user(username="metered", password="123")
+    api = APIClient()
+    api.force_authenticate(user=user)
+    api.get("/api/expenses/")
+    api.get("/api/expenses/")
+
+    body = staff_client.get("/metrics").content.decode()
+
+    route = 'method="GET",route="expense-list"'
+    (count,) = _lines(body, f'http_request_duration_seconds_count{{{route},status="200"}}')
+    assert count.endswith(" 2")
+    inf_bucket = _lines(
+        body, f'http_request_duration_seconds_bucket{{{route},status="200",le="+Inf"}}'
+    )
+    assert inf_bucket[0].endswith(" 2")
+    (queries,) = _lines(body, f"http_request_db_queries_count{{{route}}}")
+    assert queries.endswith(" 2")
+    (queries_sum,) = _lines(body, f"http_request_db_queries_sum{{{route}}}")
+    assert float(queries_sum.split()[-1]) > 0
+    assert _lines(body, f"http_request_db_seconds_total{{{route}}}")
+    assert "# TYPE http_request_duration_seconds histogram" in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_protected():
+    assert Client().get("/metrics").status_code == 403
+
+    with override_settings(METRICS_TOKEN="s3cret"):
+        assert Client().get("/metrics", HTTP_AUTHORIZATION="Bearer errado").status_code == 403
+        response = Client().get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+
+def test_multiprocess_files_are_aggregated(tmp_path):
+    other = {
+        "counters": [["cache_requests_total", [["cache", "default"], ["result", "hit"]], 3]],
+        "histograms": [
+            [
+                "celery_task_duration_seconds",
+                [["state", "SUCCESS"], ["task", "t"]],
+                [1] + [0] * len(metrics.TASK_BUCKETS),
+                0.005,
+            ]
+        ],
+    }
+    (tmp_path / "metrics_999999.json").write_text(json.dumps(other))
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        metrics.record_cache("default", True, 2)
+        metrics.flush(force=True)
+        body = metrics.render()
+
+    assert 'cache_requests_total{cache="default",result="hit"} 5' in body
+    assert 'celery_task_duration_seconds_count{state="SUCCESS",task="t"} 1' in body
+    assert (tmp_path / "metrics_999999.json").exists()
+    assert len(list(tmp_path.glob("metrics_*.json"))) == 2
+
+
+def test_reused_pid_does_not_overwrite_dead_process_file(tmp_path):
+    dead = {"counters": [["cache_requests_total", [["cache", "x"], ["result", "hit"]], 7]]}
+    dead_file = tmp_path / f"metrics_{os.getpid()}_morto.json"
+    dead_file.write_text(json.dumps({**dead, "histograms": []}))
+
+    with override_settings(METRICS_MULTIPROC_DIR=str(tmp_path)):
+        metrics.record_cache("x", True)
+        metrics.flush(force=True)
+        body = metrics.render()
+
+    assert json.loads(dead_file.read_text())["counters"] == dead["counters"]
+    assert 'cache_requests_total{cache="x",result="hit"} 8' in body
+
+
+def test_cache_hit_ratio_counters():
+    cache = InstrumentedLocMemCache("metrics-test", {})
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b", "padrão") == "padrão"
+    cache.get_many(["a", "b", "c"])
+
+    body = metrics.render()
+    assert 'cache_requests_total{cache="metrics-test",result="hit"} 2' in body
+    assert 'cache_requests_total{cache="metrics-test",result="miss"} 3' in body
+
+
+def test_cache_label_drops_credentials():
+    assert location_label("redis://:segredo@redis:6379/1?password=x") == "redis://redis:6379/1"
+    assert location_label("redis://user:segredo@a/1,redis://b/1") == "redis://a/1,redis://b/1"
+    assert location_label(["rediss://u:p@a:6380/2"]) == "rediss://a:6380/2"
+    assert location_label("metrics-test") == "metrics-test"
+
+
+@pytest.mark.django_db
+def test_celery_task_duration_recorded():
+    user = get_user_model().objects.create_user(username="tasked", password="123")
+
+    export_expenses_csv.apply(args=[user.id])
+
+    body = metrics.render()
+    labels = 'state="SUCCESS",task="expenses.tasks.export_expenses_csv"'
+    assert f"celery_task_duration_seconds_count{{{labels}}} 1" in body
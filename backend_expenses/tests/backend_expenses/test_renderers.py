@@ -0,0 +1,81 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from backend_expenses.renderers import ORJSONParser, ORJSONRenderer
+from expenses.models import Expense
+from expenses.serializers import ExpenseSerializer
+
+
+def _render_both(data, media_type=None, context=None):
+    return (
+        JSONRenderer().render(data, media_type, context),
+        ORJSONRenderer().render(data, media_type, context),
+    )
+
+
+def test_orjson_renderer_matches_drf_output():
+    data = {
+        "total_geral": Decimal("1234.50"),
+        "month": datetime.date(2025, 8, 1),
+        "created": datetime.datetime(2025, 8, 1, 12, 30, 5, 123456, tzinfo=datetime.timezone.utc),
+        "local": datetime.datetime(2025, 8, 1, 9, 30, tzinfo=timezone.get_fixed_timezone(-180)),
+        "label": gettext_lazy("Moradia"),
+        "errors": {1: ["erro"]},
+        "text": "Açaí   linha",
+        "empty": None,
+        "flags": [True, False],
+    }
+    drf, fast = _render_both(data)
+    assert fast == drf
+
+
+def test_orjson_renderer_matches_serializer_output():
+    user = get_user_model()(id=1, username="x")
+    now = timezone.now()
+    expenses = [
+        Expense(
+            id=i,
+            user=user,
+            value=Decimal("10.50") * i,
+            category="lazer",
+            date=datetime.date(2025, 8, i),
+            description=f"Despesa {i}",
+            created=now,
+            modified=now,
+        )
+        for i in range(1, 6)
+    ]
+    data = {"count": 5, "results": ExpenseSerializer(expenses, many=True).data}
+    drf, fast = _render_both(data)
+    assert fast == drf
+
+
+def test_orjson_renderer_indent_and_none():
+    assert ORJSONRenderer().render(None) == b""
+    rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+    assert rendered == b'{\n  "a": 1\n}'
+
+
+@pytest.mark.django_db
+def test_orjson_renderer_handles_values_queryset():
+    user = get_user_model().objects.create_user(username="renderer", password="123")
+    Expense.objects.create(user=user, value=10, category="lazer", date=datetime.date(2025, 8, 1))
+    data = {"detalhes": Expense.objects.values("category", "value", "date")}
+    drf, fast = _render_both(data)
+    assert fast == drf
+
+
+def test_orjson_parser():
+    parsed = ORJSONParser().parse(io.BytesIO('{"ids": [1, 2], "d": "Açaí"}'.encode()))
+    assert parsed == {"ids": [1, 2], "d": "Açaí"}
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b"{invalid"))
@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from backend_expenses.replica import PrimaryReplicaRouter, analytics_db, pin_to_primary
+from expenses.services import FinancialAnalysisService
+
+pytestmark = pytest.mark.filterwarnings("ignore:Overriding setting DATABASES")
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASES = {**settings.DATABASES, "replica": settings.DATABASES["default"]}
+    cache.clear()
+    yield "replica"
+    cache.clear()
+
+
+def test_analytics_use_primary_without_replica():
+    assert analytics_db(1) == "default"
+
+
+def test_analytics_use_replica_until_user_writes(replica):
+    assert analytics_db(1) == "replica"
+
+    pin_to_primary(1)
+    assert analytics_db(1) == "default"
+    assert analytics_db(2) == "replica"
+
+
+def test_pin_expires(replica, settings):
+    settings.REPLICA_PIN_SECONDS = 0
+    pin_to_primary(1)
+    assert analytics_db(1) == "replica"
+
+
+def test_analysis_service_reads_from_replica(replica):
+    user = get_user_model()(pk=1, username="replica")
+    service = FinancialAnalysisService(user, date(2025, 8, 1))
+    assert service._month_expenses().db == "replica"
+    assert service._month_incomes().db == "replica"
+    assert service._month_alerts().db == "default"
+
+
+@pytest.mark.django_db
+def test_analytics_use_primary_inside_transaction(replica):
+    assert analytics_db(1) == "default"
+
+
+@pytest.mark.django_db
+def test_write_requests_pin_user_to_primary(replica):
+    user = get_user_model().objects.create_user(username="writer", password="123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    client.get("/api/expenses/")
+    assert not cache.get(f"replica:pin:{user.pk}")
+
+    response = client.post(
+        "/api/expenses/",
+        {"value": "10.00", "category": "lazer", "date": "2025-08-01"},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert cache.get(f"replica:pin:{user.pk}")
+
+
+def test_router_keeps_writes_and_migrations_on_primary():
+    router = PrimaryReplicaRouter()
+    assert router.db_for_write(None) == "default"
+    assert router.db_for_read(None) == "default"
+    assert router.allow_migrate("default", "expenses")
+    assert not router.allow_migrate("replica", "expenses")
@@ -0,0 +1,105 @@
+import json
+import logging
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from backend_expenses import request_body
+from backend_expenses.crypto_middleware import PasswordDecryptionMiddleware
+from backend_expenses.request_body import get_json_body
+
+
+@pytest.fixture
+def audit_records(caplog):
+    # O logger "audit" não propaga para o root; o handler do caplog é anexado
+    # diretamente.
+    logger = logging.getLogger("audit")
+    logger.addHandler(caplog.handler)
+    caplog.handler.setLevel(logging.INFO)
+    yield lambda: [r.getMessage() for r in caplog.records if "[AUDIT]" in r.getMessage()]
+    logger.removeHandler(caplog.handler)
+
+
+def _json_request(payload, path="/api/expenses/"):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload)
+    return RequestFactory().post(path, data=body, content_type="application/json")
+
+
+def test_get_json_body_parses_once():
+    request = _json_request({"a": 1})
+
+    with mock.patch.object(request_body, "_loads", wraps=request_body._loads) as loads:
+        assert get_json_body(request) == {"a": 1}
+        assert get_json_body(request) == {"a": 1}
+
+    assert loads.call_count == 1
+
+
+def test_get_json_body_invalid_and_non_json():
+    request = _json_request(b"{invalid")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            get_json_body(request)
+
+    form = RequestFactory().post("/api/expenses/", data={"a": "1"})
+    assert get_json_body(form) is None
+
+
+def test_password_middleware_strips_encrypted_flag():
+    request = _json_request({"username": "u", "password": "p", "encrypted": True})
+    seen = {}
+
+    def view(req):
+        seen["data"] = get_json_body(req)
+        seen["body"] = json.loads(req.body)
+
+    PasswordDecryptionMiddleware(view)(request)
+
+    assert seen["data"] == {"username": "u", "password": "p"}
+    assert seen["body"] == seen["data"]
+
+
+@pytest.mark.django_db
+def test_request_body_parsed_once_across_middleware_and_drf():
+    user = get_user_model().objects.create_user(username="onceparse", password="123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with mock.patch.object(request_body, "_loads", wraps=request_body._loads) as loads:
+        response = client.post(
+            "/api/expenses/",
+            {"value": "12.00", "category": "lazer", "date": "2025-08-10"},
+            format="json",
+        )
+
+    assert response.status_code == 201
+    assert loads.call_count == 1
+
+
+@pytest.mark.django_db
+def test_audit_log_redacts_password(audit_records):
+    APIClient().post("/api/token/", {"username": "ninguem", "password": "segredo"}, format="json")
+
+    message = audit_records()[-1]
+    assert '"password": "***REDACTED***"' in message
+    assert "segredo" not in message
+
+
+@pytest.mark.django_db
+def test_audit_log_skips_large_bodies(audit_records):
+    user = get_user_model().objects.create_user(username="bulklog", password="123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    client.patch(
+        "/api/expenses/bulk_update/",
+        {"ids": list(range(1, 1000)), "data": {"category": "lazer"}},
+        format="json",
+    )
+
+    message = audit_records()[-1]
+    assert "body=" not in message
@@ -0,0 +1,59 @@
+import json
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.core.management import call_command
+
+from backend_expenses import schema
+
+
+@pytest.fixture
+def schema_file(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_FILE = str(tmp_path / "openapi.json")
+    return tmp_path / "openapi.json"
+
+
+def test_schema_is_served_from_file_with_etag(schema_file):
+    call_command("build_openapi_schema", verbosity=0)
+    client = APIClient()
+
+    with mock.patch.object(schema, "render_schema") as render:
+        response = client.get("/api/schema/")
+        not_modified = client.get("/api/schema/", HTTP_IF_NONE_MATCH=response["ETag"])
+
+    render.assert_not_called()
+    assert response.status_code == 200
+    assert "/expenses/" in json.loads(response.content)["paths"]
+    assert "max-age=86400" in response["Cache-Control"]
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == response["ETag"]
+
+
+def test_swagger_spec_format_uses_precomputed_file(schema_file):
+    schema_file.write_bytes(b'{"swagger": "2.0", "paths": {}}')
+
+    response = APIClient().get("/swagger/?format=openapi")
+
+    assert json.loads(response.content) == {"swagger": "2.0", "paths": {}}
+    assert response.has_header("ETag")
+
+
+def test_yaml_format_is_served_from_yaml_file(schema_file):
+    call_command("build_openapi_schema", verbosity=0)
+
+    with mock.patch.object(schema, "render_schema") as render:
+        response = APIClient().get("/swagger/?format=yaml")
+
+    render.assert_not_called()
+    assert response["Content-Type"].startswith("application/yaml")
+    assert response.content == schema_file.with_suffix(".yaml").read_bytes()
+    assert response.content.startswith(b"swagger:")
+
+
+def test_missing_file_is_generated_on_first_request(schema_file):
+    response = APIClient().get("/api/schema/")
+
+    assert response.status_code == 200
+    assert schema_file.read_bytes() == response.content
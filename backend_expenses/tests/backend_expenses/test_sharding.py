@@ -0,0 +1,103 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.conf import settings as django_settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from backend_expenses.sharding import HashRing, ShardRouter, shard_for, user_shard
+from expenses.models import Expense, ExpenseHistory
+
+sharded = pytest.mark.skipif(
+    len(django_settings.LEDGER_SHARDS) < 2, reason="requer LEDGER_SHARDS com 2+ bancos"
+)
+
+
+def test_ring_is_deterministic_and_balanced():
+    ring = HashRing(["a", "b", "c"])
+    assert [ring.node_for(user_id) for user_id in range(50)] == [
+        HashRing(["a", "b", "c"]).node_for(user_id) for user_id in range(50)
+    ]
+    counts = Counter(ring.node_for(user_id) for user_id in range(3000))
+    assert min(counts.values()) > 700
+
+
+def test_adding_a_shard_only_moves_users_to_it():
+    before, after = HashRing(["a", "b"]), HashRing(["a", "b", "c"])
+    moved = [
+        user_id for user_id in range(3000) if before.node_for(user_id) != after.node_for(user_id)
+    ]
+    assert all(after.node_for(user_id) == "c" for user_id in moved)
+    assert len(moved) < 1500
+
+
+def test_single_shard_keeps_everything_on_default(settings):
+    settings.LEDGER_SHARDS = ["default"]
+    assert shard_for(123) == "default"
+    assert ShardRouter().db_for_read(Expense) in (None, "default")
+
+
+def test_router_uses_instance_then_active_user(settings):
+    settings.LEDGER_SHARDS = ["default", "shard1"]
+    router = ShardRouter()
+    user_id = next(pk for pk in range(1, 100) if shard_for(pk) == "shard1")
+
+    assert router.db_for_write(Expense, instance=Expense(user_id=user_id)) == "shard1"
+    assert router.db_for_read(Expense) is None
+    with user_shard(user_id) as alias:
+        assert alias == "shard1"
+        assert router.db_for_read(Expense) == "shard1"
+        assert router.db_for_read(get_user_model()) is None
+    assert router.db_for_read(Expense) is None
+
+
+@sharded
+@pytest.mark.django_db(databases="__all__")
+def test_api_writes_ledger_to_user_shard():
+    users = [
+        get_user_model().objects.create_user(username=f"shard{index}", password="123")
+        for index in range(8)
+    ]
+    user = next(user for user in users if shard_for(user) != "default")
+    alias = shard_for(user)
+    client = APIClient()
+    token = client.post(
+        "/api/token/", {"username": user.username, "password": "123"}, format="json"
+    ).data["access"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    response = client.post(
+        "/api/expenses/",
+        {"value": "10.00", "category": "lazer", "date": "2025-08-01"},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert Expense.objects.using(alias).filter(user_id=user.pk).count() == 1
+    assert not Expense.objects.using("default").filter(user_id=user.pk).exists()
+    assert ExpenseHistory.objects.using(alias).filter(expense__user_id=user.pk).exists()
+    assert client.get("/api/expenses/").data["count"] == 1
+
+
+@sharded
+@pytest.mark.django_db(databases="__all__")
+def test_reshard_moves_ledgers_between_shards(settings):
+    shards = list(settings.LEDGER_SHARDS)
+    users = [
+        get_user_model().objects.create_user(username=f"moving{index}", password="123")
+        for index in range(8)
+    ]
+    user = next(user for user in users if shard_for(user) != "default")
+    target = shard_for(user)
+    settings.LEDGER_SHARDS = ["default"]
+    expense = Expense.objects.create(user=user, value=10, category="lazer", date=date(2025, 8, 1))
+    settings.LEDGER_SHARDS = shards
+
+    call_command("reshard_ledgers", "--from", "default", verbosity=0)
+
+    moved = Expense.objects.using(target).get(pk=expense.pk)
+    assert moved.created == expense.created and moved.modified == expense.modified
+    assert not Expense.objects.using("default").filter(user_id=user.pk).exists()
+    assert ExpenseHistory.objects.using(target).filter(expense_id=expense.pk).exists()
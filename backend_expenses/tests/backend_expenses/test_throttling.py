@@ -0,0 +1,69 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from backend_expenses.throttling import AnonRateThrottle, ScopedRateThrottle
+
+REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+redis_only = pytest.mark.skipif(not REDIS_URL, reason="requer CACHE_REDIS_URL")
+
+
+def _throttle(cache, rate="3/min"):
+    throttle_class = type(
+        "TestThrottle",
+        (AnonRateThrottle,),
+        {"rate": rate, "scope": f"test-{uuid.uuid4().hex}", "cache": cache},
+    )
+    return throttle_class
+
+
+def _allow(throttle_class, ip="10.0.0.1"):
+    request = APIRequestFactory().get("/", REMOTE_ADDR=ip)
+    request.user = AnonymousUser()
+    throttle = throttle_class()
+    return throttle.allow_request(request, None), throttle
+
+
+def test_local_cache_keeps_drf_behaviour():
+    throttle_class = _throttle(LocMemCache("throttle", {}))
+
+    assert [_allow(throttle_class)[0] for _ in range(3)] == [True, True, True]
+    allowed, throttle = _allow(throttle_class)
+    assert not allowed
+    assert 0 < throttle.wait() <= 60
+
+
+def test_scopes_without_rate_are_not_limited():
+    class View:
+        throttle_scope = "sem-taxa"
+
+    request = APIRequestFactory().get("/")
+    assert ScopedRateThrottle().allow_request(request, View())
+
+
+@redis_only
+def test_redis_sliding_window_limits_and_waits():
+    throttle_class = _throttle(RedisCache(REDIS_URL, {}))
+
+    assert [_allow(throttle_class)[0] for _ in range(3)] == [True, True, True]
+    allowed, throttle = _allow(throttle_class)
+    assert not allowed
+    assert 59 < throttle.wait() <= 60
+    assert _allow(throttle_class, ip="10.0.0.2")[0]
+
+
+@redis_only
+def test_redis_check_is_atomic_across_threads():
+    throttle_class = _throttle(RedisCache(REDIS_URL, {}), rate="10/min")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: _allow(throttle_class)[0], range(40)))
+
+    assert results.count(True) == 10
@@ -0,0 +1,71 @@
+import datetime
+
+import factory
+from factory import fuzzy
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome
+
+CATEGORIES = [choice for choice, _ in Expense.CATEGORY_CHOICES]
+ALERT_TYPES = [choice for choice, _ in FinancialAlert.ALERT_TYPES]
+
+
+def _month_start(months_ago):
+    today = timezone.localdate().replace(day=1)
+    year, month = divmod(today.year * 12 + today.month - 1 - months_ago, 12)
+    return datetime.date(year, month + 1, 1)
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+        django_get_or_create = ("username",)
+
+    username = factory.Sequence(lambda n: f"usuario{n}")
+    email = factory.LazyAttribute(lambda obj: f"{obj.username}@example.com")
+    password = factory.PostGenerationMethodCall("set_password", "senha123")
+
+
+class ExpenseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Expense
+
+    user = factory.SubFactory(UserFactory)
+    value = fuzzy.FuzzyDecimal(5, 800)
+    category = factory.Iterator(CATEGORIES)
+    date = factory.Sequence(lambda n: _month_start(n % 3) + datetime.timedelta(days=n % 28))
+    description = factory.Faker("sentence", nb_words=4, locale="pt_BR")
+
+
+class MonthlyIncomeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = MonthlyIncome
+
+    user = factory.SubFactory(UserFactory)
+    date = factory.Sequence(lambda n: _month_start(n % 3) + datetime.timedelta(days=4 + n % 20))
+    amount = fuzzy.FuzzyDecimal(1000, 8000)
+    description = factory.Faker("sentence", nb_words=3, locale="pt_BR")
+    income_type = factory.Iterator(["salario", "freelance", "outros"])
+    is_recurring = factory.Iterator([True, False])
+
+
+class FinancialAlertFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FinancialAlert
+
+    user = factory.SubFactory(UserFactory)
+    alert_type = factory.Iterator(ALERT_TYPES)
+    title = factory.Faker("sentence", nb_words=3, locale="pt_BR")
+    message = factory.Faker("paragraph", locale="pt_BR")
+    month = factory.Sequence(lambda n: _month_start(n % 3))
+    is_read = factory.Iterator([False, False, True])
+
+
+def seed_user_dataset(user, expenses=60, incomes=6, alerts=8):
+    """Conjunto de dados de um usuário ativo: três meses de despesas, rendas e alertas."""
+    ExpenseFactory.create_batch(expenses, user=user)
+    MonthlyIncomeFactory.create_batch(incomes, user=user)
+    FinancialAlertFactory.create_batch(alerts, user=user)
+    return user
@@ -0,0 +1,100 @@
+import datetime
+import os
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from expenses.archive import archive_path, archived_years, horizon
+from expenses.models import Expense
+from expenses.services import FinancialAnalysisService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def archive_root(settings, tmp_path):
+    settings.ARCHIVE_ROOT = str(tmp_path)
+    settings.ARCHIVE_HORIZON_YEARS = 3
+    return tmp_path
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="arquivo", password="123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _expense(user, day, value, category="lazer"):
+    return Expense.objects.create(user=user, value=Decimal(value), category=category, date=day)
+
+
+def test_archive_moves_old_expenses_to_parquet(
+    archive_root, user, django_capture_on_commit_callbacks
+):
+    old = _expense(user, datetime.date(2015, 3, 10), "10.50")
+    _expense(user, datetime.date(2016, 7, 1), "20.00")
+    recent = _expense(user, horizon(), "5.00")
+
+    call_command("archive_expenses", verbosity=0)
+
+    assert list(Expense.objects.filter(user=user)) == [recent]
+    assert archived_years(user.pk) == [2015, 2016]
+    assert os.path.exists(archive_path(user.pk, 2015))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("restore_expenses", "--user", str(user.pk), verbosity=0)
+
+    restored = Expense.objects.get(pk=old.pk)
+    assert (restored.value, restored.date, restored.created, restored.modified) == (
+        old.value,
+        old.date,
+        old.created,
+        old.modified,
+    )
+    assert Expense.objects.filter(user=user).count() == 3
+    assert archived_years(user.pk) == []
+
+
+def test_report_and_summary_read_archived_months(archive_root, user, client):
+    _expense(user, datetime.date(2015, 3, 10), "10.50")
+    _expense(user, datetime.date(2015, 3, 20), "4.50", category="saude")
+    _expense(user, horizon(), "5.00")
+    before = client.get("/api/expenses/report/monthly/").json()
+
+    call_command("archive_expenses", verbosity=0)
+    after = client.get("/api/expenses/report/monthly/").json()
+
+    assert Expense.objects.filter(user=user).count() == 1
+    assert Decimal(str(after["total_geral"])) == Decimal("20.00")
+    assert [(row["month"], row["category"]) for row in after["detalhes"]] == [
+        (row["month"], row["category"]) for row in before["detalhes"]
+    ]
+    summary = FinancialAnalysisService(user, datetime.date(2015, 3, 1)).get_financial_summary()
+    assert summary["expenses_by_category"] == {
+        "lazer": Decimal("10.50"),
+        "saude": Decimal("4.50"),
+    }
+    assert summary["total_expenses"] == Decimal("15.00")
+
+
+def test_archiving_again_merges_the_year_file(archive_root, user):
+    _expense(user, datetime.date(2015, 3, 10), "10.50")
+    call_command("archive_expenses", verbosity=0)
+    _expense(user, datetime.date(2015, 9, 1), "1.00")
+
+    call_command("archive_expenses", verbosity=0)
+
+    totals = FinancialAnalysisService(user, datetime.date(2015, 9, 1)).get_expenses_by_category()
+    assert totals == {"lazer": Decimal("1.00")}
+    call_command("restore_expenses", verbosity=0)
+    assert Expense.objects.filter(user=user).count() == 2
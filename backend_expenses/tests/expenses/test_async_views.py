@@ -0,0 +1,130 @@
+from datetime import date
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome
+from expenses.services import FinancialAnalysisService
+from expenses.urls import async_urlpatterns
+
+# As views assíncronas sobrepondo as síncronas, como com ASYNC_VIEWS ligado.
+urlpatterns = [
+    path("api/", include(async_urlpatterns)),
+    path("", include("backend_expenses.urls")),
+]
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="asyncuser", password="123")
+    Expense.objects.create(user=user, value=800, category="alimentacao", date=date(2025, 8, 3))
+    Expense.objects.create(user=user, value=150, category="lazer", date=date(2025, 8, 9))
+    Expense.objects.create(user=user, value=90, category="lazer", date=date(2025, 7, 20))
+    MonthlyIncome.objects.create(user=user, date=date(2025, 8, 5), amount=2000)
+    return user
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def sync_and_async(client, url, params=None):
+    sync_response = client.get(url, params)
+    with override_settings(ROOT_URLCONF=__name__):
+        async_response = client.get(url, params)
+    assert async_response.status_code == sync_response.status_code
+    return sync_response, async_response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, params",
+    [
+        ("/api/financial-summary/", {"month": "2025-08"}),
+        ("/api/financial-summary/", {"month": "ago/2025"}),
+        ("/api/expenses/report/monthly/", None),
+    ],
+)
+def test_async_views_match_sync_views(client, url, params):
+    sync_response, async_response = sync_and_async(client, url, params)
+    assert async_response.json() == sync_response.json()
+    assert async_response.get("ETag") == sync_response.get("ETag")
+
+
+@pytest.mark.django_db
+def test_async_summary_saves_alerts(client, user):
+    with override_settings(ROOT_URLCONF=__name__):
+        response = client.get("/api/financial-summary/", {"month": "2025-08"})
+    assert response.status_code == 200
+    assert FinancialAlert.objects.filter(user=user, month=date(2025, 8, 1)).count() == len(
+        response.json()["alerts"]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"page_size": 2},
+        {"page_size": 2, "page": 2},
+        {"ordering": "title", "fields": "id,title"},
+        {"page": 99},
+    ],
+)
+def test_async_alert_list_matches_sync(client, user, params):
+    FinancialAlert.objects.bulk_create(
+        FinancialAlert(
+            user=user,
+            alert_type="high_spending",
+            title=f"Alerta {i}",
+            message="Gasto alto",
+            month=date(2025, 8, 1),
+        )
+        for i in range(5)
+    )
+
+    sync_response, async_response = sync_and_async(client, "/api/financial-alerts/", params)
+    assert async_response.json() == sync_response.json()
+
+
+@pytest.mark.django_db
+def test_async_views_under_asgi(user):
+    token = RefreshToken.for_user(user).access_token
+    with override_settings(ROOT_URLCONF=__name__):
+        response = async_to_sync(AsyncClient().get)(
+            "/api/financial-summary/", {"month": "2025-08"}, AUTHORIZATION=f"Bearer {token}"
+        )
+    assert response.status_code == 200
+    assert response.json()["total_expenses"] == "950.00"
+
+
+@pytest.mark.django_db
+def test_async_views_require_authentication():
+    with override_settings(ROOT_URLCONF=__name__):
+        response = APIClient().get("/api/financial-summary/")
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_report_returns_not_modified(client):
+    with override_settings(ROOT_URLCONF=__name__):
+        etag = client.get("/api/expenses/report/monthly/")["ETag"]
+        response = client.get("/api/expenses/report/monthly/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_summary_concurrent_queries(user, settings):
+    settings.DASHBOARD_CONCURRENT_QUERIES = True
+    service = FinancialAnalysisService(user, date(2025, 8, 1))
+
+    assert async_to_sync(service.aget_financial_summary)() == service.get_financial_summary()
@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="etaguser", password="123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/expenses/",
+        "/api/expenses/report/monthly/",
+        "/api/monthly-income/",
+        "/api/financial-alerts/",
+        "/api/financial-summary/",
+    ],
+)
+def test_repeat_request_returns_not_modified(client, user, url):
+    Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    MonthlyIncome.objects.create(user=user, date=date.today(), amount=1000)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert "private" in response["Cache-Control"]
+    assert "no-cache" in response["Cache-Control"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_expense_changes_invalidate_etag(client, user):
+    expense = Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    etag = client.get("/api/expenses/")["ETag"]
+
+    expense.value = 20
+    expense.save()
+    response = client.get("/api/expenses/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    expense.delete()
+    response = client.get("/api/expenses/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_query_string(client, user):
+    Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    etag = client.get("/api/expenses/")["ETag"]
+    response = client.get("/api/expenses/?category=saude", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_mark_all_alerts_as_read_invalidates_etag(client, user):
+    FinancialAlert.objects.create(
+        user=user, alert_type="info", title="t", message="m", month=date.today()
+    )
+    etag = client.get("/api/financial-alerts/")["ETag"]
+    client.patch("/api/financial-alerts/mark_all_as_read/")
+    response = client.get("/api/financial-alerts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["results"][0]["is_read"] is True
+
+
+@pytest.mark.django_db
+def test_error_responses_have_no_etag(client):
+    response = client.get("/api/financial-summary/?month=invalido")
+    assert response.status_code == 400
+    assert not response.has_header("ETag")
@@ -0,0 +1,85 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome
+
+MONTH = datetime.date(2025, 8, 1)
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="dashuser", password="123")
+    MonthlyIncome.objects.create(user=user, date=MONTH, amount=Decimal("5000.00"))
+    for value, category in [("1800.00", "moradia"), ("800.00", "alimentacao"), ("50", "lazer")]:
+        Expense.objects.create(
+            user=user, value=Decimal(value), category=category, date=datetime.date(2025, 8, 10)
+        )
+    return user
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_dashboard_returns_all_sections(client, user):
+    response = client.get("/api/dashboard/", {"month": "2025-08"})
+    assert response.status_code == 200
+
+    summary = response.data["summary"]
+    assert Decimal(summary["income"]) == Decimal("5000.00")
+    assert Decimal(summary["total_expenses"]) == Decimal("2650.00")
+    assert Decimal(summary["balance"]) == Decimal("2350.00")
+
+    assert len(response.data["recent_expenses"]) == 3
+    breakdown = response.data["category_breakdown"]
+    assert [item["category"] for item in breakdown] == ["moradia", "alimentacao", "lazer"]
+    assert breakdown[0]["label"] == "Moradia"
+    assert Decimal(breakdown[0]["percentage"]) == Decimal("36.00")
+
+    # Alertas do mês foram gravados e voltam como não lidos.
+    titles = {alert["title"] for alert in response.data["unread_alerts"]}
+    assert "Gastos com moradia elevados" in titles
+    assert FinancialAlert.objects.filter(user=user, is_read=False).count() == len(titles)
+
+
+@pytest.mark.django_db
+def test_dashboard_matches_financial_summary(client):
+    dashboard = client.get("/api/dashboard/", {"month": "2025-08"}).data["summary"]
+    summary = client.get("/api/financial-summary/", {"month": "2025-08"}).data
+    assert dashboard == summary
+
+
+@pytest.mark.django_db
+def test_dashboard_uses_shared_queries(client):
+    client.get("/api/dashboard/", {"month": "2025-08"})
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/dashboard/", {"month": "2025-08"})
+    assert response.status_code == 200
+    # renda, gastos por categoria, recentes, troca dos alertas (delete + insert) e não lidos
+    assert len(ctx.captured_queries) <= 8
+
+
+@pytest.mark.django_db
+def test_dashboard_invalid_month(client):
+    response = client.get("/api/dashboard/", {"month": "agosto"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dashboard_concurrent_queries(client, settings):
+    settings.DASHBOARD_CONCURRENT_QUERIES = True
+    response = client.get("/api/dashboard/", {"month": "2025-08"})
+    assert response.status_code == 200
+    assert Decimal(response.data["summary"]["total_expenses"]) == Decimal("2650.00")
+    assert len(response.data["recent_expenses"]) == 3
@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from expenses.models import Expense, ExpenseHistory
+from expenses.partitioning import (
+    HISTORY_TABLE,
+    drop_expired_history,
+    ensure_partitions,
+    is_partitioned,
+    partition_name,
+    partitions,
+    period_start,
+    shift,
+)
+from expenses.services import FinancialAnalysisService
+from expenses.tasks import maintain_partitions
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="particionamento nativo do PostgreSQL"
+)
+
+
+def test_periods_and_names():
+    day = datetime.datetime(2025, 11, 20, 15, 30)
+    assert period_start(day, "month") == datetime.date(2025, 11, 1)
+    assert period_start(day, "year") == datetime.date(2025, 1, 1)
+    assert shift(datetime.date(2025, 11, 1), "month", 3) == datetime.date(2026, 2, 1)
+    assert shift(datetime.date(2025, 1, 1), "month", -1) == datetime.date(2024, 12, 1)
+    assert partition_name("t", datetime.date(2026, 2, 1), "month") == "t_p2026_02"
+    assert partition_name("t", datetime.date(2026, 1, 1), "year") == "t_p2026"
+
+
+def test_month_queries_filter_a_range_of_the_partition_key():
+    user = get_user_model()(pk=1, username="pruning")
+    service = FinancialAnalysisService(user, datetime.date(2025, 8, 1))
+    sql = str(service._month_expenses().query)
+    # BETWEEN na coluna da chave: o planner descarta as outras partições.
+    assert '"expenses_expense"."date" BETWEEN 2025-01-01 AND 2025-12-31' in sql
+
+
+@pytest.mark.django_db
+def test_history_retention_deletes_rows_without_partitions():
+    if connection.vendor == "postgresql":
+        pytest.skip("no PostgreSQL a retenção é por partição")
+    user = get_user_model().objects.create_user(username="history", password="123")
+    expense = Expense.objects.create(
+        user=user, value=10, category="lazer", date=datetime.date(2025, 8, 1)
+    )
+    ExpenseHistory.objects.filter(expense=expense).update(
+        date=timezone.now() - datetime.timedelta(days=200)
+    )
+
+    expense.save()
+
+    assert ExpenseHistory.objects.filter(expense=expense).count() == 1
+
+
+@pytest.mark.django_db
+def test_maintain_partitions_skips_other_databases():
+    maintain_partitions()
+
+
+@postgres_only
+@pytest.mark.django_db
+def test_partitions_are_created_ahead_and_expired_history_dropped():
+    assert is_partitioned(connection, HISTORY_TABLE)
+    today = datetime.date(2031, 6, 15)
+
+    created = ensure_partitions(connection, today=today)
+
+    assert "expenses_expense_p2032" in created
+    assert f"{HISTORY_TABLE}_p2031_09" in created
+    dropped = drop_expired_history(connection, today=datetime.date(2032, 6, 15))
+    assert f"{HISTORY_TABLE}_p2031_06" in dropped
+    assert f"{HISTORY_TABLE}_p2031_06" not in partitions(connection, HISTORY_TABLE)
@@ -0,0 +1,153 @@
+import json
+import pstats
+from datetime import date
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.test import Client, override_settings
+
+from expenses.models import MonthlyIncome, RequestProfile
+from expenses.profiling import load_stats, to_speedscope
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="profiled", password="123")
+    MonthlyIncome.objects.create(user=user, date=date.today().replace(day=1), amount=1000)
+    return user
+
+
+def _jwt_client(user):
+    client = APIClient()
+    token = client.post(
+        "/api/token/", {"username": user.username, "password": "123"}, format="json"
+    ).data["access"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.mark.django_db
+def test_sampled_request_is_profiled(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with override_settings(PROFILING_SAMPLE_RATE=1.0):
+        response = client.get("/api/financial-summary/")
+
+    assert response.status_code == 200
+    profile = RequestProfile.objects.get()
+    assert profile.route == "financial-summary"
+    assert profile.user == user
+    assert profile.trigger == "sample"
+    assert profile.peak_memory_kb > 0
+    stats = load_stats(profile)
+    assert any(funcname == "get_financial_summary" for _, _, funcname in stats)
+
+
+@pytest.mark.django_db
+def test_staff_header_triggers_profiling_but_not_for_regular_users(user):
+    _jwt_client(user).get("/api/financial-summary/", HTTP_X_PROFILE_REQUEST="1")
+    assert not RequestProfile.objects.exists()
+
+    staff = get_user_model().objects.create_user(username="staffer", password="123", is_staff=True)
+    _jwt_client(staff).get("/api/financial-summary/", HTTP_X_PROFILE_REQUEST="1")
+
+    profile = RequestProfile.objects.get()
+    assert profile.trigger == "header"
+    assert profile.user == staff
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("authorization", ["Bearer a b", "Bearer invalido"])
+def test_bad_token_with_profile_header_is_unauthorized(authorization):
+    response = APIClient().get(
+        "/api/expenses/", HTTP_X_PROFILE_REQUEST="1", HTTP_AUTHORIZATION=authorization
+    )
+
+    assert response.status_code == 401
+    assert not RequestProfile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_revoked_token_with_profile_header_is_unauthorized():
+    staff = get_user_model().objects.create_user(username="revogado", password="123", is_staff=True)
+    client = _jwt_client(staff)
+    staff.set_password("456")
+    staff.save()
+
+    response = client.get("/api/expenses/", HTTP_X_PROFILE_REQUEST="1")
+
+    assert response.status_code == 401
+    assert not RequestProfile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_profiling_off_by_default(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.get("/api/financial-summary/")
+
+    assert not RequestProfile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_profiles_are_bounded(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_MAX_ROWS=2):
+        for _ in range(3):
+            client.get("/api/financial-summary/")
+
+    assert RequestProfile.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_admin_downloads_pstats_and_speedscope(user, tmp_path):
+    api = APIClient()
+    api.force_authenticate(user=user)
+    with override_settings(PROFILING_SAMPLE_RATE=1.0):
+        api.get("/api/financial-summary/")
+    profile = RequestProfile.objects.get()
+
+    admin = get_user_model().objects.create_superuser(username="root", password="123")
+    client = Client()
+    client.force_login(admin)
+    url = f"/admin/expenses/requestprofile/{profile.pk}/download/"
+
+    response = client.get(url + "pstats/")
+    assert response.status_code == 200
+    dump = tmp_path / "profile.pstats"
+    dump.write_bytes(response.content)
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+    response = client.get(url + "speedscope/")
+    document = json.loads(response.content)
+    sampled = document["profiles"][0]
+    assert len(sampled["samples"]) == len(sampled["weights"]) > 0
+    frame_count = len(document["shared"]["frames"])
+    assert all(0 <= index < frame_count for stack in sampled["samples"] for index in stack)
+
+    assert client.get("/admin/expenses/requestprofile/").status_code == 200
+    assert client.get(url + "svg/").status_code == 404
+
+
+def test_to_speedscope_splits_self_time_by_caller():
+    root = ("app.py", 1, "view")
+    helper = ("app.py", 10, "helper")
+    other = ("app.py", 20, "other")
+    stats = {
+        root: (1, 1, 0.1, 0.6, {}),
+        other: (1, 1, 0.1, 0.3, {root: (1, 1, 0.1, 0.3)}),
+        helper: (2, 2, 0.4, 0.4, {root: (1, 1, 0.2, 0.2), other: (1, 1, 0.2, 0.2)}),
+    }
+
+    document = to_speedscope(stats, "teste")
+
+    frames = [frame["name"] for frame in document["shared"]["frames"]]
+    stacks = [[frames[i] for i in stack] for stack in document["profiles"][0]["samples"]]
+    assert ["view", "other", "helper"] in stacks
+    assert ["view", "helper"] in stacks
+    assert sum(document["profiles"][0]["weights"]) == pytest.approx(0.6)
@@ -0,0 +1,252 @@
+"""
+Orçamento de consultas SQL por endpoint.
+
+Cada rota de ``expenses/urls.py`` e ``backend_expenses/urls.py`` declara em
+``ENDPOINTS`` o número máximo de consultas que pode executar com um conjunto de
+dados realista (factory_boy). Os testes falham quando:
+
+- uma rota não declara orçamento;
+- o endpoint passa do orçamento;
+- a mesma consulta normalizada se repete além de ``max_repeats`` (sinal de N+1);
+- em listagens, o número de consultas cresce com ``page_size``.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from backend_expenses.celery import app as celery_app
+from expenses.slow_queries import normalize_sql
+
+from .factories import UserFactory, seed_user_dataset
+
+# Rotas fora do harness: admin do Django e arquivos estáticos/media.
+IGNORED_NAMESPACES = {"admin"}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    budget: int
+    method: str = "get"
+    args: tuple = ()
+    data: dict = field(default_factory=dict)
+    query: str = ""
+    client: str = "user"
+    max_repeats: int = 1
+    paginated: bool = False
+
+    def __str__(self):
+        return f"{self.method.upper()} {self.name}{self.query}"
+
+
+# As rotas de escrita em lote executam uma escrita por objeto por causa dos
+# signals de histórico/tombstone; ``max_repeats`` cobre exatamente esse lote.
+ENDPOINTS = [
+    Endpoint("api-root", budget=0),
+    Endpoint(
+        "register",
+        budget=4,
+        method="post",
+        client="anonymous",
+        data={"username": "novo", "password": "Senha@12345"},
+    ),
+    Endpoint(
+        "token_obtain_pair",
+        budget=2,
+        method="post",
+        client="anonymous",
+        data={"username": "dono", "password": "senha123"},
+    ),
+    Endpoint("token_refresh", budget=1, method="post", client="anonymous", data="refresh"),
+    Endpoint("metrics", budget=2, client="staff"),
+    Endpoint("schema-swagger-ui", budget=0, client="anonymous", query="?format=openapi"),
+    Endpoint("schema-redoc", budget=0, client="anonymous"),
+    Endpoint("openapi-schema", budget=0, client="anonymous"),
+    Endpoint("dashboard", budget=6),
+    Endpoint("financial-summary", budget=6),
+    Endpoint("sync-changes", budget=6),
+    Endpoint("generate-alerts", budget=5, method="post", data={}),
+    Endpoint("export-expenses-csv", budget=2),
+    Endpoint("export-income-csv", budget=2),
+    Endpoint("expense-list", budget=3, paginated=True),
+    Endpoint(
+        "expense-list",
+        budget=4,
+        method="post",
+        data={"value": "10.00", "category": "lazer", "date": "2025-08-01"},
+    ),
+    Endpoint("expense-report-monthly", budget=3),
+    Endpoint("expense-detail", budget=2, args=("expense",)),
+    Endpoint(
+        "expense-detail",
+        budget=5,
+        method="patch",
+        args=("expense",),
+        data={"description": "editada"},
+    ),
+    Endpoint("expense-detail", budget=5, method="delete", args=("expense",)),
+    Endpoint(
+        "expense-bulk-update",
+        budget=42,
+        method="patch",
+        max_repeats=10,
+        data={"ids": "expenses", "data": {"category": "lazer"}},
+    ),
+    Endpoint(
+        "expense-bulk-delete", budget=25, method="delete", max_repeats=10, data={"ids": "expenses"}
+    ),
+    Endpoint("monthlyincome-list", budget=3, paginated=True),
+    Endpoint(
+        "monthlyincome-list",
+        budget=2,
+        method="post",
+        data={"date": "2025-08-05", "amount": "1500.00"},
+    ),
+    Endpoint("monthlyincome-detail", budget=2, args=("income",)),
+    Endpoint(
+        "monthlyincome-detail",
+        budget=3,
+        method="patch",
+        args=("income",),
+        data={"description": "editada"},
+    ),
+    Endpoint("monthlyincome-detail", budget=3, method="delete", args=("income",)),
+    Endpoint(
+        "monthlyincome-bulk-update",
+        budget=11,
+        method="patch",
+        max_repeats=5,
+        data={"ids": "incomes", "data": {"is_recurring": True}},
+    ),
+    Endpoint(
+        "monthlyincome-bulk-delete",
+        budget=8,
+        method="delete",
+        max_repeats=5,
+        data={"ids": "incomes"},
+    ),
+    Endpoint("monthlyincome-export", budget=1),
+    Endpoint("financialalert-list", budget=3, paginated=True),
+    Endpoint("financialalert-detail", budget=2, args=("alert",)),
+    Endpoint("financialalert-mark-as-read", budget=3, method="patch", args=("alert",)),
+    Endpoint("financialalert-mark-all-as-read", budget=1, method="patch"),
+]
+
+
+def _route_names(resolver=None):
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in IGNORED_NAMESPACES:
+                yield from _route_names(pattern)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+@pytest.fixture
+def seeded():
+    owner = seed_user_dataset(UserFactory(username="dono"))
+    seed_user_dataset(UserFactory(username="vizinho"), expenses=20, incomes=3, alerts=2)
+    staff = UserFactory(username="ops", is_staff=True)
+    return {
+        "owner": owner,
+        "staff": staff,
+        "expense": owner.expenses.order_by("id").first().pk,
+        "income": owner.monthly_incomes.order_by("id").first().pk,
+        "alert": owner.financial_alerts.order_by("id").first().pk,
+        "expenses": list(owner.expenses.order_by("id").values_list("id", flat=True)[:10]),
+        "incomes": list(owner.monthly_incomes.order_by("id").values_list("id", flat=True)[:5]),
+    }
+
+
+@pytest.fixture
+def eager_celery():
+    previous = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    yield
+    celery_app.conf.task_always_eager = previous
+
+
+def _client(kind, seeded):
+    client = APIClient()
+    if kind == "user":
+        client.force_authenticate(user=seeded["owner"])
+    elif kind == "staff":
+        client.force_login(seeded["staff"])
+    return client
+
+
+def _payload(endpoint, seeded):
+    if endpoint.data == "refresh":
+        return {"refresh": _refresh_token(seeded["owner"])}
+    return {
+        key: seeded.get(value, value) if isinstance(value, str) else value
+        for key, value in endpoint.data.items()
+    }
+
+
+def _refresh_token(user):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return str(RefreshToken.for_user(user))
+
+
+def _run(endpoint, seeded, query=""):
+    client = _client(endpoint.client, seeded)
+    url = reverse(endpoint.name, args=[seeded[arg] for arg in endpoint.args])
+    url += query or endpoint.query
+    payload = _payload(endpoint, seeded) if endpoint.method != "get" else None
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, endpoint.method)(url, payload, format="json")
+    assert response.status_code < 400, (str(endpoint), response.status_code, response.content[:300])
+    return [query["sql"] for query in ctx.captured_queries]
+
+
+def _report(statements):
+    return "\n".join(f"  {sql[:160]}" for sql in statements)
+
+
+def test_every_route_declares_a_budget():
+    declared = {endpoint.name for endpoint in ENDPOINTS}
+    missing = sorted(set(_route_names()) - declared)
+    assert not missing, f"Rotas sem orçamento de consultas em ENDPOINTS: {missing}"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("eager_celery")
+@pytest.mark.parametrize("endpoint", ENDPOINTS, ids=str)
+def test_endpoint_query_budget(endpoint, seeded):
+    statements = _run(endpoint, seeded)
+
+    assert len(statements) <= endpoint.budget, (
+        f"{endpoint} executou {len(statements)} consultas (orçamento {endpoint.budget}):\n"
+        + _report(statements)
+    )
+    repeated = {
+        sql: count
+        for sql, count in Counter(map(normalize_sql, statements)).items()
+        if count > endpoint.max_repeats
+    }
+    assert not repeated, f"{endpoint} repetiu consultas (possível N+1):\n" + "\n".join(
+        f"  {count}x {sql[:160]}" for sql, count in repeated.items()
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "endpoint", [endpoint for endpoint in ENDPOINTS if endpoint.paginated], ids=str
+)
+def test_list_query_count_independent_of_page_size(endpoint, seeded):
+    small = _run(endpoint, seeded, "?page_size=2")
+    large = _run(endpoint, seeded, "?page_size=50")
+
+    assert len(small) == len(large), (
+        f"{endpoint}: {len(small)} consultas com page_size=2 e {len(large)} com page_size=50:\n"
+        + _report(large)
+    )
@@ -0,0 +1,124 @@
+from datetime import date
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from backend_expenses.celery import app as celery_app
+from expenses.models import Expense, SlowQuery
+from expenses.slow_queries import fingerprint, normalize_sql
+from expenses.tasks import export_expenses_csv, store_slow_queries
+
+# Qualquer consulta conta como lenta.
+ALL_QUERIES_SLOW = {"SLOW_QUERY_THRESHOLD_MS": 0.0001}
+
+
+@pytest.fixture(autouse=True)
+def eager_celery():
+    previous = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    yield
+    celery_app.conf.task_always_eager = previous
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="slowpoke", password="123")
+    Expense.objects.create(user=user, value=10, category="lazer", date=date(2025, 8, 1))
+    return user
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_normalize_sql_groups_equivalent_statements():
+    first = 'SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'
+    second = 'SELECT *  FROM "t"\n WHERE "id" IN (%s, %s) LIMIT 5'
+
+    assert normalize_sql(first) == 'SELECT * FROM "t" WHERE "id" IN (%s, ...) LIMIT ?'
+    assert fingerprint(first) == fingerprint(second)
+
+
+@pytest.mark.django_db
+def test_slow_queries_recorded_with_view_context_and_plan(client, user):
+    with override_settings(**ALL_QUERIES_SLOW):
+        client.get("/api/expenses/")
+
+    recorded = list(SlowQuery.objects.filter(sql__contains="expenses_expense"))
+    assert recorded
+    assert {row.context for row in recorded} == {"view:expense-list"}
+    assert all(row.user == user for row in recorded)
+    assert all(row.plan for row in recorded if row.sql.startswith("SELECT"))
+    assert not SlowQuery.objects.filter(sql__contains="expenses_slowquery").exists()
+
+
+@pytest.mark.django_db
+def test_request_only_enqueues_slow_queries(client, user):
+    with (
+        override_settings(**ALL_QUERIES_SLOW),
+        mock.patch.object(store_slow_queries, "apply_async") as apply_async,
+    ):
+        response = client.get("/api/expenses/")
+
+    assert response.status_code == 200
+    assert not SlowQuery.objects.exists()
+    captured, context, user_id = apply_async.call_args.args[0]
+    assert context == "view:expense-list"
+    assert user_id == user.pk
+    assert any("expenses_expense" in sql for _, sql, _, _, _ in captured)
+
+
+@pytest.mark.django_db
+def test_broker_failure_does_not_break_the_request(client):
+    with (
+        override_settings(**ALL_QUERIES_SLOW),
+        mock.patch.object(store_slow_queries, "apply_async", side_effect=ConnectionError),
+    ):
+        response = client.get("/api/expenses/")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_explain_sampled_once_per_fingerprint(client):
+    with override_settings(**ALL_QUERIES_SLOW):
+        client.get("/api/expenses/")
+        client.get("/api/expenses/")
+
+    digest = SlowQuery.objects.filter(sql__contains="expenses_expense").first().fingerprint
+    plans = list(SlowQuery.objects.filter(fingerprint=digest).values_list("plan", flat=True))
+    assert len(plans) == 2
+    assert sum(1 for plan in plans if plan) == 1
+
+
+@pytest.mark.django_db
+def test_slow_queries_table_is_bounded(client):
+    with override_settings(SLOW_QUERY_MAX_ROWS=3, **ALL_QUERIES_SLOW):
+        for _ in range(3):
+            client.get("/api/expenses/")
+
+    assert SlowQuery.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_slow_queries_recorded_with_task_context(user):
+    with override_settings(**ALL_QUERIES_SLOW):
+        export_expenses_csv.apply(args=[user.id])
+
+    contexts = set(SlowQuery.objects.values_list("context", flat=True))
+    assert contexts == {"task:expenses.tasks.export_expenses_csv"}
+
+
+@pytest.mark.django_db
+def test_threshold_zero_disables_capture(client):
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+        client.get("/api/expenses/")
+
+    assert not SlowQuery.objects.exists()
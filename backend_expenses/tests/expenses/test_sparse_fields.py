@@ -0,0 +1,131 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient, APIRequestFactory
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from expenses.models import Expense, MonthlyIncome
+from expenses.serializers import MonthlyIncomeSerializer, get_requested_fields
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="sparse", password="123")
+    for i in range(1, 4):
+        Expense.objects.create(
+            user=user,
+            value=Decimal("10.00") * i,
+            category="lazer",
+            date=date(2025, 8, i),
+            description=f"Despesa {i}",
+        )
+    MonthlyIncome.objects.create(user=user, date=date(2025, 8, 5), amount=Decimal("3000.00"))
+    MonthlyIncome.objects.create(user=user, date=date(2025, 8, 20), amount=Decimal("500.00"))
+    return user
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _select_sql(queries, table):
+    return [q["sql"] for q in queries if q["sql"].startswith("SELECT") and table in q["sql"]]
+
+
+def test_get_requested_fields():
+    factory = APIRequestFactory()
+    available = ("id", "value", "date", "description")
+
+    assert get_requested_fields(factory.get("/"), available) is None
+    assert get_requested_fields(factory.get("/?fields=date,id"), available) == ("id", "date")
+    assert get_requested_fields(factory.get("/?omit=description"), available) == (
+        "id",
+        "value",
+        "date",
+    )
+    assert get_requested_fields(factory.get("/?fields=id,value&omit=value"), available) == ("id",)
+    # Nomes desconhecidos são ignorados; seleção vazia equivale a todos os campos.
+    assert get_requested_fields(factory.get("/?fields=foo"), available) is None
+    # Escritas nunca são afetadas.
+    assert get_requested_fields(factory.post("/?fields=id"), available) is None
+
+
+@pytest.mark.django_db
+def test_list_expenses_fields_narrows_select(client):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/expenses/?fields=id,value")
+
+    assert response.status_code == 200
+    assert response.data["results"][0] == {
+        "id": response.data["results"][0]["id"],
+        "value": "30.00",
+    }
+    sql = _select_sql(ctx.captured_queries, "expenses_expense")[-1]
+    assert '"description"' not in sql
+    assert '"created"' not in sql
+
+
+@pytest.mark.django_db
+def test_retrieve_expense_omit_uses_only(client, user):
+    expense = Expense.objects.filter(user=user).first()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/api/expenses/{expense.id}/?omit=description,created,modified")
+
+    assert response.status_code == 200
+    assert set(response.data) == {"id", "user", "value", "category", "date"}
+    sql = _select_sql(ctx.captured_queries, '"expenses_expense"."id" = ')[-1]
+    assert '"description"' not in sql
+
+
+@pytest.mark.django_db
+def test_income_list_skips_month_total_unless_requested(client):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/monthly-income/?fields=id,amount")
+
+    assert response.status_code == 200
+    assert set(response.data["results"][0]) == {"id", "amount"}
+    assert not any("SUM(" in sql for sql in _select_sql(ctx.captured_queries, "monthlyincome"))
+
+    response = client.get("/api/monthly-income/?fields=id,total_month_income")
+    assert {Decimal(row["total_month_income"]) for row in response.data["results"]} == {
+        Decimal("3500")
+    }
+
+
+@pytest.mark.django_db
+def test_income_retrieve_omit_skips_method_field(client, user):
+    income = MonthlyIncome.objects.filter(user=user).first()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/api/monthly-income/{income.id}/?omit=total_month_income")
+
+    assert response.status_code == 200
+    assert "total_month_income" not in response.data
+    assert not any("SUM(" in sql for sql in _select_sql(ctx.captured_queries, "monthlyincome"))
+
+
+@pytest.mark.django_db
+def test_sparse_fields_ignored_on_write(client):
+    response = client.post(
+        "/api/expenses/?fields=id",
+        {"value": "12.00", "category": "lazer", "date": "2025-08-10"},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert "value" in response.data
+
+
+@pytest.mark.django_db
+def test_serializer_without_request_keeps_all_fields(user):
+    income = MonthlyIncome.objects.filter(user=user).first()
+
+    assert "total_month_income" in MonthlyIncomeSerializer(income).data
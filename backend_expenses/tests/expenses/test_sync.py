@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from expenses.models import Expense, MonthlyIncome, SyncTombstone
+from expenses.services import DeltaSyncService
+from expenses.tasks import prune_sync_tombstones
+
+
+@pytest.fixture(autouse=True)
+def no_safety_window(settings):
+    settings.SYNC_SAFETY_WINDOW = 0
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="syncuser", password="123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _ids(rows):
+    return sorted(row["id"] for row in rows)
+
+
+@pytest.mark.django_db
+def test_initial_sync_returns_current_rows(client, user):
+    expense = Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    income = MonthlyIncome.objects.create(user=user, date=date.today(), amount=1000)
+    other = get_user_model().objects.create_user(username="syncother", password="123")
+    Expense.objects.create(user=other, value=99, category="saude", date=date.today())
+
+    response = client.get("/api/sync/")
+    assert response.status_code == 200
+    assert _ids(response.data["expenses"]["created"]) == [expense.id]
+    assert _ids(response.data["monthly_income"]["created"]) == [income.id]
+    assert response.data["has_more"] is False
+    assert response.data["cursor"]
+
+
+@pytest.mark.django_db
+def test_sync_since_cursor_reports_updates_and_deletes(client, user):
+    kept = Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    removed = Expense.objects.create(user=user, value=20, category="saude", date=date.today())
+    income = MonthlyIncome.objects.create(user=user, date=date.today(), amount=1000)
+    cursor = client.get("/api/sync/").data["cursor"]
+
+    removed_id, income_id = removed.id, income.id
+    kept.value = 15
+    kept.save()
+    removed.delete()
+    income.delete()
+    new = Expense.objects.create(user=user, value=30, category="moradia", date=date.today())
+
+    response = client.get("/api/sync/", {"cursor": cursor})
+    assert response.status_code == 200
+    expenses = response.data["expenses"]
+    assert _ids(expenses["updated"]) == [kept.id]
+    assert _ids(expenses["created"]) == [new.id]
+    assert expenses["deleted"] == [removed_id]
+    assert response.data["monthly_income"]["deleted"] == [income_id]
+
+    response = client.get("/api/sync/", {"cursor": response.data["cursor"]})
+    assert response.data["expenses"] == {"created": [], "updated": [], "deleted": []}
+
+
+@pytest.mark.django_db
+def test_sync_batches_with_continuation_cursor(client, user):
+    created = [
+        Expense.objects.create(user=user, value=i + 1, category="lazer", date=date.today()).id
+        for i in range(5)
+    ]
+    seen, cursor, calls = [], None, 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/api/sync/", params).data
+        batch = data["expenses"]["created"] + data["expenses"]["updated"]
+        assert len(batch) <= 2
+        seen += [row["id"] for row in batch]
+        cursor, calls = data["cursor"], calls + 1
+        if not data["has_more"]:
+            break
+    assert sorted(seen) == sorted(created)
+    assert calls == 3
+
+
+def _expense_at(user, seconds_ago):
+    expense = Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    modified = timezone.now() - timedelta(seconds=seconds_ago)
+    Expense.objects.filter(pk=expense.pk).update(created=modified, modified=modified)
+    return expense
+
+
+@pytest.mark.django_db
+def test_out_of_order_commit_is_not_skipped(client, user, settings):
+    settings.SYNC_SAFETY_WINDOW = 60
+    cursor = client.get("/api/sync/").data["cursor"]
+    # Y tem o timestamp mais novo mas é commitado antes de X.
+    y = _expense_at(user, seconds_ago=30)
+
+    data = client.get("/api/sync/", {"cursor": cursor}).data
+    assert data["expenses"]["created"] == []
+    cursor = data["cursor"]
+    x = _expense_at(user, seconds_ago=40)
+
+    # Passada a janela (equivalente a reduzi-la), os dois chegam em ordem.
+    settings.SYNC_SAFETY_WINDOW = 10
+    data = client.get("/api/sync/", {"cursor": cursor}).data
+    assert [row["id"] for row in data["expenses"]["created"]] == [x.id, y.id]
+
+
+@pytest.mark.django_db
+def test_old_tombstones_are_pruned_and_old_cursors_resync(client, user, settings):
+    settings.SYNC_TOMBSTONE_RETENTION_DAYS = 30
+    expense = _expense_at(user, seconds_ago=0)
+    expense.delete()
+    old = timezone.now() - timedelta(days=31)
+    SyncTombstone.objects.update(deleted=old)
+    Expense.objects.create(user=user, value=5, category="lazer", date=date.today()).delete()
+
+    prune_sync_tombstones()
+
+    assert SyncTombstone.objects.count() == 1
+    cursor = DeltaSyncService.encode_cursor({"d": [old.isoformat(), 0]})
+    response = client.get("/api/sync/", {"cursor": cursor})
+    assert response.status_code == 410
+    assert response.data["full_resync"] is True
+
+
+@pytest.mark.django_db
+def test_user_cascade_does_not_create_tombstones(user):
+    Expense.objects.create(user=user, value=10, category="lazer", date=date.today())
+    user.delete()
+    assert not SyncTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+def test_sync_invalid_cursor(client):
+    response = client.get("/api/sync/", {"cursor": "nao-e-um-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,90 @@
+import datetime
+from unittest import mock
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from expenses import synthetic
+from expenses.models import Expense, ExpenseHistory, MonthlyIncome
+from expenses.synthetic import CATEGORIES, generate_user
+
+UNTIL = datetime.date(2025, 6, 20)
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="COPY só existe no PostgreSQL"
+)
+
+
+def test_generated_rows_are_deterministic_per_user():
+    first = generate_user(3, seed=7, expenses_per_user=200, months=6, until=UNTIL)
+
+    assert generate_user(3, seed=7, expenses_per_user=200, months=6, until=UNTIL) == first
+    assert generate_user(4, seed=7, expenses_per_user=200, months=6, until=UNTIL) != first
+    assert generate_user(3, seed=8, expenses_per_user=200, months=6, until=UNTIL) != first
+
+
+def test_generated_rows_follow_model_domains():
+    expenses, incomes = generate_user(0, seed=1, expenses_per_user=500, months=6, until=UNTIL)
+
+    assert 250 <= len(expenses) <= 750
+    assert {row[2] for row in expenses} <= set(CATEGORIES)
+    assert all(datetime.date(2025, 1, 1) <= row[3] <= UNTIL for row in expenses)
+    salaries = [row for row in incomes if row[4] == "salario"]
+    assert len(salaries) == 6
+    assert all(row[5] for row in salaries)
+    assert len({row[2] for row in salaries}) == 1
+
+
+@pytest.mark.django_db
+def test_command_requires_postgres():
+    if connection.vendor == "postgresql":
+        pytest.skip("banco de teste é PostgreSQL")
+    with pytest.raises(CommandError):
+        call_command("seed_synthetic_data", users=1)
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+def test_command_loads_and_grows_incrementally():
+    options = {"expenses_per_user": 20, "months": 3, "until": UNTIL, "seed": 5, "prefix": "syn-"}
+
+    call_command("seed_synthetic_data", users=2, **options)
+    first_count = Expense.objects.filter(user__username__startswith="syn-").count()
+    call_command("seed_synthetic_data", users=3, **options)
+
+    expected = sum(len(generate_user(index, 5, 20, 3, UNTIL)[0]) for index in range(3))
+    expenses = Expense.objects.filter(user__username__startswith="syn-")
+    assert first_count < expenses.count() == expected
+    assert ExpenseHistory.objects.filter(expense__in=expenses).count() >= expected
+    assert MonthlyIncome.objects.filter(user__username__startswith="syn-").exists()
+    # O próximo insert pela ORM não colide com os ids reservados pelo COPY.
+    Expense.objects.create(user=expenses.first().user, value=1, category="outros", date=UNTIL)
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+def test_interrupted_load_resumes_without_empty_users():
+    options = {"expenses_per_user": 20, "months": 3, "until": UNTIL, "seed": 5, "prefix": "cut-"}
+    copy = synthetic._copy
+    calls = []
+
+    def failing_copy(cursor, model, columns, rows):
+        calls.append(model)
+        if len(calls) > 3:
+            raise RuntimeError("carga interrompida")
+        copy(cursor, model, columns, rows)
+
+    # chunk_size=1: um usuário por bloco; o segundo bloco falha no meio.
+    with mock.patch.object(synthetic, "_copy", failing_copy), pytest.raises(RuntimeError):
+        call_command("seed_synthetic_data", users=3, chunk_size=1, **options)
+
+    users = get_user_model().objects.filter(username__startswith="cut-")
+    assert users.count() == 1
+    assert not users.filter(expenses__isnull=True).exists()
+
+    call_command("seed_synthetic_data", users=3, chunk_size=1, **options)
+    assert users.count() == 3
+    assert not users.filter(expenses__isnull=True).exists()
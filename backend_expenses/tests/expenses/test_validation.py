@@ -0,0 +1,101 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+
+from expenses import serializers as expense_serializers
+from expenses.models import Expense
+from expenses.schemas import ExpenseSchema
+from expenses.serializers import ExpenseSerializer, MonthlyIncomeSerializer
+from expenses.validation import validate_many
+
+
+def _expense(value, category="lazer"):
+    return {"value": value, "category": category, "date": date.today().isoformat()}
+
+
+def test_error_message_matches_schema():
+    data = {"value": Decimal("-1.00"), "category": "lazer", "date": date.today()}
+    with pytest.raises(Exception) as schema_exc:
+        ExpenseSchema(**data)
+    serializer = ExpenseSerializer(data={**data, "value": "-1.00"})
+    assert not serializer.is_valid()
+    assert serializer.errors["validation"] == [str(schema_exc.value)]
+
+
+def test_list_validation_runs_in_one_call():
+    serializer = ExpenseSerializer(data=[_expense("10.00"), _expense("20.00")], many=True)
+    with mock.patch.object(
+        expense_serializers, "validate_object", wraps=expense_serializers.validate_object
+    ) as single:
+        assert serializer.is_valid(), serializer.errors
+    assert single.call_count == 0
+
+
+def test_list_validation_errors_are_per_item():
+    items = [_expense("10.00"), _expense("2000000.00"), _expense("5.00")]
+    serializer = ExpenseSerializer(data=items, many=True)
+    assert not serializer.is_valid()
+    assert serializer.errors[0] == {}
+    assert serializer.errors[2] == {}
+
+    single = ExpenseSerializer(data=items[1])
+    assert not single.is_valid()
+    assert serializer.errors[1] == single.errors
+
+
+def test_list_field_errors_still_reported_by_drf():
+    serializer = ExpenseSerializer(data=[_expense("10.00", category="Proibida")], many=True)
+    assert not serializer.is_valid()
+    assert "category" in serializer.errors[0]
+
+
+def test_validate_many_all_valid():
+    items = [{"amount": Decimal("10"), "date": date.today()}] * 3
+    schema = MonthlyIncomeSerializer(partial=False).get_validation_schema()
+    assert validate_many(schema, items) == [{}, {}, {}]
+
+
+@pytest.mark.django_db
+def test_bulk_update_validates_payload_once():
+    user = get_user_model().objects.create_user(username="bulkvalid", password="123")
+    ids = [
+        Expense.objects.create(user=user, value=10, category="lazer", date=date.today()).id
+        for _ in range(5)
+    ]
+    client = APIClient()
+    client.force_authenticate(user=user)
+    with mock.patch.object(
+        expense_serializers, "validate_object", wraps=expense_serializers.validate_object
+    ) as single:
+        response = client.patch(
+            "/api/expenses/bulk_update/",
+            {"ids": ids, "data": {"description": "Em massa"}},
+            format="json",
+        )
+    assert response.status_code == 200
+    assert response.data["updated_count"] == 5
+    assert single.call_count == 1
+    assert set(Expense.objects.values_list("description", flat=True)) == {"Em massa"}
+
+
+@pytest.mark.django_db
+def test_bulk_update_invalid_payload_reports_every_id():
+    user = get_user_model().objects.create_user(username="bulkinvalid", password="123")
+    ids = [
+        Expense.objects.create(user=user, value=10, category="lazer", date=date.today()).id
+        for _ in range(2)
+    ]
+    client = APIClient()
+    client.force_authenticate(user=user)
+    response = client.patch(
+        "/api/expenses/bulk_update/", {"ids": ids, "data": {"value": "-5"}}, format="json"
+    )
+    assert response.status_code == 200
+    assert response.data["updated_count"] == 0
+    assert sorted(response.data["errors"]) == sorted(ids)
+    assert "validation" in response.data["errors"][ids[0]]
@@ -0,0 +1,112 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from expenses.models import Expense, FinancialAlert, MonthlyIncome
+from expenses.serializers import (
+    ExpenseSerializer,
+    FinancialAlertSerializer,
+    MonthlyIncomeSerializer,
+    ValuesRowFormatter,
+)
+
+
+def _json(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="fastlist", password="123")
+    for i in range(1, 8):
+        Expense.objects.create(
+            user=user,
+            value=Decimal("10.5") * i,
+            category="lazer" if i % 2 else "saude",
+            date=date(2025, 8, i),
+            description="" if i == 3 else f"Despesa {i}",
+        )
+    MonthlyIncome.objects.create(user=user, date=date(2025, 8, 5), amount=Decimal("3000.00"))
+    MonthlyIncome.objects.create(user=user, date=date(2025, 8, 20), amount=Decimal("500.50"))
+    MonthlyIncome.objects.create(user=user, date=date(2025, 7, 5), amount=Decimal("2000"))
+    FinancialAlert.objects.create(
+        user=user, alert_type="warning", title="Atenção", message="Açaí", month=date(2025, 8, 1)
+    )
+    return user
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, queryset, serializer_class",
+    [
+        ("/api/expenses/", lambda: Expense.objects.order_by("-date", "-id"), ExpenseSerializer),
+        (
+            "/api/monthly-income/",
+            lambda: MonthlyIncome.objects.order_by("-date"),
+            MonthlyIncomeSerializer,
+        ),
+        ("/api/financial-alerts/", lambda: FinancialAlert.objects.all(), FinancialAlertSerializer),
+    ],
+)
+def test_fast_list_matches_serializer_output(client, url, queryset, serializer_class):
+    response = client.get(url)
+    assert response.status_code == 200
+    expected = serializer_class(queryset(), many=True).data
+    assert _json(response.data["results"]) == _json(expected)
+
+
+@pytest.mark.django_db
+def test_fast_list_keeps_filters_and_pagination(client):
+    response = client.get("/api/expenses/?category=lazer&page_size=2&ordering=value")
+    assert response.status_code == 200
+    assert response.data["count"] == 4
+    assert [row["value"] for row in response.data["results"]] == ["10.50", "31.50"]
+
+
+@pytest.mark.django_db
+def test_income_list_has_no_per_row_queries(client, user):
+    for day in range(1, 10):
+        MonthlyIncome.objects.create(user=user, date=date(2025, 9, day), amount=Decimal("1"))
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/monthly-income/")
+    assert response.status_code == 200
+    list_queries = [q for q in ctx.captured_queries if "expenses_monthlyincome" in q["sql"]]
+    # ETag + count + página
+    assert len(list_queries) == 3
+    assert Decimal(str(response.data["results"][0]["total_month_income"])) == Decimal("9")
+
+
+def test_formatter_falls_back_for_unmapped_method_fields():
+    from rest_framework import serializers
+
+    class WithMethod(serializers.ModelSerializer):
+        extra = serializers.SerializerMethodField()
+
+        class Meta:
+            model = Expense
+            fields = ["id", "extra"]
+
+        def get_extra(self, obj):
+            return 1
+
+    assert ValuesRowFormatter.for_serializer(WithMethod) is None
+    assert ValuesRowFormatter.for_serializer(ExpenseSerializer).columns[:3] == [
+        "id",
+        "user",
+        "value",
+    ]
@@ -216,3 +216,16 @@ def test_bulk_delete_expenses_not_owner():
     client.force_authenticate(user=other)
     response = client.delete("/api/expenses/bulk_delete/", {"ids": ids}, format="json")
     assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_list_expenses_page_size():
+    user = get_user_model().objects.create_user(username="pagesize", password="123")
+    for i in range(30):
+        Expense.objects.create(user=user, value=i + 1, category="lazer", date=date.today())
+    client = APIClient()
+    client.force_authenticate(user=user)
+    response = client.get("/api/expenses/?page_size=25")
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 25
+    assert response.data["count"] == 30
@@ -41,7 +41,7 @@ import {
 import { Pie } from 'react-chartjs-2';
 import { Chart as ChartJS, ArcElement, Tooltip, Legend } from 'chart.js';
 import { useNavigate } from 'react-router-dom';
-import { analysisService, expenseService } from '../services/api';
+import { analysisService } from '../services/api';
 import { useAppStore } from '../store';
 
 // Registrar componentes do Chart.js
@@ -79,17 +79,11 @@ const Dashboard = () => {
       setLoading(true);
       setError(null);
 
-      // Carregar resumo financeiro
-      const summaryData = await analysisService.getFinancialSummary();
-      setFinancialSummary(summaryData);
-
-      // Carregar despesas recentes
-      const expensesData = await expenseService.getAll({ 
-        page_size: 5,
-        ordering: '-created' 
-      });
-      setRecentExpenses(expensesData.results || []);
-      setExpenses(expensesData.results || []);
+      // Resumo, despesas recentes e alertas em uma única requisição
+      const dashboardData = await analysisService.getDashboard();
+      setFinancialSummary(dashboardData.summary);
+      setRecentExpenses(dashboardData.recent_expenses || []);
+      setExpenses(dashboardData.recent_expenses || []);
 
     } catch (err) {
       console.error('Erro ao carregar dados do dashboard:', err);
@@ -241,6 +241,12 @@ export const incomeService = {
 
 // Serviços de análise financeira
 export const analysisService = {
+  getDashboard: async (month) => {
+    const params = month ? { month } : {};
+    const response = await api.get('/dashboard/', { params });
+    return response.data;
+  },
+
   getFinancialSummary: async (month) => {
     const params = month ? { month } : {};
     const response = await api.get('/financial-summary/', { params });